@@ -7,11 +7,20 @@ for the current branch. Creates GitHub Actions annotations and
 sets output variables.
 """
 
+import importlib.util
 import os
+import subprocess
 import sys
 import yaml
 from pathlib import Path
-from typing import Any, Dict, Union
+from typing import Any, Dict, List, Optional, Union
+
+# Glob matching is shared with the planners in scripts/, but only through
+# scripts/src/path_globs.py: a standalone, stdlib-only module loaded by file path.
+_PATH_GLOBS_FILE = Path(__file__).resolve().parents[3] / 'scripts' / 'src' / 'path_globs.py'
+_spec = importlib.util.spec_from_file_location('path_globs', _PATH_GLOBS_FILE)
+path_globs = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(path_globs)
 
 
 def load_config(config_path: str) -> Dict[str, Any]:
@@ -63,6 +72,44 @@ def check_branch_enabled(
     return False
 
 
+def get_changed_paths(base: str) -> Optional[List[str]]:
+    """
+    Paths changed between base and HEAD (git diff base...HEAD).
+
+    Returns None when the diff cannot be computed (unknown base, shallow clone),
+    so callers can fall back to building.
+    """
+    if not base or set(base) == {'0'}:  # first push of a branch: before is all zeros
+        return None
+    try:
+        result = subprocess.run(
+            ['git', 'diff', '--name-only', f'{base}...HEAD'],
+            capture_output=True, text=True, timeout=60,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if result.returncode != 0:
+        return None
+    return [line for line in result.stdout.splitlines() if line]
+
+
+def paths_need_build(config: Dict[str, Any], paths: Optional[List[str]]) -> bool:
+    """
+    Check if any changed path needs a build, by ci.path_rules, ci.skip_paths and
+    ci.watch_paths (first match wins; see scripts/src/path_globs.py).
+
+    Args:
+        config: Parsed project.yml
+        paths: Changed paths, or None when unknown
+
+    Returns:
+        False only when paths are known and every one is skipped or unwatched
+    """
+    if paths is None:
+        return True
+    return path_globs.PathMatcher.from_config(config).needs_build(paths)
+
+
 def create_annotation(
     level: str,
     title: str,
@@ -124,6 +171,12 @@ def main():
         set_output('kotlin-native-cache', str(ci_config.get('caching', {}).get('kotlin_native', True)).lower())
         set_output('pages-enabled', str(docs_config.get('github_pages', {}).get('enabled', False)).lower())
         
+        # Docs-only and script-only changes skip the build jobs
+        changed_files_base = os.environ.get('CHANGED_FILES_BASE', '')
+        changed_paths = get_changed_paths(changed_files_base) if changed_files_base else None
+        needs_build = paths_need_build(config, changed_paths)
+        set_output('needs-build', str(needs_build).lower())
+        
         # Create status output
         print("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
         print("📋 CI Configuration Status")
@@ -131,6 +184,9 @@ def main():
         print(f"Current branch:    {current_branch}")
         print(f"Enabled branches:  {enabled_branches}")
         print(f"CI enabled:        {ci_enabled}")
+        if changed_paths is not None:
+            print(f"Changed paths:     {len(changed_paths)} since {changed_files_base}")
+            print(f"Needs build:       {needs_build}")
         print("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
         
         # Create annotation
@@ -142,6 +198,12 @@ def main():
             )
             print(annotation)
             print(f"✅ CI will RUN for branch '{current_branch}'")
+            if not needs_build:
+                print(create_annotation(
+                    'notice',
+                    'Build Skipped',
+                    'No changed path is watched by project.yml (ci.skip_paths / ci.watch_paths / ci.path_rules)'
+                ))
         else:
             annotation = create_annotation(
                 'warning',
@@ -15,6 +15,8 @@ from ci_status import (
     get_current_branch,
     create_annotation,
     format_list,
+    get_changed_paths,
+    paths_need_build,
 )
 
 
@@ -160,6 +162,55 @@ def test_format_list_with_bool():
     assert format_list(False) == 'False'
 
 
+# Test paths_need_build
+
+@pytest.fixture
+def path_config():
+    """Path filters as in project.yml"""
+    return {
+        'ci': {
+            'skip_paths': ['**/*.md', 'docs/**'],
+            'watch_paths': ['libraries/**', 'gradle/**', 'build.gradle.kts'],
+            'path_rules': [
+                {'paths': ['kotlin-js-store/**'], 'platforms': ['js', 'wasmJs']},
+                {'name': 'bom', 'paths': ['bom/**'], 'tasks': [':bom:build']},
+            ],
+        }
+    }
+
+
+def test_paths_need_build_docs_only(path_config):
+    """Test docs-only changes (even inside a watched directory) skip the build"""
+    assert paths_need_build(path_config, ['README.md', 'docs/index.md', 'libraries/core/README.md']) == False
+
+
+def test_paths_need_build_scripts_only(path_config):
+    """Test unwatched paths skip the build"""
+    assert paths_need_build(path_config, ['scripts/test_platforms.py']) == False
+
+
+def test_paths_need_build_watched_or_ruled(path_config):
+    """Test a watched path or a path rule needs a build"""
+    assert paths_need_build(path_config, ['README.md', 'libraries/core/src/A.kt']) == True
+    assert paths_need_build(path_config, ['kotlin-js-store/yarn.lock']) == True
+    assert paths_need_build(path_config, ['bom/build.gradle.kts']) == True
+
+
+def test_paths_need_build_unknown_paths(path_config):
+    """Test unknown changes (no base) always build"""
+    assert paths_need_build(path_config, None) == True
+
+
+def test_paths_need_build_no_filters():
+    """Test a config without path filters builds for any change"""
+    assert paths_need_build({'ci': {}}, ['scripts/x.py']) == True
+
+
+def test_get_changed_paths_new_branch():
+    """Test the all-zero 'before' of a new branch yields unknown paths"""
+    assert get_changed_paths('0000000000000000000000000000000000000000') is None
+
+
 # Integration tests
 
 def test_full_workflow_ci_enabled(monkeypatch, sample_config):
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """
-Run Gradle compile tasks for platforms where main code changed.
+Run Gradle compile tasks for platforms where main code changed, scoped to the
+libraries that changed (:libraries:<name>:<task>).
 Single responsibility: execute build (compile) only.
 """
 
@@ -11,15 +12,43 @@ from pathlib import Path
 # So "from src.xxx" works when run as python3 scripts/build_platforms.py from repo root.
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
-from src.touched_files import get_repo_root, get_touched_files
-from src.platform_core import platforms_for_changed_files, gradle_compile_tasks
+from src.touched_files import CHANGE_MODES, changes_or_none, get_repo_root
+from src.base_ref import describe_resolution, resolve_base
+from src.platform_core import (
+    KNOWN_PLATFORMS,
+    get_library_project_paths,
+    gradle_compile_tasks_by_library,
+    planning_paths,
+    platforms_by_library,
+    representative_platform,
+    restrict_to_declared,
+)
 from src.gradle_runner import run_gradle
+from src.duration_history import DEFAULT_SECONDS_BY_PLATFORM
+from src.task_inventory import declared_platforms_by_library, resolve_tasks
+from src.version_catalog import expand_catalog_changes
+from src.path_rules import RuleEffects, load_path_rules
+from src.library_graph import build_dependency_graph, propagate_to_dependents
 
 
-def run(main_platforms: set[str], dry_run: bool = False) -> int:
-    """Run compile tasks for the given platforms. Returns Gradle exit code."""
-    tasks = gradle_compile_tasks(main_platforms)
-    return run_gradle(tasks, cwd=get_repo_root(), dry_run=dry_run)
+def run(
+    main_platforms_by_lib: dict[str, set[str]], dry_run: bool = False, refresh_task_cache: bool = False
+) -> int:
+    """
+    Run compile tasks for each library's changed main platforms. Returns Gradle exit code.
+    Outside dry-run, tasks a library does not declare are dropped before running.
+    """
+    cwd = get_repo_root()
+    tasks = gradle_compile_tasks_by_library(main_platforms_by_lib)
+    if not dry_run:
+        task_names = sorted({t.split(":")[-1] for t in tasks})
+        resolved = set(resolve_tasks(
+            cwd, sorted(main_platforms_by_lib), task_names, refresh_cache=refresh_task_cache
+        ))
+        tasks = [t for t in tasks if t in resolved]
+        if not tasks:
+            return 0
+    return run_gradle(tasks, cwd=cwd, dry_run=dry_run)
 
 
 def main() -> int:
@@ -28,22 +57,98 @@ def main() -> int:
     )
     parser.add_argument("--dry-run", action="store_true", help="Print tasks only, do not run")
     parser.add_argument("--base", default="origin/main", help="Base ref for touched files (added/updated/deleted)")
+    parser.add_argument(
+        "--changes",
+        choices=CHANGE_MODES,
+        default="committed",
+        help="Which changes to build for: committed (base...HEAD), staged (index), worktree (unstaged and untracked files), or all of them (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--refresh-task-cache",
+        action="store_true",
+        help="Ignore the cached Gradle task list (.gradle/kmp-scripts/task-cache) and query Gradle again",
+    )
     args = parser.parse_args()
 
-    paths = get_touched_files(args.base)
-    if not paths:
+    if args.changes in ("committed", "all"):
+        base, notes = resolve_base(args.base, get_repo_root())
+        for line in describe_resolution(args.base, base, notes):
+            print(line, file=sys.stderr)
+        base_sha = base.sha if base is not None else None
+    else:
+        base, base_sha = None, None
+    changes = None
+    if base_sha is not None or args.changes not in ("committed", "all"):
+        try:
+            changes = changes_or_none(base_sha, mode=args.changes)
+        except RuntimeError as e:
+            print(f"Cannot list {args.changes} changes: {e}", file=sys.stderr)
+            return 1
+        if changes is None and (base_sha is None or base.at_head):
+            # A clean tree, or HEAD is the base: nothing changed, which is not a reason for a full build.
+            since = f" since {base.ref}" if base_sha is not None else ""
+            print(f"No {args.changes} changes{since}; nothing to build.", file=sys.stderr)
+            return 0
+    if changes is None:
         return run_gradle(["build"], cwd=get_repo_root(), dry_run=args.dry_run)
 
-    result = platforms_for_changed_files(paths)
-    if result is None:
-        return 0
+    cwd = get_repo_root()
+    library_projects = get_library_project_paths(cwd)
+    try:
+        rules, notes = load_path_rules(cwd)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    effects = RuleEffects()
+    declared = declared_platforms_by_library(cwd, library_projects)
+    try:
+        # The change stream is read here; git failing mid-stream raises RuntimeError.
+        changes = expand_catalog_changes(changes, cwd, args.changes, base_sha, notes)
+        impact = platforms_by_library(
+            rules.build_paths(planning_paths(changes), effects),
+            libraries=library_projects,
+            declared=declared,
+            costs=DEFAULT_SECONDS_BY_PLATFORM,
+        )
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        return 1
+    for line in notes:
+        print(line, file=sys.stderr)
+    if impact is None:
+        # Like test_platforms: validate every library on its representative platform
+        # (JVM, or its cheapest declared target) rather than compiling every target.
+        print("Build configuration changed; compiling every library for its representative platform.", file=sys.stderr)
+        representative = {
+            lib: {representative_platform(declared.get(lib), DEFAULT_SECONDS_BY_PLATFORM)} for lib in library_projects
+        }
+        return run(representative, dry_run=args.dry_run, refresh_task_cache=args.refresh_task_cache)
 
-    main_platforms, _test_platforms = result
+    # A library whose own build script changed (None; e.g. a dependency bump through
+    # the version catalog) is compiled for every platform it declares.
+    main_platforms_by_lib = {
+        lib: set(KNOWN_PLATFORMS) if plats is None else plats[0]
+        for lib, plats in impact.items()
+        if (plats is None or plats[0]) and lib in library_projects
+    }
+    # Platforms from project.yml ci.path_rules (e.g. kotlin-js-store/) reach every library.
+    for lib in library_projects if effects.platforms else ():
+        main_platforms_by_lib.setdefault(lib, set()).update(effects.platforms)
+    changed = set(main_platforms_by_lib)
+    main_platforms_by_lib = propagate_to_dependents(build_dependency_graph(cwd), main_platforms_by_lib)
+    # Targets a library does not declare do not exist; a dependent sharing none with
+    # the change compiles its representative target.
+    main_platforms_by_lib = {
+        lib: restrict_to_declared(plats, declared.get(lib), None if lib in changed else DEFAULT_SECONDS_BY_PLATFORM)
+        for lib, plats in main_platforms_by_lib.items()
+    }
+    main_platforms_by_lib = {lib: plats for lib, plats in main_platforms_by_lib.items() if plats}
 
-    if not main_platforms:
+    if not main_platforms_by_lib:
+        print("No main code of a declared target changed; nothing to build.", file=sys.stderr)
         return 0
 
-    return run(main_platforms, dry_run=args.dry_run)
+    return run(main_platforms_by_lib, dry_run=args.dry_run, refresh_task_cache=args.refresh_task_cache)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Resource-aware admission control for parallel Gradle runs.
+Single responsibility: decide when another Gradle process may start, based on free
+memory and load average from /proc and a per-platform memory estimate.
+"""
+
+import os
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+# Rough peak memory (MB) of one Gradle invocation per platform: daemon + Kotlin daemon
+# + workers. Kotlin/Native link/compile is far heavier than a JVM test run.
+PLATFORM_MEMORY_ESTIMATE_MB = {
+    "jvm": 1500,
+    "android": 2500,
+    "js": 2000,
+    "wasmJs": 2000,
+    "wasmWasi": 2000,
+    "androidNative": 4000,
+    "ios": 4000,
+    "macos": 4000,
+    "tvos": 4000,
+    "watchos": 4000,
+    "linuxX64": 3500,
+    "linuxArm64": 3500,
+    "mingwX64": 3500,
+}
+DEFAULT_MEMORY_ESTIMATE_MB = 2500
+
+DEFAULT_MIN_FREE_MEMORY_MB = 1024
+DEFAULT_MAX_LOAD_PER_CPU = 1.5
+# A just-started Gradle process has not allocated its heap yet; until then its
+# estimate is held back from MemAvailable so a burst of starts cannot overcommit.
+DEFAULT_WARMUP_SECONDS = 30.0
+_POLL_SECONDS = 1.0
+
+
+def read_mem_available_mb(meminfo: Path = Path("/proc/meminfo")) -> int | None:
+    """Return MemAvailable in MB from /proc/meminfo, or None if unavailable."""
+    try:
+        for line in meminfo.read_text().splitlines():
+            if line.startswith("MemAvailable:"):
+                return int(line.split()[1]) // 1024
+    except (OSError, ValueError, IndexError):
+        return None
+    return None
+
+
+def read_load_average(loadavg: Path = Path("/proc/loadavg")) -> float | None:
+    """Return the 1-minute load average from /proc/loadavg, or None if unavailable."""
+    try:
+        return float(loadavg.read_text().split()[0])
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def memory_estimate_mb(platform: str) -> int:
+    """Return the memory estimate for one Gradle run of platform."""
+    return PLATFORM_MEMORY_ESTIMATE_MB.get(platform, DEFAULT_MEMORY_ESTIMATE_MB)
+
+
+class AdmissionController:
+    """
+    Admits Gradle processes while free memory and load average allow, up to max_concurrency.
+
+    At least one process is always admitted when none is running, so a small machine is
+    slow rather than stuck. Where /proc is missing (macOS, Windows) only max_concurrency
+    applies. Thread-safe: acquire() blocks in worker threads; release() wakes them.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        *,
+        min_free_memory_mb: int = DEFAULT_MIN_FREE_MEMORY_MB,
+        max_load: float | None = None,
+        warmup_seconds: float = DEFAULT_WARMUP_SECONDS,
+        read_memory: Callable[[], int | None] = read_mem_available_mb,
+        read_load: Callable[[], float | None] = read_load_average,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_free_memory_mb = min_free_memory_mb
+        self.max_load = max_load if max_load is not None else DEFAULT_MAX_LOAD_PER_CPU * (os.cpu_count() or 1)
+        self.warmup_seconds = warmup_seconds
+        self._read_memory = read_memory
+        self._read_load = read_load
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._running: dict[int, tuple[str, float]] = {}
+        self._next_ticket = 0
+
+    def _pending_mb(self, now: float) -> int:
+        return sum(
+            memory_estimate_mb(platform)
+            for platform, started in self._running.values()
+            if now - started < self.warmup_seconds
+        )
+
+    def _can_admit_locked(self, platform: str) -> bool:
+        if not self._running:
+            return True
+        if len(self._running) >= self.max_concurrency:
+            return False
+        load = self._read_load()
+        if load is not None and load >= self.max_load:
+            return False
+        available = self._read_memory()
+        if available is None:
+            return True
+        headroom = available - self._pending_mb(self._clock()) - memory_estimate_mb(platform)
+        return headroom >= self.min_free_memory_mb
+
+    def acquire(self, platform: str, should_abort: Callable[[], bool] = lambda: False) -> int | None:
+        """
+        Block until platform is admitted; return a ticket for release().
+        Returns None without admitting if should_abort() becomes true while waiting.
+        """
+        with self._cond:
+            while not self._can_admit_locked(platform):
+                if should_abort():
+                    return None
+                self._cond.wait(_POLL_SECONDS)
+            if should_abort():
+                return None
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            self._running[ticket] = (platform, self._clock())
+            return ticket
+
+    def release(self, ticket: int | None) -> None:
+        """Release a ticket from acquire() and wake waiting workers."""
+        with self._cond:
+            if ticket is not None:
+                self._running.pop(ticket, None)
+            self._cond.notify_all()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Run multiple Gradle invocations in parallel on asyncio, one process group per run.
+Single responsibility: execute N Gradle commands with bounded concurrency and
+fail-fast that reaches every process a run spawned, not just the gradlew wrapper.
+
+Same (exit_code, first_failing_platform) contract as parallel_runner.run_parallel_gradle.
+"""
+
+import asyncio
+import os
+import signal
+import subprocess
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from src.admission import AdmissionController
+from src.duration_history import DurationHistory
+from src.log_capture import LogCapture
+from src.parallel_runner import PIPE_READ_BYTES, CAPTURE_GRADLE_ARGS, RunResult, order_work_items
+from src.slots import SlotPool
+
+# Time a process group gets to exit after SIGTERM before it is sent SIGKILL.
+DEFAULT_GRACE_SECONDS = 10.0
+
+
+def _new_group_kwargs() -> dict:
+    """Subprocess kwargs that start the child as leader of its own process group."""
+    if os.name == "nt":
+        return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {"start_new_session": True}
+
+
+def _signal_group(proc: asyncio.subprocess.Process, sig: int) -> None:
+    """Send sig to proc's whole process group (POSIX), or to proc itself (Windows)."""
+    try:
+        if os.name == "nt":
+            proc.kill() if sig == getattr(signal, "SIGKILL", None) else proc.terminate()
+        else:
+            os.killpg(proc.pid, sig)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+async def terminate_process_group(
+    proc: asyncio.subprocess.Process, grace_seconds: float = DEFAULT_GRACE_SECONDS
+) -> None:
+    """
+    SIGTERM proc's process group; if the leader has not exited within grace_seconds,
+    SIGKILL the group. The group is SIGKILLed after the grace period either way, so
+    children that outlive the wrapper script are not left running.
+    """
+    _signal_group(proc, signal.SIGTERM)
+    try:
+        await asyncio.wait_for(proc.wait(), timeout=grace_seconds)
+    except asyncio.TimeoutError:
+        pass
+    _signal_group(proc, getattr(signal, "SIGKILL", signal.SIGTERM))
+    await proc.wait()
+
+
+async def run_single_gradle_async(
+    tasks: list[str],
+    cwd: Path,
+    *,
+    on_start: Callable[[asyncio.subprocess.Process], None] | None = None,
+    extra_args: list[str] | None = None,
+    grace_seconds: float = DEFAULT_GRACE_SECONDS,
+    output: Callable[[bytes], None] | None = None,
+) -> int:
+    """
+    Run one ./gradlew command in its own process group and return its exit code.
+    on_start is called with the process as soon as it is created. If the coroutine
+    is cancelled, the process group is terminated before CancelledError propagates.
+    If output is provided, stdout and stderr are piped (merged) and each chunk read
+    is passed to it.
+    """
+    cmd = ["./gradlew", "--daemon"] + (extra_args or []) + tasks
+    pipes = {} if output is None else {"stdout": asyncio.subprocess.PIPE, "stderr": asyncio.subprocess.STDOUT}
+    proc = await asyncio.create_subprocess_exec(*cmd, cwd=cwd, **pipes, **_new_group_kwargs())
+    if on_start is not None:
+        on_start(proc)
+    try:
+        if output is not None:
+            while chunk := await proc.stdout.read(PIPE_READ_BYTES):
+                output(chunk)
+        return await proc.wait()
+    except asyncio.CancelledError:
+        await asyncio.shield(terminate_process_group(proc, grace_seconds))
+        raise
+
+
+async def run_parallel_gradle_async(
+    work_items: list[tuple[str, list[str]]],
+    cwd: Path,
+    max_concurrency: int,
+    dry_run: bool = False,
+    admission: AdmissionController | None = None,
+    history: DurationHistory | None = None,
+    slots: SlotPool | None = None,
+    grace_seconds: float = DEFAULT_GRACE_SECONDS,
+    logs: LogCapture | None = None,
+    keep_going: bool = False,
+    results: list[RunResult] | None = None,
+) -> tuple[int, str | None]:
+    """
+    asyncio counterpart of run_parallel_gradle; same arguments and return value.
+
+    On the first non-zero exit every other running process group gets SIGTERM, then
+    SIGKILL after grace_seconds, and queued items never start. Cancelling the
+    coroutine terminates the running groups the same way (see run_single_gradle_async).
+    With logs set, output is captured per platform as in run_parallel_gradle.
+    """
+    work_items = order_work_items(work_items, history, max_concurrency, dry_run)
+    if dry_run:
+        return (0, None)
+
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    running: dict[str, asyncio.subprocess.Process] = {}
+    failure: list[tuple[str, int]] = []
+    cancelled = False
+
+    def should_abort() -> bool:
+        return cancelled or (bool(failure) and not keep_going)
+
+    async def run_one(platform: str, tasks: list[str]) -> None:
+        nonlocal cancelled
+        async with semaphore:
+            if failure and not keep_going:
+                return
+            ticket = None
+            if admission is not None:
+                try:
+                    ticket = await asyncio.to_thread(admission.acquire, platform, should_abort)
+                except asyncio.CancelledError:
+                    cancelled = True  # lets the admission thread stop waiting
+                    raise
+                if ticket is None:
+                    return
+
+            def on_start(proc: asyncio.subprocess.Process) -> None:
+                running[platform] = proc
+
+            slot = slots.acquire() if slots is not None else None
+            try:
+                extra_args = list(slot.gradle_args) if slot is not None else []
+                if logs is not None:
+                    extra_args += CAPTURE_GRADLE_ARGS
+                    logs.start(platform)
+                started = time.monotonic()
+                try:
+                    code = await run_single_gradle_async(
+                        tasks,
+                        slot.cwd if slot is not None else cwd,
+                        on_start=on_start,
+                        extra_args=extra_args or None,
+                        grace_seconds=grace_seconds,
+                        output=(lambda chunk: logs.feed(platform, chunk)) if logs is not None else None,
+                    )
+                except BaseException:
+                    if logs is not None:
+                        logs.finish(platform, -1, cancelled=True)
+                    raise
+                elapsed = time.monotonic() - started
+                running.pop(platform, None)
+                terminated = bool(failure) and not keep_going
+                if results is not None:
+                    log_path = logs.log_path(platform) if logs is not None else None
+                    results.append(RunResult(platform, code, elapsed, log_path, terminated))
+                if code != 0 and not failure:
+                    failure.append((platform, code))
+                    if not keep_going:
+                        await asyncio.gather(*(
+                            terminate_process_group(proc, grace_seconds) for proc in list(running.values())
+                        ))
+                if logs is not None:
+                    logs.finish(platform, code, cancelled=terminated)
+                # A run terminated by fail-fast has a meaningless duration; don't record it.
+                if history is not None and not terminated:
+                    history.record(platform, tasks, elapsed, code)
+            finally:
+                running.pop(platform, None)
+                if slot is not None:
+                    slots.release(slot)
+                if admission is not None:
+                    admission.release(ticket)
+
+    await asyncio.gather(*(run_one(name, tasks) for name, tasks in work_items))
+    if failure:
+        return (failure[0][1], failure[0][0])
+    return (0, None)
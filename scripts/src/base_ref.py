@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Choose the commit to diff HEAD against, without silently falling back to a full build.
+Single responsibility: try the requested ref, the upstream branch, a merge-base with the
+default branch, the last pushed ref from the reflog and the last verified commit, and
+report which one was used.
+"""
+
+from pathlib import Path
+from typing import NamedTuple
+
+from src.git_cli import git_output
+from src.script_cache import cache_dir, read_json, write_json
+
+LAST_VERIFIED_FILE = "last-verified.json"
+# Local branches tried for a merge-base when no remote ref is usable.
+DEFAULT_BRANCHES = ("main", "master")
+
+
+class BaseRef(NamedTuple):
+    """
+    Resolved base: the commit to diff against, how it was found, and from which ref.
+    at_head: the base is HEAD itself, so nothing was committed since it.
+    """
+
+    sha: str
+    source: str
+    ref: str
+    at_head: bool = False
+
+    def describe(self) -> str:
+        return f"{self.sha[:12]} ({self.source}: {self.ref}{', HEAD itself' if self.at_head else ''})"
+
+
+def _git(repo_root: Path, *args: str) -> str | None:
+    """Stripped git_output, or None when git failed or printed nothing."""
+    out = (git_output(repo_root, *args) or "").strip()
+    return out or None
+
+
+def _merge_base(repo_root: Path, ref: str) -> str | None:
+    return _git(repo_root, "merge-base", ref, "HEAD")
+
+
+def _upstream(repo_root: Path) -> str | None:
+    return _git(repo_root, "rev-parse", "--abbrev-ref", "--symbolic-full-name", "@{upstream}")
+
+
+def _last_pushed(repo_root: Path) -> str | None:
+    """Newest remote-tracking ref value written by a push of the current branch, per the reflog."""
+    branch = _git(repo_root, "symbolic-ref", "--quiet", "--short", "HEAD")
+    if branch is None:
+        return None
+    remotes = (_git(repo_root, "remote") or "").split()
+    for remote in remotes:
+        log = _git(repo_root, "reflog", "show", "--format=%H %gs", f"refs/remotes/{remote}/{branch}", "--")
+        for line in (log or "").splitlines():
+            sha, _, subject = line.partition(" ")
+            if "update by push" in subject:
+                return sha
+    return None
+
+
+def last_verified(repo_root: Path) -> str | None:
+    """Commit recorded by record_verified, if any."""
+    data = read_json(cache_dir(repo_root) / LAST_VERIFIED_FILE)
+    sha = data.get("sha") if data else None
+    return sha if isinstance(sha, str) else None
+
+
+def record_verified(repo_root: Path) -> None:
+    """Remember HEAD as verified (all affected tests passed) for later base resolution."""
+    head = _git(repo_root, "rev-parse", "HEAD")
+    if head is not None:
+        write_json(cache_dir(repo_root) / LAST_VERIFIED_FILE, {"sha": head})
+
+
+def resolve_base(requested: str, repo_root: Path) -> tuple[BaseRef | None, list[str]]:
+    """
+    Return (base, notes). base is the merge-base with HEAD of the first usable candidate:
+    the requested ref, the upstream tracking branch, a default branch (local name of the
+    requested ref, then main/master), the last pushed ref from the reflog, then the last
+    verified commit. A candidate whose merge-base is HEAD is used too, with at_head set:
+    nothing was committed since it, so callers plan no committed changes (rather than a
+    full build). notes says why each skipped candidate was not used; base is None only
+    when every candidate failed.
+    """
+    head = _git(repo_root, "rev-parse", "HEAD")
+    if head is None:
+        return (None, ["HEAD does not resolve to a commit"])
+    local_name = requested.split("/", 1)[1] if "/" in requested else requested
+    candidates: list[tuple[str, str | None]] = [("requested", requested), ("upstream", _upstream(repo_root))]
+    candidates += [("merge-base", name) for name in dict.fromkeys((local_name, *DEFAULT_BRANCHES))]
+    candidates += [("reflog push", _last_pushed(repo_root)), ("last verified", last_verified(repo_root))]
+    notes = []
+    tried = set()
+    for source, ref in candidates:
+        if ref is None:
+            notes.append(f"{source}: not available")
+            continue
+        if ref in tried:
+            continue
+        tried.add(ref)
+        sha = _merge_base(repo_root, ref)
+        if sha is None:
+            notes.append(f"{source}: {ref} not found or unrelated to HEAD")
+        else:
+            return (BaseRef(sha, source, ref, at_head=sha == head), notes)
+    return (None, notes)
+
+
+def describe_resolution(requested: str, base: BaseRef | None, notes: list[str]) -> list[str]:
+    """Lines telling the user which base was used, and why others were not (if it matters)."""
+    if base is None:
+        return [f"No usable base ref for {requested}:", *(f"  {n}" for n in notes), "Falling back to a full build."]
+    lines = [f"Base: {base.describe()}"]
+    if base.source != "requested":
+        lines[1:] = [f"  {n}" for n in notes]
+    return lines
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+JSON build plan: what test_platforms.py would run, for CI matrix generation.
+Single responsibility: build, validate and read the plan document (work items with
+tasks, required runner OS and estimated cost); no Git or Gradle access.
+"""
+
+import json
+import sys
+from collections.abc import Callable
+from pathlib import Path
+
+PLAN_VERSION = 1
+
+# Host OS a platform's work items have to run on. Kotlin/Native Apple targets only
+# build on macOS; every other target (mingwX64 included, whose work item only
+# compiles) builds on Linux.
+RUNNER_OS_BY_PLATFORM = {
+    "ios": "macos",
+    "macos": "macos",
+    "tvos": "macos",
+    "watchos": "macos",
+}
+DEFAULT_RUNNER_OS = "linux"
+RUNNER_OSES = ("linux", "macos", "windows")
+
+
+class PlanError(Exception):
+    """The requested plan cannot be built or a plan document is invalid."""
+
+
+def runner_os(platform: str) -> str:
+    """Runner OS needed for platform's work item ("linux" unless listed above)."""
+    return RUNNER_OS_BY_PLATFORM.get(platform, DEFAULT_RUNNER_OS)
+
+
+def make_plan(
+    work_items: list[tuple[str, list[str]]],
+    libraries: list[str],
+    base: str,
+    estimate: Callable[[str, list[str]], float],
+) -> dict:
+    """
+    Plan document for work_items. libraries: touched libraries plus their dependents
+    (or all libraries for a full build).
+    """
+    items = [
+        {
+            "platform": platform,
+            "tasks": tasks,
+            "runner_os": runner_os(platform),
+            "estimated_seconds": round(estimate(platform, tasks), 1),
+        }
+        for platform, tasks in work_items
+    ]
+    return {
+        "version": PLAN_VERSION,
+        "base": base,
+        "libraries": sorted(libraries),
+        "platforms": sorted({item["platform"] for item in items}),
+        "runner_os": sorted({item["runner_os"] for item in items}),
+        "estimated_seconds": round(sum(item["estimated_seconds"] for item in items), 1),
+        "work_items": items,
+    }
+
+
+def read_plan(path: Path | None) -> dict:
+    """Load and validate a plan document from path (None: stdin). Raises PlanError."""
+    try:
+        text = sys.stdin.read() if path is None else path.read_text()
+        plan = json.loads(text)
+    except (OSError, ValueError) as e:
+        raise PlanError(f"cannot read plan: {e}") from None
+    if not isinstance(plan, dict) or plan.get("version") != PLAN_VERSION:
+        raise PlanError(f"unsupported plan (expected version {PLAN_VERSION})")
+    items = plan.get("work_items")
+    if not isinstance(items, list) or not all(
+        isinstance(i, dict) and isinstance(i.get("platform"), str) and isinstance(i.get("tasks"), list)
+        for i in items
+    ):
+        raise PlanError("plan has no valid work_items")
+    return plan
+
+
+def plan_work_items(plan: dict, runner_os_filter: str | None = None) -> list[tuple[str, list[str]]]:
+    """Work items of plan, optionally only those that need runner_os_filter."""
+    return [
+        (item["platform"], list(item["tasks"]))
+        for item in plan["work_items"]
+        if item["tasks"] and (runner_os_filter is None or item.get("runner_os", DEFAULT_RUNNER_OS) == runner_os_filter)
+    ]
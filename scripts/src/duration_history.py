@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Local history of Gradle run durations, and longest-job-first scheduling from it.
+Single responsibility: record (library, platform, task set, duration, exit code) in
+SQLite under .gradle/ and estimate how long a work item will take.
+"""
+
+import heapq
+import sqlite3
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from src.script_cache import cache_dir
+
+HISTORY_FILE = "history.sqlite"
+# Only recent successful runs describe current performance.
+RECENT_RUNS = 5
+
+# Seconds for one library on a platform when there is no history yet.
+DEFAULT_SECONDS_BY_PLATFORM = {
+    "jvm": 60.0,
+    "android": 120.0,
+    "js": 90.0,
+    "wasmJs": 90.0,
+    "wasmWasi": 90.0,
+    "androidNative": 240.0,
+    "ios": 300.0,
+    "macos": 240.0,
+    "tvos": 300.0,
+    "watchos": 300.0,
+    "linuxX64": 180.0,
+    "linuxArm64": 180.0,
+    "mingwX64": 180.0,
+}
+DEFAULT_SECONDS = 120.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    library TEXT NOT NULL,
+    platform TEXT NOT NULL,
+    task_set TEXT NOT NULL,
+    task_count INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    exit_code INTEGER NOT NULL,
+    recorded_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_by_key ON runs (platform, task_set);
+"""
+
+
+def _libraries(tasks: list[str]) -> list[str]:
+    """Library project paths of full task paths (":libraries:a:jvmTest" -> ":libraries:a")."""
+    return sorted({t.rsplit(":", 1)[0] for t in tasks if t.count(":") >= 2})
+
+
+def _task_set(tasks: list[str]) -> str:
+    return " ".join(sorted(set(tasks)))
+
+
+class DurationHistory:
+    """
+    SQLite-backed duration history. Every call opens its own short-lived connection,
+    so one instance can be shared by runner threads. Storage errors are swallowed:
+    history only affects ordering, never the build result.
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = db_path
+
+    @classmethod
+    def for_repo(cls, repo_root: Path) -> "DurationHistory":
+        return cls(cache_dir(repo_root) / HISTORY_FILE)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Read-write connection, creating the database (and its directory) if needed."""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def _connect_read_only(self) -> sqlite3.Connection | None:
+        """Read-only connection to an existing database, or None when nothing was recorded yet."""
+        if not self.db_path.is_file():
+            return None
+        return sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True, timeout=5)
+
+    def record(self, platform: str, tasks: list[str], duration: float, exit_code: int) -> None:
+        """Record one finished Gradle run."""
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute(
+                        "INSERT INTO runs (library, platform, task_set, task_count, duration, exit_code, recorded_at)"
+                        " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (",".join(_libraries(tasks)), platform, _task_set(tasks), len(tasks),
+                         duration, exit_code, time.time()),
+                    )
+            finally:
+                conn.close()
+        except (sqlite3.Error, OSError):
+            pass
+
+    def estimate(self, platform: str, tasks: list[str]) -> float:
+        """
+        Return expected seconds for a run: mean of recent successful runs of the same task
+        set; else recent per-task mean for the platform times the task count; else a default.
+        Never creates the database: a read-only run (e.g. --dry-run) leaves no files behind.
+        """
+        try:
+            conn = self._connect_read_only()
+            if conn is not None:
+                try:
+                    row = conn.execute(
+                        "SELECT AVG(duration) FROM (SELECT duration FROM runs"
+                        " WHERE platform = ? AND task_set = ? AND exit_code = 0"
+                        " ORDER BY recorded_at DESC LIMIT ?)",
+                        (platform, _task_set(tasks), RECENT_RUNS),
+                    ).fetchone()
+                    if row and row[0] is not None:
+                        return float(row[0])
+                    row = conn.execute(
+                        "SELECT AVG(duration / task_count) FROM (SELECT duration, task_count FROM runs"
+                        " WHERE platform = ? AND exit_code = 0 AND task_count > 0"
+                        " ORDER BY recorded_at DESC LIMIT ?)",
+                        (platform, RECENT_RUNS),
+                    ).fetchone()
+                    if row and row[0] is not None:
+                        return float(row[0]) * max(1, len(tasks))
+                finally:
+                    conn.close()
+        except (sqlite3.Error, OSError):
+            pass
+        return DEFAULT_SECONDS_BY_PLATFORM.get(platform, DEFAULT_SECONDS) * max(1, len(_libraries(tasks)))
+
+
+def longest_first(
+    work_items: list[tuple[str, list[str]]], estimate: Callable[[str, list[str]], float]
+) -> list[tuple[str, list[str]]]:
+    """Return work items ordered longest expected first (LPT); ties keep platform order."""
+    return sorted(work_items, key=lambda item: (-estimate(item[0], item[1]), item[0]))
+
+
+def predicted_makespan(durations: list[float], max_concurrency: int) -> float:
+    """Wall-clock seconds to run durations in the given order on max_concurrency slots."""
+    slots = [0.0] * max(1, min(max_concurrency, len(durations) or 1))
+    for duration in durations:
+        heapq.heapreplace(slots, slots[0] + duration)
+    return max(slots)
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+Change records: one changed path and how it changed.
+Single responsibility: the FileChange record and its kinds, shared by the git readers
+(touched_files, file_watcher) and the planner (platform_core); no imports of either.
+"""
+
+from typing import NamedTuple
+
+ADDED = "added"
+MODIFIED = "modified"
+DELETED = "deleted"
+RENAMED = "renamed"
+COPIED = "copied"
+
+
+class FileChange(NamedTuple):
+    """One changed path. old_path is set for renames and copies (path is the new name)."""
+
+    kind: str
+    path: str
+    old_path: str | None = None
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Watch source trees for saved, created, deleted and moved files.
+Single responsibility: turn filesystem activity under a set of roots into debounced
+bursts of change records; no planning and no Gradle.
+
+Linux uses inotify (through ctypes, one watch per directory); anywhere else, or when
+inotify is unavailable or out of watches, the trees are re-scanned on an interval.
+"""
+
+import ctypes
+import errno
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+
+from src.file_change import DELETED, MODIFIED, FileChange
+
+# Quiet period that ends a burst of saves (an IDE saving many files, a git checkout).
+DEFAULT_DEBOUNCE_SECONDS = 0.3
+# Re-scan interval of the polling fallback.
+DEFAULT_POLL_INTERVAL = 1.0
+# How often a waiting next_burst() checks its stop event.
+_STOP_CHECK_SECONDS = 0.5
+
+# Directories never watched: build output and tool state that Gradle and IDEs rewrite.
+SKIP_DIR_NAMES = frozenset({"build", "node_modules"})
+# Editor scratch files that never affect a build (vim's "4913" write probe included).
+_IGNORED_SUFFIXES = ("~", ".swp", ".swx", ".tmp")
+_IGNORED_NAMES = frozenset({"4913"})
+
+# <sys/inotify.h>
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_WATCH_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE | _IN_MOVE_SELF
+_EVENT_HEADER = struct.Struct("iIII")
+_READ_BYTES = 64 * 1024
+
+
+def skip_dir(name: str) -> bool:
+    """True for directories that are not watched (hidden, build output)."""
+    return name.startswith(".") or name in SKIP_DIR_NAMES
+
+
+def ignored_file(name: str) -> bool:
+    """True for editor scratch files that changes are never reported for."""
+    return name.startswith(".") or name.endswith(_IGNORED_SUFFIXES) or name in _IGNORED_NAMES
+
+
+def _walk(root: Path):
+    """os.walk over root without skipped directories; yields (directory, file paths)."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not skip_dir(d)]
+        directory = Path(dirpath)
+        yield directory, [directory / f for f in filenames if not ignored_file(f)]
+
+
+class InotifyWatcher:
+    """
+    Recursive inotify watch on roots. Directories created or moved in later are
+    watched (and their files reported) as they appear. Raises OSError when inotify
+    is unavailable or the per-user watch limit is reached.
+    """
+
+    kind = "inotify"
+
+    def __init__(self, roots: list[Path]) -> None:
+        if not sys.platform.startswith("linux"):
+            raise OSError(errno.ENOSYS, "inotify is Linux only")
+        libc = ctypes.CDLL(None, use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError(errno.ENOSYS, "libc has no inotify")
+        self._libc = libc
+        self._roots = roots
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"inotify_init1: {os.strerror(err)}")
+        self._dirs: dict[int, Path] = {}
+        try:
+            for root in roots:
+                self._add_tree(root)
+        except OSError:
+            self.close()
+            raise
+
+    def __enter__(self) -> "InotifyWatcher":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _add_tree(self, root: Path) -> set[Path]:
+        """Watch root and its subdirectories; return the files already in them."""
+        files: set[Path] = set()
+        for directory, paths in _walk(root):
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+            if wd < 0:
+                err = ctypes.get_errno()
+                if err in (errno.ENOENT, errno.ENOTDIR):
+                    continue  # removed while walking
+                raise OSError(err, f"inotify_add_watch {directory}: {os.strerror(err)}")
+            self._dirs[wd] = directory
+            files.update(paths)
+        return files
+
+    def poll(self, timeout: float | None) -> set[Path]:
+        """Block up to timeout seconds for events; return the paths they touched (maybe none)."""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        changed: set[Path] = set()
+        while ready:
+            try:
+                data = os.read(self._fd, _READ_BYTES)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                offset += length
+                changed |= self._handle(wd, mask, name)
+        return changed
+
+    def _handle(self, wd: int, mask: int, name: str) -> set[Path]:
+        if mask & _IN_Q_OVERFLOW:
+            # Events were dropped: re-watch everything and report every file.
+            return set().union(*(self._add_tree(root) for root in self._roots))
+        if mask & _IN_IGNORED:
+            self._dirs.pop(wd, None)
+            return set()
+        directory = self._dirs.get(wd)
+        if directory is None:
+            return set()
+        if mask & _IN_MOVE_SELF:
+            # The directory's events would carry its old path; it is re-added where it lands.
+            self._libc.inotify_rm_watch(self._fd, wd)
+            self._dirs.pop(wd, None)
+            return set()
+        path = directory / name
+        if mask & _IN_ISDIR:
+            if skip_dir(name):
+                return set()
+            if mask & (_IN_CREATE | _IN_MOVED_TO):
+                return self._add_tree(path)
+            if mask & _IN_MOVED_FROM:
+                return {path}  # its files are gone from here; the directory stands for them
+            return set()
+        return set() if ignored_file(name) else {path}
+
+
+class PollingWatcher:
+    """Re-scans roots every interval seconds and reports files whose mtime or size changed."""
+
+    kind = "polling"
+
+    def __init__(self, roots: list[Path], interval: float = DEFAULT_POLL_INTERVAL) -> None:
+        self._roots = roots
+        self._interval = interval
+        self._snapshot = self._scan()
+
+    def __enter__(self) -> "PollingWatcher":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        pass
+
+    def _scan(self) -> dict[Path, tuple[int, int]]:
+        snapshot = {}
+        for root in self._roots:
+            for _directory, paths in _walk(root):
+                for path in paths:
+                    try:
+                        st = path.stat()
+                    except OSError:
+                        continue
+                    snapshot[path] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def poll(self, timeout: float | None) -> set[Path]:
+        """Re-scan until something changed or timeout seconds passed; return the changed paths."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            current = self._scan()
+            previous, self._snapshot = self._snapshot, current
+            changed = {p for p in current.keys() | previous.keys() if current.get(p) != previous.get(p)}
+            if changed:
+                return changed
+            remaining = self._interval if deadline is None else deadline - time.monotonic()
+            if remaining <= 0:
+                return set()
+            time.sleep(min(self._interval, remaining))
+
+
+def open_watcher(roots: list[Path], polling: bool = False) -> InotifyWatcher | PollingWatcher:
+    """Inotify watcher on roots, or the polling fallback when asked or when inotify fails."""
+    if not polling:
+        try:
+            return InotifyWatcher(roots)
+        except OSError as e:
+            print(f"inotify unavailable ({e}); polling every {DEFAULT_POLL_INTERVAL:.0f}s instead", file=sys.stderr)
+    return PollingWatcher(roots)
+
+
+def next_burst(
+    watcher: InotifyWatcher | PollingWatcher,
+    repo_root: Path,
+    debounce: float,
+    stop: threading.Event,
+) -> list[FileChange] | None:
+    """
+    Wait for the next change, then keep collecting until debounce seconds pass without
+    one. Returns the burst as change records with repo-relative paths (deleted when the
+    path no longer exists, else modified), sorted by path; None once stop is set.
+    """
+    changed: set[Path] = set()
+    while not changed:
+        if stop.is_set():
+            return None
+        changed = watcher.poll(_STOP_CHECK_SECONDS)
+    while more := watcher.poll(debounce):
+        changed |= more
+    records = []
+    for path in sorted(changed):
+        try:
+            relative = path.relative_to(repo_root).as_posix()
+        except ValueError:
+            continue
+        records.append(FileChange(MODIFIED if path.exists() else DELETED, relative))
+    return records
@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+Short git commands run to completion (rev-parse, ls-tree, worktree, ...).
+Single responsibility: run git in a repository and report failure as None, so callers
+never handle OSError themselves. Streaming diffs stay in touched_files.
+"""
+
+import subprocess
+from pathlib import Path
+
+
+def run_git(repo_root: Path, *args: str) -> subprocess.CompletedProcess | None:
+    """Finished `git args` in repo_root (text output captured), or None if git cannot be run."""
+    try:
+        return subprocess.run(["git", *args], cwd=repo_root, capture_output=True, text=True, check=False)
+    except OSError:
+        return None
+
+
+def git_output(repo_root: Path, *args: str) -> str | None:
+    """stdout of `git args` in repo_root, or None unless git ran and exited 0."""
+    result = run_git(repo_root, *args)
+    return result.stdout if result is not None and result.returncode == 0 else None
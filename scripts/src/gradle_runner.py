@@ -4,9 +4,14 @@ Run Gradle with a given task list.
 Single responsibility: execute ./gradlew; no path or platform logic.
 """
 
+import json
 import subprocess
+import tempfile
 from pathlib import Path
 
+# Init script that writes the task inventory as JSON (see resolve_library_tasks).
+TASK_INVENTORY_INIT_SCRIPT = Path(__file__).resolve().parent / "gradle" / "task-inventory.init.gradle"
+
 
 def run_gradle(tasks: list[str], cwd: Path, dry_run: bool = False) -> int:
     """Run ./gradlew with the given tasks. Caller provides cwd. Return exit code."""
@@ -23,38 +28,35 @@ def resolve_library_tasks(
     """
     Return full task paths (e.g. :libraries:core:jvmTest) that exist in Gradle,
     are under one of library_projects, and whose task name is in task_names.
-    Uses `gradlew tasks --all` so no source-dir list is maintained.
+    Runs Gradle with TASK_INVENTORY_INIT_SCRIPT, configuring only the requested
+    libraries on demand, and reads the JSON inventory it writes.
     """
     if not task_names or not library_projects:
         return []
-    lib_prefixes = tuple(f"{lp.lstrip(':')}:" for lp in library_projects)
     task_set = set(task_names)
-    result = subprocess.run(
-        ["./gradlew", "--daemon", "tasks", "--all", "--no-configuration-cache", "-q"],
-        cwd=cwd,
-        capture_output=True,
-        text=True,
-        timeout=120,
-    )
-    if result.returncode != 0:
-        stderr = (result.stderr or "").strip()
-        msg = f"gradlew tasks --all failed (exit {result.returncode})"
-        if stderr:
-            msg += f": {stderr[:500]}" + ("..." if len(stderr) > 500 else "")
-        raise RuntimeError(msg)
-    out = (result.stdout or "") + (result.stderr or "")
+    with tempfile.TemporaryDirectory(prefix="kmp-task-inventory-") as tmp:
+        output = Path(tmp) / "inventory.json"
+        cmd = [
+            "./gradlew", "--daemon", "-q", "--no-configuration-cache", "--configure-on-demand",
+            "--init-script", str(TASK_INVENTORY_INIT_SCRIPT),
+            f"-Dkmp.inventory.output={output}",
+            f"-Dkmp.inventory.tasks={','.join(sorted(task_set))}",
+        ] + [f"{lp}:help" for lp in sorted(set(library_projects))]
+        result = subprocess.run(cmd, cwd=cwd, capture_output=True, text=True, timeout=120)
+        if result.returncode != 0:
+            stderr = (result.stderr or "").strip()
+            msg = f"gradlew task inventory failed (exit {result.returncode})"
+            if stderr:
+                msg += f": {stderr[:500]}" + ("..." if len(stderr) > 500 else "")
+            raise RuntimeError(msg)
+        try:
+            inventory = json.loads(output.read_text())
+        except (OSError, ValueError) as e:
+            raise RuntimeError(f"gradlew task inventory wrote no readable output: {e}") from e
+    projects = inventory.get("projects", {}) if isinstance(inventory, dict) else {}
     tasks = []
-    for line in out.splitlines():
-        if " - " not in line:
-            continue
-        path, _ = line.split(" - ", 1)
-        path = path.strip().lstrip(":")
-        if not path or path.count(":") < 2:
-            continue
-        if not any(path.startswith(prefix) for prefix in lib_prefixes):
-            continue
-        name = path.split(":")[-1]
-        if name not in task_set:
-            continue
-        tasks.append(":" + path)
+    for project in library_projects:
+        for name in projects.get(project, []):
+            if name in task_set:
+                tasks.append(f"{project}:{name}")
     return sorted(set(tasks))
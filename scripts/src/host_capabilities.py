@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+What this machine can build: OS, CPU architecture and, on macOS, whether Xcode is installed.
+Single responsibility: describe the host and split work items into the part that can run
+here and the part deferred to a host with the runner OS it needs (see build_plan.runner_os).
+
+Kotlin/Native Apple targets (ios, macos, tvos, watchos) need macOS with Xcode; everything
+else, mingwX64 included (Kotlin/Native cross-compiles it), runs on any host.
+"""
+
+import platform
+import shutil
+import subprocess
+import sys
+from typing import NamedTuple
+
+from src.build_plan import DEFAULT_RUNNER_OS, runner_os
+
+_OS_NAMES = {"linux": "Linux", "macos": "macOS", "windows": "Windows"}
+_ARCH_ALIASES = {"x86_64": "x64", "amd64": "x64", "aarch64": "arm64", "arm64": "arm64"}
+
+
+class HostCapabilities(NamedTuple):
+    """os: a build_plan.RUNNER_OSES value; arch: x64, arm64 or the raw machine name."""
+
+    os: str
+    arch: str
+    xcode: bool = False
+
+    def describe(self) -> str:
+        """E.g. "linux-x64" or "macos-arm64 (Xcode)"."""
+        xcode = "" if self.os != "macos" else " (Xcode)" if self.xcode else " (no Xcode)"
+        return f"{self.os}-{self.arch}{xcode}"
+
+    def as_dict(self) -> dict:
+        return {"os": self.os, "arch": self.arch, "xcode": self.xcode}
+
+
+class DeferredItem(NamedTuple):
+    """A work item this host cannot run, and why."""
+
+    platform: str
+    tasks: list[str]
+    reason: str
+
+
+def _host_os() -> str:
+    if sys.platform == "darwin":
+        return "macos"
+    if sys.platform.startswith(("win", "cygwin", "msys")):
+        return "windows"
+    return "linux"
+
+
+def _has_xcode() -> bool:
+    """True if xcrun finds xcodebuild (the Command Line Tools alone are not enough for Kotlin/Native)."""
+    if shutil.which("xcrun") is None:
+        return False
+    try:
+        result = subprocess.run(["xcrun", "--find", "xcodebuild"], capture_output=True, timeout=15)
+    except (OSError, subprocess.SubprocessError):
+        return False
+    return result.returncode == 0
+
+
+def detect_host() -> HostCapabilities:
+    """Capabilities of the machine running this script. Only probes Xcode on macOS."""
+    host_os = _host_os()
+    machine = platform.machine().lower()
+    return HostCapabilities(host_os, _ARCH_ALIASES.get(machine, machine), host_os == "macos" and _has_xcode())
+
+
+def deferral_reason(platform_name: str, host: HostCapabilities) -> str | None:
+    """Why host cannot run platform's work item, or None if it can."""
+    needed = runner_os(platform_name)
+    if needed == DEFAULT_RUNNER_OS:
+        return None
+    if needed != host.os:
+        return f"needs a {_OS_NAMES.get(needed, needed)} host"
+    if needed == "macos" and not host.xcode:
+        return "needs Xcode (xcrun cannot find xcodebuild)"
+    return None
+
+
+def split_work(
+    work_items: list[tuple[str, list[str]]], host: HostCapabilities
+) -> tuple[list[tuple[str, list[str]]], list[DeferredItem]]:
+    """(work items host can run, deferred items) in the original order."""
+    runnable, deferred = [], []
+    for name, tasks in work_items:
+        reason = deferral_reason(name, host)
+        if reason is None:
+            runnable.append((name, tasks))
+        else:
+            deferred.append(DeferredItem(name, tasks, reason))
+    return (runnable, deferred)
+
+
+def describe_deferred(deferred: list[DeferredItem], host: HostCapabilities) -> list[str]:
+    """Report lines for deferred items (none when nothing was deferred)."""
+    if not deferred:
+        return []
+    lines = [f"Deferred to a capable host (this host: {host.describe()}):"]
+    for item in deferred:
+        lines.append(f"  [deferred] {item.platform}: {item.reason}: {' '.join(item.tasks)}")
+    return lines
+
+
+def annotate_plan(plan: dict, host: HostCapabilities) -> dict:
+    """Record host in a build_plan document, and on each work item why it cannot run there (or None)."""
+    plan["host"] = host.as_dict()
+    for item in plan["work_items"]:
+        item["deferred_reason"] = deferral_reason(item["platform"], host)
+    return plan
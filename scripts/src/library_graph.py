@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Inter-library dependency graph, built statically from libraries/*/build.gradle.kts.
+Single responsibility: find which libraries depend on which, and the transitive
+dependents of a changed set. No Gradle invocation.
+"""
+
+import re
+from collections import deque
+from pathlib import Path
+
+from src.script_cache import cache_dir, hash_files, read_json, write_json
+
+GRAPH_CACHE_FILE = "library-graph.json"
+
+# project(":libraries:x") and project(path = ":libraries:x")
+_PROJECT_DEPENDENCY_RE = re.compile(r'\bproject\(\s*(?:path\s*=\s*)?"(:libraries:[^":]+)"')
+# Type-safe project accessors: projects.libraries.exampleLibrary
+_PROJECT_ACCESSOR_RE = re.compile(r"\bprojects\.libraries\.(\w+)")
+_BLOCK_COMMENT_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
+_LINE_COMMENT_RE = re.compile(r"(?<![:\"])//.*$", re.MULTILINE)
+
+
+def _accessor_name(library_name: str) -> str:
+    """Gradle's type-safe accessor for a project name: "example-library" -> "exampleLibrary"."""
+    parts = re.split(r"[-_.]", library_name)
+    return parts[0] + "".join(p[:1].upper() + p[1:] for p in parts[1:])
+
+
+def parse_library_dependencies(script: str, library_names: set[str]) -> set[str]:
+    """
+    Return :libraries:<name> project paths referenced by a build script, either as
+    project(":libraries:x") or as projects.libraries.x. Comments are ignored.
+    """
+    code = _LINE_COMMENT_RE.sub("", _BLOCK_COMMENT_RE.sub("", script))
+    deps = {m.group(1) for m in _PROJECT_DEPENDENCY_RE.finditer(code)}
+    by_accessor = {_accessor_name(name): name for name in library_names}
+    for m in _PROJECT_ACCESSOR_RE.finditer(code):
+        name = by_accessor.get(m.group(1))
+        if name is not None:
+            deps.add(f":libraries:{name}")
+    return deps
+
+
+def _library_build_files(repo_root: Path) -> dict[str, Path]:
+    libraries_dir = repo_root / "libraries"
+    if not libraries_dir.is_dir():
+        return {}
+    result = {}
+    for path in libraries_dir.iterdir():
+        build_file = path / "build.gradle.kts"
+        if path.is_dir() and build_file.exists():
+            result[path.name] = build_file
+    return result
+
+
+def build_dependency_graph(repo_root: Path, use_cache: bool = True) -> dict[str, set[str]]:
+    """
+    Return {library_project_path: set of library project paths it depends on}.
+    The result is cached under .gradle/ keyed by the hash of all library build scripts,
+    so unchanged build files are not re-parsed.
+    """
+    build_files = _library_build_files(repo_root)
+    key = hash_files(repo_root, build_files.values())
+    cache_file = cache_dir(repo_root) / GRAPH_CACHE_FILE
+    if use_cache:
+        cached = read_json(cache_file)
+        if cached is not None and cached.get("key") == key and isinstance(cached.get("graph"), dict):
+            return {lib: set(deps) for lib, deps in cached["graph"].items()}
+
+    names = set(build_files)
+    graph = {}
+    for name, build_file in build_files.items():
+        lib = f":libraries:{name}"
+        deps = parse_library_dependencies(build_file.read_text(errors="replace"), names)
+        graph[lib] = {d for d in deps if d != lib}
+    if use_cache:
+        write_json(cache_file, {"key": key, "graph": {lib: sorted(deps) for lib, deps in graph.items()}})
+    return graph
+
+
+def dependents_closure(graph: dict[str, set[str]], changed: set[str]) -> set[str]:
+    """Return changed plus every library that transitively depends on one of them."""
+    reverse: dict[str, set[str]] = {}
+    for lib, deps in graph.items():
+        for dep in deps:
+            reverse.setdefault(dep, set()).add(lib)
+    result = set(changed)
+    queue = deque(changed)
+    while queue:
+        for dependent in reverse.get(queue.popleft(), ()):
+            if dependent not in result:
+                result.add(dependent)
+                queue.append(dependent)
+    return result
+
+
+def propagate_to_dependents(
+    graph: dict[str, set[str]], platforms_by_lib: dict[str, set[str]]
+) -> dict[str, set[str]]:
+    """
+    Return a map where every transitive dependent of a library also gets that library's
+    platforms (a dependent must recompile against it on those platforms).
+    Input map is not modified.
+    """
+    result = {lib: set(plats) for lib, plats in platforms_by_lib.items()}
+    for lib, plats in platforms_by_lib.items():
+        if not plats:
+            continue
+        for dependent in dependents_closure(graph, {lib}) - {lib}:
+            result.setdefault(dependent, set()).update(plats)
+    return result
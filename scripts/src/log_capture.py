@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Multiplexed, bounded capture of parallel Gradle output.
+Single responsibility: keep each platform's output in a ring buffer and a compressed
+spill file, show one live status line per platform, and dump failing tails at the end.
+"""
+
+import gzip
+import sys
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import TextIO
+
+LOG_DIR = Path("build") / "kmp-scripts" / "logs"
+# Lines of each platform's output kept in memory and shown for failures.
+DEFAULT_TAIL_LINES = 80
+# Minimum seconds between live redraws; state changes always redraw.
+_REDRAW_INTERVAL = 0.25
+_STATUS_WIDTH = 120
+
+
+class _PlatformLog:
+    def __init__(self, spill_path: Path, tail_lines: int) -> None:
+        self.spill_path = spill_path
+        self.tail: deque[bytes] = deque(maxlen=tail_lines)
+        self.partial = b""
+        self.bytes = 0
+        self.state = "running"
+        self.exit_code: int | None = None
+        self.started = time.monotonic()
+        self.elapsed = 0.0
+        spill_path.parent.mkdir(parents=True, exist_ok=True)
+        self.spill = gzip.open(spill_path, "wb", compresslevel=1)
+
+    def feed(self, data: bytes) -> None:
+        self.bytes += len(data)
+        self.spill.write(data)
+        lines = (self.partial + data).split(b"\n")
+        self.partial = lines.pop()
+        self.tail.extend(line.rstrip(b"\r") for line in lines)
+
+    def close(self) -> None:
+        if self.partial:
+            self.tail.append(self.partial)
+            self.partial = b""
+        self.spill.close()
+        self.elapsed = time.monotonic() - self.started
+
+    def last_line(self) -> str:
+        for line in reversed([self.partial, *self.tail]):
+            text = line.decode("utf-8", errors="replace").strip()
+            if text:
+                return text
+        return ""
+
+
+class LogCapture:
+    """
+    Output sink for parallel runs. Runners call start(platform), feed(platform, bytes)
+    for each chunk read from the process pipe, and finish(platform, exit_code).
+    On a terminal, a block of one status line per platform is redrawn in place;
+    otherwise only start/finish lines are printed. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        log_dir: Path,
+        tail_lines: int = DEFAULT_TAIL_LINES,
+        stream: TextIO | None = None,
+        live: bool | None = None,
+    ) -> None:
+        self.log_dir = log_dir
+        self.tail_lines = tail_lines
+        self.stream = stream if stream is not None else sys.stdout
+        self.live = self.stream.isatty() if live is None else live
+        self._logs: dict[str, _PlatformLog] = {}
+        self._lock = threading.Lock()
+        self._drawn = 0
+        self._last_draw = 0.0
+
+    @classmethod
+    def for_repo(cls, repo_root: Path, **kwargs) -> "LogCapture":
+        return cls(repo_root / LOG_DIR, **kwargs)
+
+    def log_path(self, platform: str) -> Path:
+        """Compressed spill file holding platform's full output."""
+        return self.log_dir / f"{platform}.log.gz"
+
+    def start(self, platform: str) -> None:
+        with self._lock:
+            self._logs[platform] = _PlatformLog(self.log_path(platform), self.tail_lines)
+            if not self.live:
+                self._print(f"[start] {platform}")
+            self._draw(force=True)
+
+    def feed(self, platform: str, data: bytes) -> None:
+        with self._lock:
+            self._logs[platform].feed(data)
+            self._draw(force=False)
+
+    def finish(self, platform: str, exit_code: int, cancelled: bool = False) -> None:
+        with self._lock:
+            log = self._logs[platform]
+            log.close()
+            log.exit_code = exit_code
+            log.state = "cancelled" if cancelled else ("passed" if exit_code == 0 else "failed")
+            if not self.live:
+                self._print(self._status(platform, log))
+            self._draw(force=True)
+
+    def tail(self, platform: str) -> list[str]:
+        """Last captured lines of platform's output (at most tail_lines)."""
+        with self._lock:
+            log = self._logs.get(platform)
+            if log is None:
+                return []
+            return [line.decode("utf-8", errors="replace") for line in log.tail]
+
+    def failed_platforms(self) -> list[str]:
+        with self._lock:
+            return [p for p, log in self._logs.items() if log.state == "failed"]
+
+    def print_failures(self, stream: TextIO | None = None) -> None:
+        """Print the output tail of every failed platform, with its spill file path."""
+        out = stream if stream is not None else sys.stderr
+        for platform in self.failed_platforms():
+            lines = self.tail(platform)
+            print(f"\n===== {platform}: last {len(lines)} lines (full log: {self.log_path(platform)}) =====", file=out)
+            for line in lines:
+                print(line, file=out)
+        out.flush()
+
+    def _status(self, platform: str, log: _PlatformLog) -> str:
+        if log.state == "running":
+            elapsed = time.monotonic() - log.started
+            text = f"[running] {platform} {elapsed:4.0f}s  {log.last_line()}"
+        elif log.state == "passed":
+            text = f"[pass] {platform} ({log.elapsed:.0f}s)"
+        elif log.state == "failed":
+            text = f"[FAIL] {platform} exit {log.exit_code} ({log.elapsed:.0f}s), log: {log.spill_path}"
+        else:
+            text = f"[cancelled] {platform}"
+        return text[:_STATUS_WIDTH]
+
+    def _print(self, line: str) -> None:
+        self.stream.write(line + "\n")
+        self.stream.flush()
+
+    def _draw(self, force: bool) -> None:
+        if not self.live:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_draw < _REDRAW_INTERVAL:
+            return
+        self._last_draw = now
+        if self._drawn:
+            self.stream.write(f"\x1b[{self._drawn}F")
+        for platform, log in self._logs.items():
+            self.stream.write("\x1b[2K" + self._status(platform, log) + "\n")
+        self._drawn = len(self._logs)
+        self.stream.flush()
@@ -6,13 +6,67 @@ Single responsibility: execute N Gradle commands; supports cancellation via Pope
 
 import subprocess
 import threading
+import time
 from collections.abc import Callable
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from typing import NamedTuple
+
+from src.admission import AdmissionController
+from src.duration_history import DurationHistory, longest_first, predicted_makespan
+from src.log_capture import LogCapture
+from src.slots import SlotPool
 
 # Default cap on concurrent Gradle processes to avoid overloading the machine.
 # Gradle is resource-heavy; 3 is a reasonable balance for typical dev machines.
 DEFAULT_MAX_CONCURRENCY = 3
+# Bytes read from a captured process pipe per call.
+PIPE_READ_BYTES = 64 * 1024
+# Passed to Gradle when its output is captured: no progress bar or ANSI redraws.
+CAPTURE_GRADLE_ARGS = ["--console=plain"]
+
+
+class RunResult(NamedTuple):
+    """Outcome of one work item. terminated: stopped by fail-fast, not by its own failure."""
+
+    platform: str
+    exit_code: int
+    duration: float
+    log_path: Path | None
+    terminated: bool = False
+
+
+def result_summary(results: list[RunResult]) -> dict:
+    """
+    JSON-ready summary: every run, and the failures (non-zero exit, not terminated by
+    fail-fast), each in platform order.
+    """
+    records = [
+        {
+            "platform": r.platform,
+            "exit_code": r.exit_code,
+            "duration_seconds": round(r.duration, 1),
+            "log_path": str(r.log_path) if r.log_path is not None else None,
+            "terminated": r.terminated,
+        }
+        for r in sorted(results, key=lambda r: r.platform)
+    ]
+    return {
+        "results": records,
+        "failures": [r for r in records if r["exit_code"] != 0 and not r["terminated"]],
+    }
+
+
+def format_failure_summary(results: list[RunResult]) -> str:
+    """Human-readable table of failed runs; empty string when nothing failed."""
+    failures = result_summary(results)["failures"]
+    if not failures:
+        return ""
+    lines = [f"{len(failures)} of {len(results)} platform run(s) failed:"]
+    for f in failures:
+        log = f"  log: {f['log_path']}" if f["log_path"] else ""
+        lines.append(f"  {f['platform']}: exit {f['exit_code']} after {f['duration_seconds']:.0f}s{log}")
+    return "\n".join(lines)
 
 
 def run_single_gradle(
@@ -20,6 +74,8 @@ def run_single_gradle(
     cwd: Path,
     *,
     register_process: Callable[[subprocess.Popen], None] | None = None,
+    extra_args: list[str] | None = None,
+    output: Callable[[bytes], None] | None = None,
 ) -> tuple[bool, int]:
     """
     Run a single Gradle command in a subprocess. Returns (success, exit_code).
@@ -27,12 +83,22 @@ def run_single_gradle(
     Uses Popen so the caller can terminate the process (e.g. on fail-fast).
     If register_process is provided, it is called with the Popen instance as soon
     as the process is started, so the coordinator can call terminate() on it.
+    extra_args go before the tasks (e.g. --project-cache-dir for an isolated slot).
+    If output is provided, stdout and stderr are piped (merged) and every chunk read
+    is passed to it, on this thread, until the process closes its end of the pipe.
     """
-    cmd = ["./gradlew", "--daemon"] + tasks
-    proc = subprocess.Popen(cmd, cwd=cwd)
+    cmd = ["./gradlew", "--daemon"] + (extra_args or []) + tasks
+    if output is None:
+        proc = subprocess.Popen(cmd, cwd=cwd)
+    else:
+        proc = subprocess.Popen(cmd, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
     if register_process is not None:
         register_process(proc)
     try:
+        if output is not None:
+            with proc.stdout:
+                while chunk := proc.stdout.read1(PIPE_READ_BYTES):
+                    output(chunk)
         proc.wait()
         code = proc.returncode if proc.returncode is not None else -1
         return (code == 0, code)
@@ -41,11 +107,41 @@ def run_single_gradle(
         raise
 
 
+def order_work_items(
+    work_items: list[tuple[str, list[str]]],
+    history: DurationHistory | None,
+    max_concurrency: int,
+    dry_run: bool,
+) -> list[tuple[str, list[str]]]:
+    """
+    Return work items in start order: longest expected first when history is set,
+    else unchanged. With dry_run, print each would-run line and the predicted makespan.
+    Shared by the thread and asyncio runners.
+    """
+    estimates: dict[str, float] = {}
+    if history is not None:
+        estimates = {name: history.estimate(name, tasks) for name, tasks in work_items}
+        work_items = longest_first(work_items, lambda name, _tasks: estimates[name])
+    if dry_run:
+        for name, tasks in work_items:
+            print(f"[dry-run] would run {name}: ./gradlew --daemon {' '.join(tasks)}")
+        if history is not None and work_items:
+            makespan = predicted_makespan([estimates[name] for name, _ in work_items], max_concurrency)
+            print(f"[dry-run] predicted makespan: {makespan:.0f}s with max concurrency {max_concurrency}")
+    return work_items
+
+
 def run_parallel_gradle(
     work_items: list[tuple[str, list[str]]],
     cwd: Path,
     max_concurrency: int,
     dry_run: bool = False,
+    admission: AdmissionController | None = None,
+    history: DurationHistory | None = None,
+    slots: SlotPool | None = None,
+    logs: LogCapture | None = None,
+    keep_going: bool = False,
+    results: list[RunResult] | None = None,
 ) -> tuple[int, str | None]:
     """
     Run one Gradle command per work item in parallel, with bounded concurrency.
@@ -54,13 +150,25 @@ def run_parallel_gradle(
     At most max_concurrency Gradle processes run at once. On first non-zero exit,
     other in-flight processes are terminated (fail-fast); exit code is non-zero.
     dry_run: print what would be run per platform and return (0, None).
+    admission: if set, each process also waits until the controller admits it (free
+    memory / load average); max_concurrency stays the hard cap on worker threads.
+    history: if set, items start longest expected first (LPT) and each run that
+    finishes on its own is recorded; dry_run also prints the predicted makespan.
+    slots: if set (an entered SlotPool with at least max_concurrency slots), each run
+    uses a free slot's directory and Gradle arguments instead of sharing cwd's state.
+    logs: if set, each process's output is piped into it instead of the terminal
+    (bounded tail in memory, full compressed log on disk, live status per platform);
+    call logs.print_failures() afterwards to show the tails of failed platforms.
+    keep_going: do not terminate or skip anything on failure; every item runs to
+    completion and the exit code is still that of the first failure.
+    results: if set, a RunResult is appended for every item that ran (see
+    result_summary / format_failure_summary).
     Returns (exit_code, first_failing_platform). exit_code is 0 only if all succeeded.
 
     Not safe to call from multiple threads concurrently (use one runner at a time).
     """
+    work_items = order_work_items(work_items, history, max_concurrency, dry_run)
     if dry_run:
-        for name, tasks in work_items:
-            print(f"[dry-run] would run {name}: ./gradlew --daemon {' '.join(tasks)}")
         return (0, None)
 
     lock = threading.Lock()
@@ -73,19 +181,56 @@ def run_parallel_gradle(
         nonlocal failed, first_failing_platform, first_failure_code
         platform, tasks = item
         with lock:
-            if failed:
+            if failed and not keep_going:
+                return
+        ticket = None
+        if admission is not None:
+            ticket = admission.acquire(platform, should_abort=lambda: failed and not keep_going)
+            if ticket is None:
                 return
         def register(p: subprocess.Popen) -> None:
             with lock:
                 active_processes.append((platform, p))
-        success, code = run_single_gradle(tasks, cwd, register_process=register)
-        with lock:
-            if not success and not failed:
-                failed = True
-                first_failing_platform = platform
-                first_failure_code = code
-                for _, p in active_processes:
-                    p.terminate()
+        slot = slots.acquire() if slots is not None else None
+        try:
+            run_cwd, options = cwd, {}
+            if slot is not None:
+                run_cwd, options["extra_args"] = slot.cwd, list(slot.gradle_args)
+            if logs is not None:
+                options["extra_args"] = options.get("extra_args", []) + CAPTURE_GRADLE_ARGS
+                options["output"] = lambda chunk: logs.feed(platform, chunk)
+                logs.start(platform)
+            started = time.monotonic()
+            try:
+                success, code = run_single_gradle(tasks, run_cwd, register_process=register, **options)
+            except Exception:
+                if logs is not None:
+                    logs.finish(platform, -1)
+                raise
+            elapsed = time.monotonic() - started
+            with lock:
+                terminated = failed and not keep_going
+                if not success and not failed:
+                    failed = True
+                    first_failing_platform = platform
+                    first_failure_code = code
+                    if not keep_going:
+                        for _, p in active_processes:
+                            p.terminate()
+                if results is not None:
+                    log_path = logs.log_path(platform) if logs is not None else None
+                    results.append(RunResult(platform, code, elapsed, log_path, terminated))
+            if logs is not None:
+                logs.finish(platform, code, cancelled=terminated)
+            # A run terminated by fail-fast has a meaningless duration; don't record it.
+            if history is not None and not terminated:
+                history.record(platform, tasks, elapsed, code)
+        finally:
+            if slot is not None:
+                slots.release(slot)
+            # Released after recording a failure so waiting items see it and do not start.
+            if admission is not None:
+                admission.release(ticket)
 
     with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
         futures = [executor.submit(run_one, item) for item in work_items]
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Glob matching for project.yml ci.path_rules, ci.skip_paths and ci.watch_paths.
+Single responsibility: compile those globs in precedence order and classify a path by
+the first one that matches. Standard library only and no imports from src, so the
+ci-status action loads this file on its own (see path_rules for the planner's view).
+
+Precedence, first match wins:
+  1. ci.path_rules, in the order written (skip: true rules skip)
+  2. ci.skip_paths   -> skip
+  3. ci.watch_paths  -> build
+  4. anything else   -> unwatched, or build when there are no watch_paths
+"""
+
+import re
+from collections.abc import Iterable
+
+SKIP = "skip"
+BUILD = "build"
+RULE = "rule"
+UNWATCHED = "unwatched"
+
+
+def glob_to_regex(pattern: str) -> str:
+    """
+    Regex for a GitHub Actions style path glob, matched against the whole repo-relative
+    path: '*' and '?' stay within one directory, '**' crosses directories and '**/'
+    also matches no directory at all ('**/*.md' matches README.md).
+    """
+    out = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return "".join(out)
+
+
+class PathMatcher:
+    """
+    The globs of path rules, skip_paths and watch_paths as one anchored alternation, so
+    a single match decides a path. rules: (globs, skip, payload) per ci.path_rules entry
+    in the order written; payload is handed back for paths the rule matches.
+    watch_paths None means every path not ruled or skipped is a build path.
+    """
+
+    def __init__(
+        self,
+        rules: Iterable[tuple[Iterable[str], bool, object]] = (),
+        skip_paths: Iterable[str] = (),
+        watch_paths: Iterable[str] | None = None,
+    ) -> None:
+        self.watch_all = watch_paths is None
+        entries = [(g, (SKIP if skip else RULE, payload)) for globs, skip, payload in rules for g in globs]
+        entries += [(g, (SKIP, None)) for g in skip_paths]
+        entries += [(g, (BUILD, None)) for g in watch_paths or ()]
+        self._matches = {f"g{index}": match for index, (_glob, match) in enumerate(entries)}
+        alternatives = [f"(?P<g{index}>{glob_to_regex(glob)})" for index, (glob, _match) in enumerate(entries)]
+        self._regex = re.compile("|".join(alternatives), re.DOTALL) if alternatives else None
+
+    @classmethod
+    def from_config(cls, config: dict | None) -> "PathMatcher":
+        """Matcher for a parsed project.yml without validating ci.path_rules (payload: the raw entry)."""
+        ci = (config or {}).get("ci") or {}
+        rules = []
+        for entry in ci.get("path_rules") or []:
+            if isinstance(entry, dict):
+                paths = entry.get("paths")
+                globs = [paths] if isinstance(paths, str) else [str(p) for p in paths or []]
+                rules.append((globs, bool(entry.get("skip", False)), entry))
+        watch = ci.get("watch_paths")
+        return cls(rules, ci.get("skip_paths") or [], list(watch) if watch else None)
+
+    def classify(self, path: str) -> tuple[str, object | None]:
+        """(kind, payload) of the first glob (in precedence order) that matches path."""
+        match = self._regex.fullmatch(path) if self._regex is not None else None
+        if match is not None:
+            return self._matches[match.lastgroup]
+        return (BUILD if self.watch_all else UNWATCHED, None)
+
+    def needs_build(self, paths: Iterable[str]) -> bool:
+        """True if any path is a build path or matches a rule that is not skip: true."""
+        return any(self.classify(p)[0] in (BUILD, RULE) for p in paths)
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Path rules from project.yml: ci.path_rules, ci.skip_paths and ci.watch_paths.
+Single responsibility: validate the configured rules and decide, per changed path,
+whether it matters to the build (glob matching: path_globs); no git and no Gradle.
+
+Precedence, first match wins:
+  1. ci.path_rules, in the order written: platforms for every library, Gradle tasks,
+     or skip: true
+  2. ci.skip_paths   -> skip (no build or test effect)
+  3. ci.watch_paths  -> build (classified by platform_core as before)
+  4. anything else   -> unwatched (no build or test effect)
+
+Without project.yml (or without PyYAML to read it) every path is a build path.
+"""
+
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import NamedTuple
+
+try:
+    import yaml
+except ImportError:  # optional: without it the built-in classification applies to every path
+    yaml = None
+
+from src.path_globs import BUILD, RULE, PathMatcher
+from src.platform_core import KNOWN_PLATFORMS_LOWER, normalize_platforms
+
+CONFIG_FILE = "project.yml"
+
+
+class PathRule(NamedTuple):
+    """One ci.path_rules entry. name labels the work item of its tasks."""
+
+    name: str
+    paths: tuple[str, ...]
+    platforms: frozenset[str] = frozenset()
+    tasks: tuple[str, ...] = ()
+    skip: bool = False
+
+
+class PathMatch(NamedTuple):
+    """How a path was classified; rule is set for RULE (and for a rule with skip: true)."""
+
+    kind: str
+    rule: PathRule | None = None
+
+
+class RuleEffects:
+    """What matched ci.path_rules add to a plan: platforms for every library and task work items."""
+
+    def __init__(self) -> None:
+        self.platforms: set[str] = set()
+        self.tasks: dict[str, list[str]] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self.platforms or self.tasks)
+
+    def add(self, rule: PathRule) -> None:
+        self.platforms |= rule.platforms
+        if rule.tasks:
+            tasks = self.tasks.setdefault(rule.name, [])
+            tasks.extend(t for t in rule.tasks if t not in tasks)
+
+    def work_items(self) -> list[tuple[str, list[str]]]:
+        return sorted(self.tasks.items())
+
+
+class PathRules:
+    """
+    Compiled ci.path_rules / skip_paths / watch_paths (matching: path_globs.PathMatcher).
+    watch_paths None means every path not ruled or skipped is a build path.
+    """
+
+    def __init__(
+        self,
+        rules: Iterable[PathRule] = (),
+        skip_paths: Iterable[str] = (),
+        watch_paths: Iterable[str] | None = None,
+    ) -> None:
+        self.rules = list(rules)
+        self._matcher = PathMatcher(((r.paths, r.skip, r) for r in self.rules), skip_paths, watch_paths)
+        self.watch_all = self._matcher.watch_all
+
+    @classmethod
+    def from_config(cls, config: dict | None) -> "PathRules":
+        """Rules from a parsed project.yml. Raises ValueError for a malformed ci.path_rules entry."""
+        ci = (config or {}).get("ci") or {}
+        rules = [_parse_rule(entry, index) for index, entry in enumerate(ci.get("path_rules") or [])]
+        watch = ci.get("watch_paths")
+        return cls(rules, ci.get("skip_paths") or [], list(watch) if watch else None)
+
+    def classify(self, path: str) -> PathMatch:
+        """The PathMatch of the first glob (in precedence order) that matches path."""
+        return PathMatch(*self._matcher.classify(path))
+
+    def needs_build(self, paths: Iterable[str]) -> bool:
+        """True if any path is a build path or matches a rule with platforms or tasks."""
+        return self._matcher.needs_build(paths)
+
+    def build_paths(self, paths: Iterable[str], effects: RuleEffects) -> Iterator[str]:
+        """Yield the build paths; add matched rules to effects and drop everything else. Lazy."""
+        for path in paths:
+            match = self.classify(path)
+            if match.kind == BUILD:
+                yield path
+            elif match.kind == RULE:
+                effects.add(match.rule)
+
+
+def _parse_rule(entry, index: int) -> PathRule:
+    where = f"{CONFIG_FILE}: ci.path_rules[{index}]"
+    if not isinstance(entry, dict):
+        raise ValueError(f"{where}: expected a mapping with 'paths'")
+    paths = entry.get("paths")
+    paths = [paths] if isinstance(paths, str) else list(paths or [])
+    if not paths:
+        raise ValueError(f"{where}: 'paths' must list at least one glob")
+    platforms_lower = {str(p).lower() for p in entry.get("platforms") or []}
+    unknown = platforms_lower - KNOWN_PLATFORMS_LOWER
+    if unknown:
+        raise ValueError(f"{where}: unknown platform(s): {', '.join(sorted(unknown))}")
+    tasks = tuple(str(t) for t in entry.get("tasks") or [])
+    skip = bool(entry.get("skip", False))
+    if not (platforms_lower or tasks or skip):
+        raise ValueError(f"{where}: needs 'platforms', 'tasks' or 'skip: true'")
+    return PathRule(
+        name=str(entry.get("name") or f"rule-{index + 1}"),
+        paths=tuple(str(p) for p in paths),
+        platforms=frozenset(normalize_platforms(platforms_lower)),
+        tasks=tasks,
+        skip=skip,
+    )
+
+
+def load_path_rules(repo_root: Path) -> tuple[PathRules, list[str]]:
+    """
+    PathRules from repo_root/project.yml and notes on why none apply (file missing,
+    PyYAML not installed, unreadable YAML). Raises ValueError for malformed rules.
+    """
+    config_file = repo_root / CONFIG_FILE
+    if not config_file.is_file():
+        return (PathRules(), [])
+    if yaml is None:
+        return (PathRules(), [f"PyYAML is not installed; {CONFIG_FILE} path rules are not applied"])
+    try:
+        config = yaml.safe_load(config_file.read_text(encoding="utf-8"))
+    except (OSError, yaml.YAMLError) as e:
+        return (PathRules(), [f"{CONFIG_FILE} unreadable ({e}); path rules are not applied"])
+    return (PathRules.from_config(config if isinstance(config, dict) else {}), [])
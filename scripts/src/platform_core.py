@@ -5,8 +5,11 @@ Single responsibility: map paths to platforms and platforms to task lists. No gi
 """
 
 import re
+from collections.abc import Iterable, Iterator, Mapping
 from pathlib import Path
 
+from src.file_change import DELETED, RENAMED, FileChange
+
 
 def get_library_project_paths(repo_root: Path) -> list[str]:
     """
@@ -23,6 +26,18 @@ def get_library_project_paths(repo_root: Path) -> list[str]:
     return sorted(result)
 
 
+LIBRARY_PATH_PATTERN = re.compile(r"^libraries/([^/]+)/")
+
+
+def library_for_path(path: str) -> str | None:
+    """
+    Return the Gradle project path of the library containing path
+    (e.g. "libraries/core/src/..." -> ":libraries:core"), or None if outside libraries/.
+    """
+    match = LIBRARY_PATH_PATTERN.match(path)
+    return f":libraries:{match.group(1)}" if match else None
+
+
 def scope_tasks_to_libraries(
     tasks: list[str], library_projects: list[str]
 ) -> list[str]:
@@ -162,6 +177,86 @@ KNOWN_PLATFORMS = frozenset(TEST_TASKS_BY_PLATFORM.keys())
 KNOWN_PLATFORMS_LOWER = frozenset(p.lower() for p in KNOWN_PLATFORMS)
 _PLATFORM_LOWER_TO_CANONICAL = {p.lower(): p for p in KNOWN_PLATFORMS}
 
+# Shared (intermediate) source sets: every platform whose targets compile them. When
+# a library's declared targets are known, one declared platform of these, the
+# cheapest, stands for all of them; SRC_SET_PATTERNS applies otherwise.
+_NATIVE_PLATFORMS = frozenset(
+    {"androidNative", "ios", "macos", "tvos", "watchos", "linuxX64", "linuxArm64", "mingwX64"}
+)
+SHARED_SOURCE_SETS = {
+    "common": KNOWN_PLATFORMS,
+    "native": _NATIVE_PLATFORMS,
+    "apple": frozenset({"ios", "macos", "tvos", "watchos"}),
+    "linux": frozenset({"linuxX64", "linuxArm64"}),
+    "androidNative": frozenset({"androidNative"}),
+    "web": frozenset({"js", "wasmJs"}),
+}
+_SHARED_PLATFORMS_BY_SOURCE_SET = {
+    f"{name}{suffix}": plats for name, plats in SHARED_SOURCE_SETS.items() for suffix in ("Main", "Test")
+}
+
+
+# Convention-plugin sources whose effect is narrower than the whole build, checked
+# before FULL_BUILD_PATTERNS: (pattern, platforms affected in every library, checks
+# to run on every library). Any other build-logic/ path still triggers a full build.
+_CONVENTION_CONFIG = r"^build-logic/convention/src/main/kotlin/config/"
+BUILD_LOGIC_RULES = [
+    (re.compile(_CONVENTION_CONFIG + r"AndroidLibraryConfig\.kt$"), frozenset({"android"}), frozenset()),
+    (re.compile(_CONVENTION_CONFIG + r"KotlinMultiplatformConfig\.kt$"), KNOWN_PLATFORMS, frozenset()),
+    (re.compile(_CONVENTION_CONFIG + r"DocumentationConfig\.kt$"), frozenset(), frozenset({"dokka"})),
+    (re.compile(_CONVENTION_CONFIG + r"CodeQualityConfig\.kt$"), frozenset(), frozenset({"detekt"})),
+    (re.compile(r"^config/detekt/"), frozenset(), frozenset({"detekt"})),
+]
+_BUILD_LOGIC_RULE_PREFIXES = ("build-logic/", "config/")
+
+# Per-library Gradle tasks of the checks BUILD_LOGIC_RULES can select.
+CHECK_TASKS = {
+    "detekt": ["detekt"],
+    "dokka": ["dokkaGeneratePublicationHtml"],
+}
+
+
+def build_logic_rule(path: str) -> tuple[frozenset[str], frozenset[str]] | None:
+    """(platforms, checks) of the BUILD_LOGIC_RULES entry matching path, or None if none does."""
+    if path.startswith(_BUILD_LOGIC_RULE_PREFIXES):
+        for pattern, platforms, checks in BUILD_LOGIC_RULES:
+            if pattern.match(path):
+                return (platforms, checks)
+    return None
+
+
+def cheapest_platform(platforms: Iterable[str], costs: Mapping[str, float]) -> str:
+    """
+    The platform with the lowest cost (ties by name; platforms without a cost last).
+    costs: seconds per platform, e.g. duration_history.DEFAULT_SECONDS_BY_PLATFORM.
+    platforms must not be empty.
+    """
+    return min(platforms, key=lambda p: (costs.get(p, float("inf")), p))
+
+
+def representative_platform(declared: frozenset[str] | None, costs: Mapping[str, float]) -> str:
+    """Platform that validates a library as a whole: its cheapest declared one, else jvm."""
+    return cheapest_platform(declared, costs) if declared else "jvm"
+
+
+def restrict_to_declared(
+    platforms: set[str],
+    declared: frozenset[str] | None,
+    representative_costs: Mapping[str, float] | None = None,
+) -> set[str]:
+    """
+    platforms limited to the declared ones (unchanged when declared is None). With
+    representative_costs, a non-empty set that no declared platform is in becomes the
+    library's representative_platform instead of nothing (a dependent recompiles
+    against a changed library even when they share no target).
+    """
+    if declared is None:
+        return set(platforms)
+    kept = platforms & declared
+    if not kept and platforms and representative_costs is not None:
+        return {representative_platform(declared, representative_costs)}
+    return kept
+
 
 def normalize_platforms(platforms_lower: set[str]) -> set[str]:
     """Return canonical platform names for the given lowercase platform names."""
@@ -174,23 +269,83 @@ def is_test_path(path: str) -> bool:
     return bool(TEST_SOURCE_SET_PATTERN.search(path_with_slash))
 
 
-def platforms_for_path(path: str) -> set[str] | None:
+# Compiled classifier tables, derived from the pattern lists above so those stay the
+# single source of truth. One anchored alternation replaces the FULL_BUILD_PATTERNS
+# loop (unanchored patterns get a greedy ".*" prefix so suffix checks backtrack from
+# the end instead of scanning every offset), and one scan for "/src/<sourceSet>/"
+# segments plus a dict lookup replaces the SRC_SET_PATTERNS loop. The segment regex
+# leaves the trailing slash unconsumed so "/src/a/src/b/" yields both segments,
+# exactly like searching each pattern independently.
+_FULL_BUILD_RE = re.compile(
+    "|".join(
+        f"(?:{p.pattern})" if p.pattern.startswith("^") else f"(?:.*(?:{p.pattern}))"
+        for p in FULL_BUILD_PATTERNS
+    ),
+    re.DOTALL,
+)
+# Zero-width, so overlapping segments ("/src/src/jvmMain/") are all found.
+_SRC_SET_SEGMENT_RE = re.compile(r"(?=/src/([^/]+)/)")
+_PLATFORMS_BY_SOURCE_SET: dict[str, frozenset[str]] = {}
+for _pattern, _plats in SRC_SET_PATTERNS:
+    _name = _pattern.pattern.removeprefix("/src/").removesuffix("/")
+    _PLATFORMS_BY_SOURCE_SET[_name] = _PLATFORMS_BY_SOURCE_SET.get(_name, frozenset()) | frozenset(_plats)
+del _pattern, _plats, _name
+
+
+def platforms_for_source_set(source_set: str) -> frozenset[str] | None:
+    """Platforms SRC_SET_PATTERNS maps a source set name to (e.g. "jsMain"), or None if unknown."""
+    return _PLATFORMS_BY_SOURCE_SET.get(source_set)
+
+
+def shared_source_set_platforms(source_set: str) -> frozenset[str] | None:
+    """Every platform a shared source set (SHARED_SOURCE_SETS, e.g. "linuxMain") compiles for, or None."""
+    return _SHARED_PLATFORMS_BY_SOURCE_SET.get(source_set)
+
+
+def platforms_for_path(
+    path: str, declared: frozenset[str] | None = None, costs: Mapping[str, float] | None = None
+) -> set[str] | None:
     """
     Return the set of platforms affected by this path, or None if path
-    triggers a full build.
+    triggers a full build. A build-logic file with a BUILD_LOGIC_RULES entry
+    affects that entry's platforms (possibly none) instead.
+
+    declared: the platforms of the library path belongs to. When given, source sets
+    only count for declared platforms and a shared source set (SHARED_SOURCE_SETS)
+    counts for its cheapest declared platform (by costs, required with declared) only.
     """
+    rule = build_logic_rule(path)
+    if rule is not None:
+        return set(rule[0])
+    if _FULL_BUILD_RE.match(path):
+        return None
     path_with_slash = f"/{path}" if not path.startswith("/") else path
-    for pattern in FULL_BUILD_PATTERNS:
-        if pattern.search(path):
-            return None
+    if "/src/" not in path_with_slash:
+        return set()
     platforms = set()
-    for pattern, plats in SRC_SET_PATTERNS:
-        if pattern.search(path_with_slash):
+    for source_set in _SRC_SET_SEGMENT_RE.findall(path_with_slash):
+        plats = _PLATFORMS_BY_SOURCE_SET.get(source_set)
+        if plats and declared is not None:
+            shared = _SHARED_PLATFORMS_BY_SOURCE_SET.get(source_set)
+            plats = (shared or plats) & declared
+            if shared and plats:
+                plats = {cheapest_platform(plats, costs)}
+        if plats:
             platforms |= plats
-    return platforms if platforms else set()
+    return platforms
 
 
-def platforms_for_changed_files(paths: list[str]) -> tuple[set[str], set[str]] | None:
+def classify_paths(paths: Iterable[str]) -> Iterator[tuple[str, set[str] | None, bool]]:
+    """
+    Batch classifier: yield (path, platforms, is_test) for each path.
+    platforms is None when the path triggers a full build (see platforms_for_path).
+    Consumes paths lazily, so generators over huge diffs stay flat in memory.
+    """
+    for path in paths:
+        yield (path, platforms_for_path(path), is_test_path(path))
+
+
+def platforms_for_changed_files(paths: Iterable[str]) -> tuple[set[str], set[str]] | None:
     """
     Return (main_platforms, test_platforms) for paths, or None if full build.
     main_platforms: platforms with changes under main source sets.
@@ -198,19 +353,91 @@ def platforms_for_changed_files(paths: list[str]) -> tuple[set[str], set[str]] |
     """
     main_platforms = set()
     test_platforms = set()
-    for path in paths:
-        plats = platforms_for_path(path)
+    for _path, plats, is_test in classify_paths(paths):
         if plats is None:
             return None
         if not plats:
             continue
-        if is_test_path(path):
+        if is_test:
             test_platforms |= plats
         else:
             main_platforms |= plats
     return (main_platforms, test_platforms)
 
 
+def planning_paths(changes: Iterable[FileChange]) -> Iterator[str]:
+    """
+    Paths from change records that can affect what to build or test. A deleted test
+    file leaves nothing to compile or run, so it is dropped; a rename counts as its new
+    path plus its old path unless that was a test file. Lazy, so a streamed diff stays
+    streamed.
+    """
+    for change in changes:
+        if change.kind == DELETED:
+            if not is_test_path(change.path):
+                yield change.path
+        elif change.kind == RENAMED:
+            yield change.path
+            if change.old_path is not None and not is_test_path(change.old_path):
+                yield change.old_path
+        else:
+            yield change.path
+
+
+def platforms_by_library(
+    paths: Iterable[str],
+    libraries: list[str] | None = None,
+    checks: set[str] | None = None,
+    declared: dict[str, frozenset[str] | None] | None = None,
+    costs: Mapping[str, float] | None = None,
+) -> dict[str, tuple[set[str], set[str]] | None] | None:
+    """
+    Return {library_project_path: (main_platforms, test_platforms)} for paths,
+    or None if a path outside libraries/ triggers a full build.
+
+    A full-build path inside a library (its own build.gradle.kts or gradle.properties)
+    maps only that library to None. Libraries touched without platform impact
+    (e.g. a README) map to two empty sets. Paths outside libraries/ that do not
+    trigger a full build are ignored, except build-logic files with a
+    BUILD_LOGIC_RULES entry: their platforms count as main changes of every library
+    in libraries (when given) and their checks are added to checks (when given).
+    declared ({library: declared platforms}) narrows each library's source-set
+    platforms as in platforms_for_path (with costs); rule platforms are left to the caller.
+    """
+    impact: dict[str, tuple[set[str], set[str]] | None] = {}
+    for path in paths:
+        library = library_for_path(path)
+        lib_declared = declared.get(library) if declared and library is not None else None
+        plats, is_test = platforms_for_path(path, lib_declared, costs), is_test_path(path)
+        if library is None:
+            if plats is None:
+                return None
+            rule = build_logic_rule(path)
+            if rule is not None:
+                rule_platforms, rule_checks = rule
+                if checks is not None:
+                    checks |= rule_checks
+                if rule_platforms:
+                    for lib in libraries or ():
+                        entry = impact.setdefault(lib, (set(), set()))
+                        if entry is not None:
+                            entry[0].update(rule_platforms)
+            continue
+        if plats is None:
+            impact[library] = None
+            continue
+        if library not in impact:
+            impact[library] = (set(), set())
+        entry = impact[library]
+        if entry is None:
+            continue
+        if is_test:
+            entry[1].update(plats)
+        else:
+            entry[0].update(plats)
+    return impact
+
+
 def _tasks_for_platforms(
     platforms: set[str] | None, task_map: dict[str, list[str]]
 ) -> list[str]:
@@ -252,3 +479,36 @@ def gradle_test_tasks_by_platform(
 def gradle_compile_tasks(platforms: set[str] | None) -> list[str]:
     """Return Gradle task names to compile main for the given platforms."""
     return _tasks_for_platforms(platforms, COMPILE_TASKS_BY_PLATFORM)
+
+
+def gradle_test_tasks_by_library(
+    platforms_by_lib: dict[str, set[str]],
+) -> list[tuple[str, list[str]]]:
+    """
+    Return one (platform_name, scoped_task_list) per platform for test runs, where
+    each task is prefixed with only the libraries affected on that platform.
+    E.g. {":libraries:a": {"jvm"}, ":libraries:b": {"jvm", "ios"}} ->
+    [("ios", [":libraries:b:compileKotlinIosSimulatorArm64"]),
+     ("jvm", [":libraries:a:jvmTest", ":libraries:b:jvmTest"])].
+    Unknown platforms are dropped; returns [] when nothing is affected.
+    """
+    result = []
+    all_platforms = set().union(*platforms_by_lib.values()) if platforms_by_lib else set()
+    for p in sorted(all_platforms):
+        if p not in TEST_TASKS_BY_PLATFORM:
+            continue
+        libs = sorted(lib for lib, plats in platforms_by_lib.items() if p in plats)
+        result.append((p, scope_tasks_to_libraries(TEST_TASKS_BY_PLATFORM[p], libs)))
+    return result
+
+
+def gradle_compile_tasks_by_library(platforms_by_lib: dict[str, set[str]]) -> list[str]:
+    """
+    Return compile tasks scoped to each library for only its affected platforms.
+    E.g. {":libraries:a": {"jvm"}} -> [":libraries:a:compileKotlinJvm"].
+    """
+    tasks = []
+    for lib in sorted(platforms_by_lib):
+        for p in sorted(platforms_by_lib[lib]):
+            tasks.extend(f"{lib}:{t}" for t in COMPILE_TASKS_BY_PLATFORM.get(p, []))
+    return tasks
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache of passing Gradle runs, to skip already-verified work.
+Single responsibility: key a work item by the git tree hashes of the source sets it
+depends on plus the build-config hash, and remember which keys passed (LRU-bounded).
+"""
+
+import hashlib
+import time
+from pathlib import Path
+
+from src.git_cli import git_output
+from src.library_graph import build_dependency_graph
+from src.platform_core import KNOWN_PLATFORMS, platforms_for_source_set, shared_source_set_platforms
+from src.script_cache import cache_dir, evict_lru, read_json, touch, write_json
+from src.task_cache import build_config_hash
+
+RESULT_CACHE_DIR = "results"
+# Each entry is one tiny JSON file; enough for many branches x platforms.
+DEFAULT_MAX_ENTRIES = 512
+
+
+def source_set_relevant(source_set: str, platform: str) -> bool:
+    """
+    True unless source_set is known to belong only to other platforms
+    (e.g. jsMain is irrelevant to jvm; commonMain and unknown source sets are relevant).
+    A shared source set (platform_core.SHARED_SOURCE_SETS) is relevant to every platform
+    it compiles for, not just the one SRC_SET_PATTERNS validates it on.
+    Every source set is relevant to a check work item (e.g. detekt), which is not a platform.
+    """
+    if platform not in KNOWN_PLATFORMS:
+        return True
+    platforms = shared_source_set_platforms(source_set) or platforms_for_source_set(source_set)
+    return platforms is None or platform in platforms
+
+
+def _library_dir(library_project: str) -> str:
+    """":libraries:core" -> "libraries/core"."""
+    return library_project.lstrip(":").replace(":", "/")
+
+
+def _dependency_closure(graph: dict[str, set[str]], libraries: set[str]) -> set[str]:
+    result = set(libraries)
+    stack = list(libraries)
+    while stack:
+        for dep in graph.get(stack.pop(), ()):
+            if dep not in result:
+                result.add(dep)
+                stack.append(dep)
+    return result
+
+
+class ResultCache:
+    """
+    Remembers work items (platform, task paths) that passed. An item's key covers the
+    committed tree of every relevant source set of its libraries and their transitive
+    library dependencies, plus build_config_hash. Libraries with uncommitted changes
+    under src/ make an item uncacheable (key None), since Gradle saw the working tree.
+    Storage errors are ignored: the cache only ever skips work, never fails a build.
+    """
+
+    def __init__(self, repo_root: Path, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self.repo_root = repo_root
+        self.max_entries = max_entries
+        self.directory = cache_dir(repo_root) / RESULT_CACHE_DIR
+        self._config_hash: str | None = None
+        self._graph: dict[str, set[str]] | None = None
+        self._trees: dict[str, dict[str, str] | None] = {}
+
+    def _load_trees(self, libraries: set[str]) -> None:
+        """Fill self._trees[lib] with {source set: tree hash} at HEAD, or None if dirty/unknown."""
+        missing = sorted(lib for lib in libraries if lib not in self._trees)
+        if not missing:
+            return
+        src_dirs = [f"{_library_dir(lib)}/src" for lib in missing]
+        listing = git_output(self.repo_root, "ls-tree", "HEAD", "--", *(d + "/" for d in src_dirs))
+        status = git_output(self.repo_root, "status", "--porcelain", "--untracked-files=all", "--", *src_dirs)
+        for lib in missing:
+            self._trees[lib] = None if listing is None or status is None else {}
+        if listing is None or status is None:
+            return
+        for line in listing.splitlines():
+            meta, _, path = line.partition("\t")
+            parts = meta.split()
+            if len(parts) != 3 or parts[1] != "tree":
+                continue
+            library_dir, _, source_set = path.rpartition("/src/")
+            self._trees[":" + library_dir.replace("/", ":")][source_set] = parts[2]
+        for line in status.splitlines():
+            path = line[3:].split(" -> ")[-1].strip('"')
+            for lib in missing:
+                if path.startswith(_library_dir(lib) + "/src/"):
+                    self._trees[lib] = None
+
+    def key(self, platform: str, tasks: list[str]) -> str | None:
+        """Cache key for a work item, or None when it cannot be cached."""
+        libraries = {t.rsplit(":", 1)[0] for t in tasks if t.startswith(":libraries:")}
+        if not libraries:
+            return None
+        if self._graph is None:
+            self._graph = build_dependency_graph(self.repo_root)
+            self._config_hash = build_config_hash(self.repo_root)
+        closure = _dependency_closure(self._graph, libraries)
+        self._load_trees(closure)
+        digest = hashlib.sha256(f"{self._config_hash}\0{platform}\0".encode())
+        digest.update("\0".join(sorted(set(tasks))).encode())
+        for lib in sorted(closure):
+            trees = self._trees.get(lib)
+            if trees is None:
+                return None
+            digest.update(f"\1{lib}".encode())
+            for source_set, tree in sorted(trees.items()):
+                if source_set_relevant(source_set, platform):
+                    digest.update(f"\0{source_set}={tree}".encode())
+        return digest.hexdigest()
+
+    def passed(self, key: str | None) -> bool:
+        """True if key is a recorded pass (and mark it recently used)."""
+        if key is None:
+            return False
+        entry = self.directory / f"{key}.json"
+        if read_json(entry) is None:
+            return False
+        touch(entry)
+        return True
+
+    def record_pass(self, key: str | None, platform: str, tasks: list[str]) -> None:
+        """Remember that the work item with key passed; evict least recently used entries."""
+        if key is None:
+            return
+        write_json(self.directory / f"{key}.json", {"platform": platform, "tasks": tasks, "passed_at": time.time()})
+        evict_lru(self.directory, self.max_entries)
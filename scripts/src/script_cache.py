@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Local on-disk cache helpers shared by the platform scripts.
+Single responsibility: cache location, content hashing, atomic JSON read/write and
+least-recently-used eviction of a directory of JSON entries.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from collections.abc import Iterable
+from pathlib import Path
+
+# Under .gradle/ so the cache lives with Gradle's own local state and is ignored with it.
+CACHE_DIR_NAME = Path(".gradle") / "kmp-scripts"
+
+
+def cache_dir(repo_root: Path) -> Path:
+    """Return the scripts cache directory for repo_root (not created)."""
+    return repo_root / CACHE_DIR_NAME
+
+
+def hash_files(repo_root: Path, files: Iterable[Path]) -> str:
+    """
+    Return a sha256 over the repo-relative path and content of each existing file.
+    Order-independent; missing files contribute nothing.
+    """
+    digest = hashlib.sha256()
+    for path in sorted({Path(f) for f in files}):
+        if not path.is_file():
+            continue
+        rel = path.relative_to(repo_root).as_posix() if path.is_absolute() else path.as_posix()
+        digest.update(rel.encode())
+        digest.update(b"\0")
+        digest.update(hashlib.sha256(path.read_bytes()).digest())
+    return digest.hexdigest()
+
+
+def read_json(path: Path) -> dict | None:
+    """Return the JSON object stored at path, or None if missing or unreadable."""
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def write_json(path: Path, data: dict) -> None:
+    """Write data to path atomically (temp file + rename). Errors are ignored: cache is best-effort."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, sort_keys=True)
+        os.replace(tmp, path)
+    except OSError:
+        Path(tmp).unlink(missing_ok=True)
+
+
+def touch(path: Path) -> None:
+    """Mark a cache entry as recently used (its mtime is the LRU clock). Errors are ignored."""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def evict_lru(directory: Path, max_entries: int) -> None:
+    """Delete the least recently used *.json entries of directory beyond max_entries."""
+    try:
+        entries = sorted(directory.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+    except OSError:
+        return
+    for stale in entries[max_entries:]:
+        stale.unlink(missing_ok=True)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Deterministic, cost-balanced split of a test plan across CI nodes.
+Single responsibility: partition (library, platform, task) work units into n shards
+so that every node, given the same plan and costs, computes the same disjoint slice.
+"""
+
+import heapq
+from collections.abc import Callable
+
+from src.duration_history import DEFAULT_SECONDS, DEFAULT_SECONDS_BY_PLATFORM
+
+
+def parse_shard(spec: str) -> tuple[int, int]:
+    """
+    Parse "i/n" (1-based shard index i of n shards) into (i, n).
+    Raises ValueError for anything else, including i outside 1..n.
+    """
+    index_text, sep, count_text = spec.partition("/")
+    if not sep:
+        raise ValueError(f"shard must look like i/n (e.g. 1/4), got {spec!r}")
+    try:
+        index, count = int(index_text), int(count_text)
+    except ValueError:
+        raise ValueError(f"shard must look like i/n (e.g. 1/4), got {spec!r}") from None
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"shard index must be between 1 and {max(count, 1)}, got {spec!r}")
+    return (index, count)
+
+
+def static_cost(platform: str, _task: str) -> float:
+    """Cost of a unit from the built-in per-platform estimates; identical on every node."""
+    return DEFAULT_SECONDS_BY_PLATFORM.get(platform, DEFAULT_SECONDS)
+
+
+def work_units(work_items: list[tuple[str, list[str]]]) -> list[tuple[str, str]]:
+    """Flatten work items into (platform, full task path) units, without duplicates."""
+    return sorted({(platform, task) for platform, tasks in work_items for task in tasks})
+
+
+def assign_shards(
+    work_items: list[tuple[str, list[str]]],
+    count: int,
+    cost: Callable[[str, str], float],
+) -> list[list[tuple[str, str]]]:
+    """
+    Split the units of work_items into count shards, greedily placing the costliest
+    unit on the least loaded shard (LPT). Ties break on unit name and shard index,
+    so the result depends only on the set of units and their costs, not on input order.
+    """
+    units = sorted(work_units(work_items), key=lambda unit: (-cost(*unit), unit))
+    shards: list[list[tuple[str, str]]] = [[] for _ in range(count)]
+    loads = [(0.0, i) for i in range(count)]
+    for unit in units:
+        load, i = heapq.heappop(loads)
+        shards[i].append(unit)
+        heapq.heappush(loads, (load + cost(*unit), i))
+    return shards
+
+
+def shard_work(
+    work_items: list[tuple[str, list[str]]],
+    index: int,
+    count: int,
+    cost: Callable[[str, str], float],
+) -> list[tuple[str, list[str]]]:
+    """
+    Return the work items of shard index (1-based) of count, regrouped by platform
+    in the original platform order; platforms with no units on this shard are dropped.
+    """
+    mine = set(assign_shards(work_items, count, cost)[index - 1])
+    result = []
+    for platform, tasks in work_items:
+        kept = [t for t in tasks if (platform, t) in mine]
+        if kept:
+            result.append((platform, kept))
+    return result
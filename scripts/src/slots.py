@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Isolated execution slots for concurrent Gradle invocations on one checkout.
+Single responsibility: give each concurrent slot its own Gradle state so parallel
+runs do not contend for the same .gradle/ and build/ locks, and clean up after.
+
+Modes:
+  none      - every slot shares the checkout (previous behavior).
+  cache     - own --project-cache-dir per slot.
+  build-dir - cache, plus own build directory per slot (build/kmp-slot-N, via init script).
+  worktree  - cache, plus own detached `git worktree` of HEAD per slot (committed state only).
+"""
+
+import queue
+import shutil
+from pathlib import Path
+
+from src.git_cli import run_git
+from src.script_cache import cache_dir
+
+ISOLATION_MODES = ("none", "cache", "build-dir", "worktree")
+SLOTS_DIR = "slots"
+BUILD_DIR_INIT_SCRIPT = Path(__file__).resolve().parent / "gradle" / "isolated-build-dir.init.gradle"
+
+
+class Slot:
+    """One execution slot: the directory to run ./gradlew in and extra Gradle arguments."""
+
+    def __init__(self, index: int, cwd: Path, gradle_args: list[str]) -> None:
+        self.index = index
+        self.cwd = cwd
+        self.gradle_args = gradle_args
+
+
+class SlotPool:
+    """
+    Fixed pool of slots; acquire() hands out a free slot, release() returns it.
+    Use as a context manager: worktrees are created on enter and removed on exit.
+    Per-slot project cache dirs are kept under .gradle/kmp-scripts/slots for reuse.
+    """
+
+    def __init__(self, repo_root: Path, size: int, mode: str) -> None:
+        if mode not in ISOLATION_MODES:
+            raise ValueError(f"Unknown isolation mode: {mode}. Valid: {', '.join(ISOLATION_MODES)}")
+        self.repo_root = repo_root
+        self.size = max(1, size)
+        self.mode = mode
+        self._free: queue.Queue[Slot] = queue.Queue()
+        self._worktrees: list[Path] = []
+
+    def __enter__(self) -> "SlotPool":
+        base = cache_dir(self.repo_root) / SLOTS_DIR
+        try:
+            for index in range(self.size):
+                self._free.put(self._create_slot(base, index))
+        except Exception:
+            self._remove_worktrees()
+            raise
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._remove_worktrees()
+
+    def _create_slot(self, base: Path, index: int) -> Slot:
+        if self.mode == "none":
+            return Slot(index, self.repo_root, [])
+        slot_dir = base / f"slot-{index}"
+        args = ["--project-cache-dir", str(slot_dir / "project-cache")]
+        cwd = self.repo_root
+        if self.mode == "build-dir":
+            args += ["--init-script", str(BUILD_DIR_INIT_SCRIPT), f"-Dkmp.slot.buildDir=kmp-slot-{index}"]
+        elif self.mode == "worktree":
+            cwd = slot_dir / "worktree"
+            self._add_worktree(cwd)
+        return Slot(index, cwd, args)
+
+    def _add_worktree(self, path: Path) -> None:
+        if path.exists():
+            run_git(self.repo_root, "worktree", "remove", "--force", str(path))
+            shutil.rmtree(path, ignore_errors=True)
+        run_git(self.repo_root, "worktree", "prune")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        result = run_git(self.repo_root, "worktree", "add", "--detach", str(path), "HEAD")
+        if result is None or result.returncode != 0:
+            detail = "git cannot be run" if result is None else (result.stderr or "").strip()[:500]
+            raise RuntimeError(f"git worktree add failed: {detail}")
+        self._worktrees.append(path)
+
+    def _remove_worktrees(self) -> None:
+        for path in self._worktrees:
+            run_git(self.repo_root, "worktree", "remove", "--force", str(path))
+            shutil.rmtree(path, ignore_errors=True)
+        if self._worktrees:
+            run_git(self.repo_root, "worktree", "prune")
+        self._worktrees = []
+
+    def acquire(self) -> Slot:
+        """Return a free slot, blocking until one is released."""
+        return self._free.get()
+
+    def release(self, slot: Slot) -> None:
+        """Return a slot to the pool."""
+        self._free.put(slot)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Persistent cache for Gradle task queries (resolve_library_tasks).
+Single responsibility: key query results by a hash of the build configuration and
+store them under .gradle/ with size-bounded LRU eviction.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+
+from src.gradle_runner import resolve_library_tasks
+from src.script_cache import cache_dir, evict_lru, hash_files, read_json, touch, write_json
+
+TASK_CACHE_DIR = "task-cache"
+# Each entry is one small JSON file; keep enough for a few branches' build configs.
+DEFAULT_MAX_ENTRIES = 32
+
+_BUILD_FILE_NAMES = frozenset({"settings.gradle.kts", "build.gradle.kts", "gradle.properties"})
+# Never contain build configuration; pruning them keeps the walk cheap on large repos.
+_PRUNED_DIRS = frozenset({".git", ".gradle", "build", "node_modules", "src", "kotlin-js-store"})
+
+
+def build_config_files(repo_root: Path) -> list[Path]:
+    """
+    Return the files that define the build configuration: settings.gradle.kts, every
+    build.gradle.kts and gradle.properties, gradle/libs.versions.toml and all of build-logic/.
+    """
+    files = []
+    build_logic = repo_root / "build-logic"
+    for dirpath, dirnames, filenames in os.walk(repo_root):
+        current = Path(dirpath)
+        if current == build_logic:
+            dirnames[:] = []
+            continue
+        dirnames[:] = [d for d in dirnames if d not in _PRUNED_DIRS]
+        files.extend(current / name for name in filenames if name in _BUILD_FILE_NAMES)
+    for dirpath, dirnames, filenames in os.walk(build_logic):
+        dirnames[:] = [d for d in dirnames if d not in (".gradle", "build")]
+        files.extend(Path(dirpath) / name for name in filenames)
+    files.append(repo_root / "gradle" / "libs.versions.toml")
+    return files
+
+
+def build_config_hash(repo_root: Path) -> str:
+    """Return a hash that changes whenever any build configuration file changes."""
+    return hash_files(repo_root, build_config_files(repo_root))
+
+
+def _entry_key(config_hash: str, library_projects: list[str], task_names: list[str]) -> str:
+    digest = hashlib.sha256(config_hash.encode())
+    digest.update("\0".join(sorted(set(library_projects))).encode())
+    digest.update(b"\1")
+    digest.update("\0".join(sorted(set(task_names))).encode())
+    return digest.hexdigest()
+
+
+def resolve_library_tasks_cached(
+    cwd: Path,
+    library_projects: list[str],
+    task_names: list[str],
+    *,
+    refresh: bool = False,
+    max_entries: int = DEFAULT_MAX_ENTRIES,
+) -> list[str]:
+    """
+    Same contract as gradle_runner.resolve_library_tasks, but reuse a previous result
+    when the build configuration is unchanged. refresh=True ignores any cached entry.
+    """
+    if not task_names or not library_projects:
+        return []
+    directory = cache_dir(cwd) / TASK_CACHE_DIR
+    entry = directory / f"{_entry_key(build_config_hash(cwd), library_projects, task_names)}.json"
+    if not refresh:
+        cached = read_json(entry)
+        if cached is not None and isinstance(cached.get("tasks"), list):
+            touch(entry)
+            return list(cached["tasks"])
+    tasks = resolve_library_tasks(cwd, library_projects, task_names)
+    write_json(entry, {"tasks": tasks})
+    evict_lru(directory, max_entries)
+    return tasks
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Static task inventory: which library tasks exist, derived from each library's
+kmp.targets (gradle.properties) and the target declarations in its build.gradle.kts.
+Single responsibility: decide task existence (and the platforms a library declares)
+without configuring Gradle; fall back to the Gradle task query only for libraries it
+cannot decide.
+"""
+
+import re
+from pathlib import Path
+
+from src.task_cache import resolve_library_tasks_cached
+
+# kmp.targets value -> Kotlin targets created by KotlinMultiplatformConfig.configure.
+TARGETS_BY_KMP_TARGET = {
+    "android": {"android"},
+    "jvm": {"jvm"},
+    "ios": {"iosArm64", "iosSimulatorArm64"},
+    "linux": {"linuxX64"},
+}
+
+# Kotlin target preset calls a build script may add on top of kmp.targets.
+_TARGET_PRESETS = (
+    "jvm", "js", "wasmJs", "wasmWasi",
+    "iosArm64", "iosX64", "iosSimulatorArm64",
+    "macosArm64", "macosX64",
+    "tvosArm64", "tvosX64", "tvosSimulatorArm64",
+    "watchosArm32", "watchosArm64", "watchosDeviceArm64", "watchosX64", "watchosSimulatorArm64",
+    "linuxX64", "linuxArm64", "mingwX64",
+    "androidNativeArm32", "androidNativeArm64", "androidNativeX86", "androidNativeX64",
+)
+_TARGET_PRESET_RE = re.compile(r"\b(" + "|".join(_TARGET_PRESETS) + r")\s*[({]")
+_ANDROID_TARGET_RE = re.compile(r"\b(?:androidTarget|androidLibrary)\s*[({]")
+# Constructs that create targets we cannot see statically (shortcuts, presets, loops).
+_UNDECIDABLE_RE = re.compile(r"\b(?:targetFromPreset|fromPreset|presets|ios|tvos|watchos|targets\.add)\s*[({.]")
+_CONVENTION_PLUGIN_RE = re.compile(r'\bid\(\s*"convention\.library"\s*\)')
+_BLOCK_COMMENT_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
+_LINE_COMMENT_RE = re.compile(r"(?<![:\"])//.*$", re.MULTILINE)
+
+# Kotlin target name prefix -> planner platform key (see platform_core.KNOWN_PLATFORMS).
+_PLATFORM_BY_TARGET_PREFIX = (
+    ("androidNative", "androidNative"),
+    ("android", "android"),
+    ("ios", "ios"),
+    ("macos", "macos"),
+    ("tvos", "tvos"),
+    ("watchos", "watchos"),
+)
+
+# Task name -> Kotlin target it needs, for tasks not named compileKotlin<Target>.
+# Android task names depend on the Android plugin the convention plugin applies
+# (com.android.kotlin.multiplatform.library), so they are left to the Gradle query.
+_TARGET_BY_TASK = {
+    "jvmTest": "jvm",
+}
+_COMPILE_KOTLIN_PREFIX = "compileKotlin"
+
+
+def read_gradle_property(properties_file: Path, key: str) -> str | None:
+    """Return the value of key in a .properties file, or None if absent/unreadable."""
+    try:
+        lines = properties_file.read_text(errors="replace").splitlines()
+    except OSError:
+        return None
+    for line in lines:
+        stripped = line.strip()
+        if not stripped or stripped[0] in "#!":
+            continue
+        match = re.match(r"([^=:\s]+)\s*[=:]\s*(.*)$", stripped)
+        if match and match.group(1) == key:
+            return match.group(2).strip()
+    return None
+
+
+def declared_targets(library_dir: Path) -> set[str] | None:
+    """
+    Return the Kotlin target names a library creates, or None if undecidable
+    (no convention plugin, missing/invalid kmp.targets, or dynamic target creation).
+    Mirrors KotlinMultiplatformConfig.parseTargets / configure.
+    """
+    build_file = library_dir / "build.gradle.kts"
+    try:
+        script = build_file.read_text(errors="replace")
+    except OSError:
+        return None
+    code = _LINE_COMMENT_RE.sub("", _BLOCK_COMMENT_RE.sub("", script))
+    if not _CONVENTION_PLUGIN_RE.search(code) or _UNDECIDABLE_RE.search(code):
+        return None
+    raw = read_gradle_property(library_dir / "gradle.properties", "kmp.targets")
+    if raw is None:
+        return None
+    kmp_targets = {t.strip() for t in raw.split(",") if t.strip()}
+    if not kmp_targets or kmp_targets - TARGETS_BY_KMP_TARGET.keys():
+        return None
+    targets = set().union(*(TARGETS_BY_KMP_TARGET[t] for t in kmp_targets))
+    targets |= {m.group(1) for m in _TARGET_PRESET_RE.finditer(code)}
+    if _ANDROID_TARGET_RE.search(code):
+        targets.add("android")
+    return targets
+
+
+def platform_for_target(target: str) -> str:
+    """Planner platform key of a Kotlin target ("iosSimulatorArm64" -> "ios"; "js" -> "js")."""
+    for prefix, platform in _PLATFORM_BY_TARGET_PREFIX:
+        if target.startswith(prefix):
+            return platform
+    return target
+
+
+def declared_platforms(library_dir: Path) -> frozenset[str] | None:
+    """Platform keys of declared_targets(library_dir), or None if undecidable."""
+    targets = declared_targets(library_dir)
+    if targets is None:
+        return None
+    return frozenset(platform_for_target(t) for t in targets)
+
+
+def declared_platforms_by_library(repo_root: Path, library_projects: list[str]) -> dict[str, frozenset[str] | None]:
+    """declared_platforms for every library project (":libraries:<name>")."""
+    return {
+        project: declared_platforms(repo_root / project.lstrip(":").replace(":", "/"))
+        for project in library_projects
+    }
+
+
+def target_for_task(task_name: str) -> str | None:
+    """Return the Kotlin target a known task belongs to, or None if unknown."""
+    if task_name in _TARGET_BY_TASK:
+        return _TARGET_BY_TASK[task_name]
+    if task_name.startswith(_COMPILE_KOTLIN_PREFIX) and len(task_name) > len(_COMPILE_KOTLIN_PREFIX):
+        target = task_name[len(_COMPILE_KOTLIN_PREFIX):]
+        return target[0].lower() + target[1:]
+    return None
+
+
+def static_library_tasks(
+    repo_root: Path, library_projects: list[str], task_names: list[str]
+) -> tuple[list[str], list[str]]:
+    """
+    Return (tasks, undecided_projects): full task paths that exist for the libraries
+    that could be decided statically, and the library projects that could not.
+    """
+    targets_by_task = {name: target_for_task(name) for name in set(task_names)}
+    if any(target is None for target in targets_by_task.values()):
+        return ([], list(library_projects))
+    tasks = []
+    undecided = []
+    for project in library_projects:
+        targets = declared_targets(repo_root / project.lstrip(":").replace(":", "/"))
+        if targets is None:
+            undecided.append(project)
+            continue
+        tasks.extend(f"{project}:{name}" for name, target in targets_by_task.items() if target in targets)
+    return (sorted(tasks), undecided)
+
+
+def resolve_tasks(
+    cwd: Path, library_projects: list[str], task_names: list[str], *, refresh_cache: bool = False
+) -> list[str]:
+    """
+    Return full task paths that exist under library_projects with a name in task_names.
+    Decided statically where possible; only undecidable libraries go to the (cached)
+    Gradle query. refresh_cache=True bypasses the on-disk task cache.
+    """
+    if not task_names or not library_projects:
+        return []
+    tasks, undecided = static_library_tasks(cwd, library_projects, task_names)
+    if undecided:
+        tasks = tasks + resolve_library_tasks_cached(cwd, undecided, task_names, refresh=refresh_cache)
+    return sorted(set(tasks))
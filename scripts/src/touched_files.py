@@ -1,12 +1,25 @@
 #!/usr/bin/env python3
 """
 Discover touched file paths (git diff) and repository root.
-Touched = added, updated, or deleted between base_ref and HEAD.
+Touched = added, updated, deleted or renamed between base_ref and HEAD.
 Single responsibility: VCS/repo discovery for pre-push scripts.
 """
 
+import itertools
+import os
 import subprocess
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
+from typing import IO
+
+from src.file_change import ADDED, COPIED, DELETED, MODIFIED, RENAMED, FileChange
+
+# git --name-status letters; type changes (T) and unmerged entries (U) count as modified.
+_KIND_BY_STATUS = {"A": ADDED, "M": MODIFIED, "D": DELETED, "R": RENAMED, "C": COPIED, "T": MODIFIED, "U": MODIFIED}
+_READ_BYTES = 64 * 1024
+# --changes modes: commits since the base, the index, the worktree (unstaged + untracked), or all.
+CHANGE_MODES = ("committed", "staged", "worktree", "all")
 
 
 def get_repo_root() -> Path:
@@ -21,15 +34,142 @@ def get_repo_root() -> Path:
     return Path(result.stdout.strip())
 
 
-def get_touched_files(base_ref: str = "origin/main", repo_root: Path | None = None) -> list[str]:
-    """Return paths that differ between base_ref and HEAD (added, updated, or deleted)."""
+def _nul_fields(stream: IO[bytes]) -> Iterator[str]:
+    """Yield NUL-terminated fields from stream, read in fixed-size chunks."""
+    pending = b""
+    while chunk := stream.read(_READ_BYTES):
+        *fields, pending = (pending + chunk).split(b"\0")
+        for field in fields:
+            yield os.fsdecode(field)
+    if pending:
+        yield os.fsdecode(pending)
+
+
+@contextmanager
+def _git_fields(cwd: Path, *args: str) -> Iterator[Iterator[str]]:
+    """
+    Run `git <args>` and provide its NUL-terminated output fields as they are produced.
+    On exit the process is reaped (killed if the consumer stopped early); raises
+    RuntimeError if git failed after its output was read to the end.
+    """
+    proc = subprocess.Popen(["git", *args], cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        yield _nul_fields(proc.stdout)
+    finally:
+        if proc.poll() is None and proc.stdout.read(1):
+            proc.kill()  # consumer stopped early
+        proc.stdout.close()
+        stderr = proc.stderr.read().decode(errors="replace").strip()
+        proc.stderr.close()
+        proc.wait()
+    if proc.returncode != 0:
+        raise RuntimeError(f"git {args[0]} failed (exit {proc.returncode}): {stderr}")
+
+
+def iter_changes(base_ref: str = "origin/main", repo_root: Path | None = None) -> Iterator[FileChange]:
+    """
+    Stream the changes between base_ref and HEAD as FileChange records, parsed from
+    `git diff -z --name-status -M` as it is produced (memory stays flat on huge diffs;
+    any byte sequence is a valid path). Raises RuntimeError once the stream is exhausted
+    if git failed (e.g. unknown base_ref).
+    """
     cwd = repo_root if repo_root is not None else get_repo_root()
-    result = subprocess.run(
-        ["git", "diff", "--name-only", f"{base_ref}...HEAD"],
-        capture_output=True,
-        text=True,
-        cwd=cwd,
-    )
-    if result.returncode != 0:
+    with _git_fields(cwd, "diff", "-z", "--name-status", "-M", f"{base_ref}...HEAD") as fields:
+        for status in fields:
+            kind = _KIND_BY_STATUS.get(status[:1], MODIFIED)
+            path = next(fields, None)
+            if path is None:
+                break
+            if kind in (RENAMED, COPIED):
+                new_path = next(fields, None)
+                if new_path is None:
+                    break
+                yield FileChange(kind, new_path, path)
+            else:
+                yield FileChange(kind, path)
+
+
+def iter_status_changes(
+    repo_root: Path | None = None, *, staged: bool = True, unstaged: bool = True, untracked: bool = True
+) -> Iterator[FileChange]:
+    """
+    Stream uncommitted changes from `git status --porcelain=v2 -z`: staged (index vs
+    HEAD), unstaged (worktree vs index) and untracked files, as selected. A path that is
+    both staged and unstaged yields one record per side. Raises RuntimeError once the
+    stream is exhausted if git failed.
+    """
+    cwd = repo_root if repo_root is not None else get_repo_root()
+    untracked_flag = "--untracked-files=all" if untracked else "--untracked-files=no"
+    with _git_fields(cwd, "status", "--porcelain=v2", "-z", untracked_flag) as fields:
+        for entry in fields:
+            if entry.startswith("? "):
+                yield FileChange(ADDED, entry[2:])
+                continue
+            kind_char = entry[:1]
+            # "1 XY sub mH mI mW hH hI path", "2 ... Xscore path" + orig path, "u ... path"
+            parts = entry.split(" ", {"1": 8, "2": 9, "u": 10}.get(kind_char, 0))
+            if kind_char not in ("1", "2", "u") or len(parts) < 2:
+                continue
+            index_status, worktree_status = parts[1][0], parts[1][1]
+            path = parts[-1]
+            old_path = next(fields, None) if kind_char == "2" else None
+            if staged and index_status != ".":
+                kind = _KIND_BY_STATUS.get(index_status, MODIFIED)
+                yield FileChange(kind, path, old_path if kind in (RENAMED, COPIED) else None)
+            if unstaged and worktree_status != ".":
+                yield FileChange(_KIND_BY_STATUS.get(worktree_status, MODIFIED), path)
+
+
+def iter_mode_changes(mode: str, base_ref: str | None, repo_root: Path | None = None) -> Iterator[FileChange]:
+    """
+    Changes selected by a --changes mode (see CHANGE_MODES): committed (base_ref...HEAD),
+    staged, worktree (unstaged and untracked), or all of them. base_ref is only used by
+    committed and all.
+    """
+    if mode not in CHANGE_MODES:
+        raise ValueError(f"unknown changes mode {mode!r}")
+    if mode in ("committed", "all"):
+        yield from iter_changes(base_ref or "origin/main", repo_root)
+    if mode != "committed":
+        yield from iter_status_changes(
+            repo_root,
+            staged=mode in ("staged", "all"),
+            unstaged=mode in ("worktree", "all"),
+            untracked=mode in ("worktree", "all"),
+        )
+
+
+def changes_or_none(
+    base_ref: str | None = "origin/main", repo_root: Path | None = None, mode: str = "committed"
+) -> Iterator[FileChange] | None:
+    """
+    Return the change stream for mode (iter_mode_changes), or None if there are no
+    changes. For committed changes a git failure before the first record also gives
+    None (callers then fall back to a full build, like an empty get_touched_files);
+    the other modes raise RuntimeError instead, so a failed `git status` is not
+    mistaken for a clean tree. Only the first record is read eagerly.
+    """
+    changes = iter_mode_changes(mode, base_ref, repo_root)
+    try:
+        first = next(changes, None)
+    except (RuntimeError, OSError) as e:
+        if mode == "committed":
+            return None
+        raise RuntimeError(str(e)) from None
+    return None if first is None else itertools.chain([first], changes)
+
+
+def get_touched_files(base_ref: str = "origin/main", repo_root: Path | None = None) -> list[str]:
+    """
+    Return paths that differ between base_ref and HEAD (added, updated, or deleted;
+    both names of a rename). Returns [] if git fails.
+    """
+    paths = []
+    try:
+        for change in iter_changes(base_ref, repo_root):
+            if change.old_path is not None and change.kind == RENAMED:
+                paths.append(change.old_path)
+            paths.append(change.path)
+    except (RuntimeError, OSError):
         return []
-    return [p.strip() for p in result.stdout.strip().splitlines() if p.strip()]
+    return paths
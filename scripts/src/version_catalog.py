@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Impact of a Gradle version catalog (gradle/libs.versions.toml) change.
+Single responsibility: diff two revisions of the catalog, find the [versions],
+[libraries], [plugins] and [bundles] entries that changed, and the build files
+under libraries/ and build-logic/ (plus the root build scripts) that reference
+them, so a dependency bump plans like an edit to exactly those files. A [versions]
+entry no build file uses may be read outside Gradle (java-ci and python-ci by
+.github/actions/parse-versions), so changing one plans like any catalog edit.
+"""
+
+import os
+import re
+import tomllib
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from src.file_change import MODIFIED, FileChange
+from src.git_cli import git_output
+
+CATALOG_PATH = "gradle/libs.versions.toml"
+CATALOG_SECTIONS = ("versions", "libraries", "plugins", "bundles")
+# Root scripts that apply catalog plugins to the whole build.
+ROOT_BUILD_FILES = ("build.gradle.kts", "settings.gradle.kts")
+# Accessor prefix per section ("libs.plugins.detekt"); libraries have none.
+_ACCESSOR_PREFIX = {"versions": "versions.", "libraries": "", "plugins": "plugins.", "bundles": "bundles."}
+_SECTION_BY_FINDER = {"Version": "versions", "Library": "libraries", "Plugin": "plugins", "Bundle": "bundles"}
+_FINDER_RE = re.compile(r"\bfind(Version|Library|Plugin|Bundle)\(\s*\"([^\"]+)\"\s*\)")
+# Provider calls that may follow a complete accessor ("libs.versions.kotlin.get()").
+_ACCESSOR_CALLS = ("get", "asProvider", "orNull", "getOrNull")
+# A root "alias(libs.plugins.x) apply false" only pins the version for the projects
+# that apply x; those are found through their own reference (alias or plugin id).
+_APPLY_FALSE_RE = re.compile(r"^.*\bapply\s+false\b.*$", re.MULTILINE)
+_SCANNED_SUFFIXES = (".gradle.kts", ".kt")
+_PRUNED_DIRS = frozenset({".gradle", "build", "src"})
+
+
+def normalize_alias(alias: str) -> str:
+    """Gradle treats '-', '_' and '.' in aliases alike ("kotlinx-coroutines" == "kotlinx.coroutines")."""
+    return re.sub(r"[-_.]", ".", alias)
+
+
+def _version_ref(spec) -> str | None:
+    """version.ref of a [libraries] or [plugins] entry, or None."""
+    if isinstance(spec, dict) and isinstance(spec.get("version"), dict):
+        return spec["version"].get("ref")
+    return None
+
+
+def changed_entries(old: dict, new: dict) -> set[tuple[str, str]]:
+    """
+    (section, normalized alias) for every catalog entry that differs between old and
+    new: added, removed or edited entries, libraries and plugins whose version.ref
+    points at a changed version, and bundles that contain a changed library.
+    """
+    changed = set()
+    for section in CATALOG_SECTIONS:
+        before = {normalize_alias(a): v for a, v in old.get(section, {}).items()}
+        after = {normalize_alias(a): v for a, v in new.get(section, {}).items()}
+        changed |= {(section, alias) for alias in before.keys() | after.keys() if before.get(alias) != after.get(alias)}
+    versions = {alias for section, alias in changed if section == "versions"}
+    for section in ("libraries", "plugins"):
+        for alias, spec in new.get(section, {}).items():
+            ref = _version_ref(spec)
+            if ref is not None and normalize_alias(ref) in versions:
+                changed.add((section, normalize_alias(alias)))
+    libraries = {alias for section, alias in changed if section == "libraries"}
+    for alias, members in new.get("bundles", {}).items():
+        if any(normalize_alias(m) in libraries for m in members):
+            changed.add(("bundles", normalize_alias(alias)))
+    return changed
+
+
+def changed_plugin_ids(old: dict, new: dict, entries: set[tuple[str, str]]) -> set[str]:
+    """Plugin ids (e.g. "dev.detekt") of the changed [plugins] entries, from either revision."""
+    aliases = {alias for section, alias in entries if section == "plugins"}
+    ids = set()
+    for catalog in (old, new):
+        for alias, spec in catalog.get("plugins", {}).items():
+            if normalize_alias(alias) in aliases:
+                plugin_id = spec.get("id") if isinstance(spec, dict) else str(spec).split(":")[0]
+                if plugin_id:
+                    ids.add(plugin_id)
+    return ids
+
+
+def _accessor_re(entries: set[tuple[str, str]]) -> re.Pattern | None:
+    """
+    One regex for the type-safe accessors of entries ("libs.kotlinx.coroutines.core").
+    An accessor only counts when complete: "libs.kotlin" does not match
+    "libs.kotlin.gradle.plugin", but does match "libs.kotlin.get()".
+    """
+    if not entries:
+        return None
+    accessors = sorted(f"libs.{_ACCESSOR_PREFIX[s]}{alias}" for s, alias in entries)
+    calls = "|".join(_ACCESSOR_CALLS)
+    return re.compile(
+        r"(?<![\w.])(?:" + "|".join(re.escape(a) for a in accessors) + r")"
+        r"(?!\w)(?!\.(?!(?:" + calls + r")\b)[A-Za-z_])"
+    )
+
+
+def references(text: str, entries: set[tuple[str, str]], plugin_ids: set[str] = frozenset()) -> bool:
+    """
+    True if text uses any of entries, through an accessor or findLibrary("alias") and
+    the like, or names one of plugin_ids as a string literal (id("..."), apply("...")).
+    """
+    accessor_re = _accessor_re(entries)
+    if accessor_re is not None and accessor_re.search(text):
+        return True
+    if any(f'"{plugin_id}"' in text for plugin_id in plugin_ids):
+        return True
+    return any(
+        (_SECTION_BY_FINDER[kind], normalize_alias(alias)) in entries for kind, alias in _FINDER_RE.findall(text)
+    )
+
+
+def build_files(repo_root: Path) -> Iterator[str]:
+    """Repo-relative build scripts that may use the catalog: libraries/, build-logic/ and the root scripts."""
+    for name in ROOT_BUILD_FILES:
+        if (repo_root / name).is_file():
+            yield name
+    for top, pruned in (("libraries", _PRUNED_DIRS), ("build-logic", _PRUNED_DIRS - {"src"})):
+        for dirpath, dirnames, filenames in os.walk(repo_root / top):
+            dirnames[:] = sorted(d for d in dirnames if d not in pruned)
+            for name in sorted(filenames):
+                if name.endswith(_SCANNED_SUFFIXES):
+                    yield (Path(dirpath) / name).relative_to(repo_root).as_posix()
+
+
+def referencing_files(
+    repo_root: Path, entries: set[tuple[str, str]], plugin_ids: set[str] = frozenset()
+) -> list[str]:
+    """Build files (see build_files) that reference any of entries or plugin_ids."""
+    found = []
+    for path in build_files(repo_root):
+        try:
+            text = (repo_root / path).read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            continue
+        if path in ROOT_BUILD_FILES:
+            text = _APPLY_FALSE_RE.sub("", text)
+        if references(text, entries, plugin_ids):
+            found.append(path)
+    return found
+
+
+def read_catalog(repo_root: Path, revision: str | None) -> dict | None:
+    """
+    Parsed catalog at revision ("" for the index, None for the working tree), or None
+    when it is missing, git fails or it is not valid TOML.
+    """
+    try:
+        if revision is None:
+            text = (repo_root / CATALOG_PATH).read_text(encoding="utf-8")
+        else:
+            text = git_output(repo_root, "show", f"{revision}:{CATALOG_PATH}")
+            if text is None:
+                return None
+        return tomllib.loads(text)
+    except (OSError, tomllib.TOMLDecodeError):
+        return None
+
+
+def catalog_revisions(mode: str, base_ref: str | None, repo_root: Path) -> tuple[str | None, str | None]:
+    """
+    (old, new) catalog revisions for a --changes mode (see read_catalog): committed
+    diffs the merge base with HEAD, staged HEAD with the index, worktree the index
+    with the working tree and all the merge base with the working tree. If the merge
+    base cannot be found, base_ref itself is the old revision (and if git cannot read
+    that either, read_catalog gives None and the catalog edit plans as a full build).
+    """
+    if mode == "staged":
+        return ("HEAD", "")
+    if mode == "worktree":
+        return ("", None)
+    old = base_ref or "HEAD"
+    if base_ref is not None:
+        merge_base = (git_output(repo_root, "merge-base", base_ref, "HEAD") or "").strip()
+        if merge_base:
+            old = merge_base
+    return (old, "HEAD" if mode == "committed" else None)
+
+
+def unreferenced_versions(repo_root: Path, old: dict, new: dict, entries: set[tuple[str, str]]) -> list[str]:
+    """
+    Changed [versions] aliases that no [libraries] or [plugins] entry refers to (in
+    either revision) and no build file uses; their consumers are outside Gradle.
+    """
+    refs = {
+        normalize_alias(ref)
+        for catalog in (old, new)
+        for section in ("libraries", "plugins")
+        for spec in catalog.get(section, {}).values()
+        if (ref := _version_ref(spec)) is not None
+    }
+    candidates = sorted(alias for section, alias in entries if section == "versions" and alias not in refs)
+    return [alias for alias in candidates if not referencing_files(repo_root, {("versions", alias)})]
+
+
+def catalog_impact(
+    repo_root: Path, old_revision: str | None, new_revision: str | None
+) -> tuple[set, list[str], list[str]] | None:
+    """
+    (changed entries, files referencing them, unreferenced_versions) between two catalog
+    revisions, or None if either is unreadable.
+    """
+    old = read_catalog(repo_root, old_revision)
+    new = read_catalog(repo_root, new_revision)
+    if old is None or new is None:
+        return None
+    entries = changed_entries(old, new)
+    files = referencing_files(repo_root, entries, changed_plugin_ids(old, new, entries))
+    return (entries, files, unreferenced_versions(repo_root, old, new, entries))
+
+
+def expand_catalog_changes(
+    changes: Iterable[FileChange],
+    repo_root: Path,
+    mode: str = "committed",
+    base_ref: str | None = None,
+    notes: list[str] | None = None,
+) -> Iterator[FileChange]:
+    """
+    Pass changes through, replacing an edited catalog with edits to the build files that
+    reference its changed entries (none when nothing references them). An added, deleted
+    or renamed catalog, one that cannot be read at either revision, or a change to a
+    [versions] entry no build file uses (see unreferenced_versions) is passed through
+    unchanged (a full build). A line describing the expansion is appended to notes.
+    """
+    expanded = False
+    for change in changes:
+        if change.path != CATALOG_PATH or change.kind != MODIFIED:
+            yield change
+            continue
+        if expanded:
+            continue  # also listed by another change source (--changes all)
+        expanded = True
+        impact = catalog_impact(repo_root, *catalog_revisions(mode, base_ref, repo_root))
+        if impact is None:
+            yield change
+            continue
+        entries, files, unreferenced = impact
+        if unreferenced:
+            if notes is not None:
+                aliases = ", ".join(f"versions.{alias}" for alias in unreferenced)
+                notes.append(
+                    f"{CATALOG_PATH}: changed {aliases}, which no build file references "
+                    "(read outside Gradle, e.g. by CI workflows); treating it as a build configuration change"
+                )
+            yield change
+            continue
+        if notes is not None:
+            aliases = ", ".join(f"{section}.{alias}" for section, alias in sorted(entries)) or "none"
+            notes.append(
+                f"{CATALOG_PATH}: changed {aliases}; referenced by {', '.join(files) if files else 'no build file'}"
+            )
+        for path in files:
+            yield FileChange(MODIFIED, path)
@@ -3,129 +3,754 @@
 Run Gradle test tasks for platforms affected by changed files.
 
 When multiple platforms are affected, runs one Gradle invocation per platform
-in parallel (bounded by --max-concurrency). First failure terminates the rest
+in parallel (bounded by --max-concurrency, and with --scheduler=resources also by
+free memory and load average). Runs start longest expected first, using durations
+recorded in .gradle/kmp-scripts/history.sqlite. First failure terminates the rest
 (fail-fast) and the script exits with that failure.
+
+With --watch it keeps running: each burst of saved files under libraries/ is planned
+the same way and tested on the already-warm Gradle daemon, and a new burst cancels
+the run in progress.
+
+"plan" prints the same decision as a JSON document (work items with their tasks,
+required runner OS and estimated cost) for CI matrix generation; "execute" runs
+the work items of such a plan, optionally only those for one runner OS.
 """
 
 import argparse
+import asyncio
+import contextlib
+import json
+import os
 import sys
+import threading
+import time
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 
 # So "from src.xxx" works when run as python3 scripts/test_platforms.py from repo root.
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
-from src.touched_files import get_repo_root, get_touched_files
+from src.file_change import FileChange
+from src.touched_files import CHANGE_MODES, changes_or_none, get_repo_root
+from src.base_ref import describe_resolution, record_verified, resolve_base
 from src.platform_core import (
+    CHECK_TASKS,
     KNOWN_PLATFORMS,
     KNOWN_PLATFORMS_LOWER,
     get_library_project_paths,
-    gradle_test_tasks_by_platform,
+    gradle_test_tasks_by_library,
     normalize_platforms,
-    platforms_for_changed_files,
+    planning_paths,
+    platforms_by_library,
+    representative_platform,
+    restrict_to_declared,
     scope_tasks_to_libraries,
 )
-from src.gradle_runner import run_gradle, resolve_library_tasks
-from src.parallel_runner import run_parallel_gradle, DEFAULT_MAX_CONCURRENCY
+from src.gradle_runner import run_gradle
+from src.task_inventory import declared_platforms_by_library, resolve_tasks
+from src.version_catalog import expand_catalog_changes
+from src.path_rules import RuleEffects, load_path_rules
+from src.library_graph import build_dependency_graph, dependents_closure, propagate_to_dependents
+from src.parallel_runner import (
+    run_parallel_gradle,
+    DEFAULT_MAX_CONCURRENCY,
+    RunResult,
+    format_failure_summary,
+    result_summary,
+)
+from src.async_runner import run_parallel_gradle_async, run_single_gradle_async
+from src.log_capture import LogCapture
+from src.file_watcher import DEFAULT_DEBOUNCE_SECONDS, next_burst, open_watcher
+from src.duration_history import DEFAULT_SECONDS_BY_PLATFORM, DurationHistory
+from src.slots import ISOLATION_MODES, SlotPool
+from src.sharding import parse_shard, shard_work, static_cost, work_units
+from src.admission import AdmissionController, DEFAULT_MAX_LOAD_PER_CPU, DEFAULT_MIN_FREE_MEMORY_MB
+from src.result_cache import ResultCache
+from src.build_plan import PlanError, RUNNER_OSES, make_plan, plan_work_items, read_plan
+from src.host_capabilities import DeferredItem, annotate_plan, describe_deferred, detect_host, split_work
 
 
-def main() -> int:
-    parser = argparse.ArgumentParser(
-        description="Run tests for platforms affected by changed files"
+def add_plan_arguments(parser: argparse.ArgumentParser, suppress_defaults: bool = False) -> None:
+    """
+    Options that decide what to run. suppress_defaults: for the 'plan' subcommand's copy,
+    so options given before the subcommand are not overwritten by its defaults.
+    """
+    def default(value):
+        return argparse.SUPPRESS if suppress_defaults else value
+
+    parser.add_argument("--base", default=default("origin/main"), help="Base ref for touched files (added/updated/deleted)")
+    parser.add_argument(
+        "--changes",
+        choices=CHANGE_MODES,
+        default=default("committed"),
+        help="Which changes to plan for: committed (base...HEAD), staged (index), worktree (unstaged and untracked files), or all of them (default: committed)",
     )
-    parser.add_argument("--dry-run", action="store_true", help="Print tasks only, do not run")
-    parser.add_argument("--base", default="origin/main", help="Base ref for touched files (added/updated/deleted)")
     parser.add_argument(
-        "--max-concurrency",
-        type=int,
-        default=DEFAULT_MAX_CONCURRENCY,
-        help="Max parallel Gradle runs when testing multiple platforms; fail-fast on first failure (default: %(default)s)",
+        "--refresh-task-cache",
+        action="store_true",
+        default=default(False),
+        help="Ignore the cached Gradle task list (.gradle/kmp-scripts/task-cache) and query Gradle again",
     )
     parser.add_argument(
         "--platforms",
         type=str,
-        default=None,
+        default=default(None),
         metavar="PLATFORMS",
         help="Comma-separated platforms to test (e.g. jvm,android). If set, only these run; others (e.g. ios, wasmJs) are skipped. Omit to test all affected platforms.",
     )
-    args = parser.parse_args()
-
-    if args.platforms is not None:
-        allowed_lower = {p.strip().lower() for p in args.platforms.split(",") if p.strip()}
-        if not allowed_lower:
-            print("--platforms specified but no valid platforms provided.", file=sys.stderr)
-            return 1
-        unknown = allowed_lower - KNOWN_PLATFORMS_LOWER
-        if unknown:
-            print(
-                f"Unknown platform(s): {', '.join(sorted(unknown))}. "
-                f"Valid: {', '.join(sorted(KNOWN_PLATFORMS))}",
-                file=sys.stderr,
-            )
-            return 1
-        allowed = normalize_platforms(allowed_lower)
-
-    cwd = get_repo_root()
-    library_projects = get_library_project_paths(cwd)
 
-    paths = get_touched_files(args.base)
-    if not paths:
-        if args.platforms is not None:
-            work = gradle_test_tasks_by_platform(allowed)
-            if args.dry_run:
-                tasks = [t for _name, tlist in work for t in scope_tasks_to_libraries(tlist, library_projects)]
+
+def add_run_arguments(parser: argparse.ArgumentParser) -> None:
+    """Options that decide how to run it."""
+    parser.add_argument("--dry-run", action="store_true", help="Print tasks only, do not run")
+    parser.add_argument(
+        "--no-result-cache",
+        action="store_true",
+        help="Run every work item even if the same sources and build config already passed (.gradle/kmp-scripts/results)",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=None,
+        help=f"Max parallel Gradle runs when testing multiple platforms; fail-fast on first failure (default: {DEFAULT_MAX_CONCURRENCY}, or CPU count with --scheduler=resources)",
+    )
+    parser.add_argument(
+        "--scheduler",
+        choices=["fixed", "resources"],
+        default="fixed",
+        help="fixed: always run --max-concurrency processes; resources: start another only while free memory and load average allow (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--runner",
+        choices=["asyncio", "threads"],
+        default="asyncio",
+        help="asyncio: one process group per Gradle run, whole group killed on fail-fast; threads: one thread per run, terminate the wrapper only (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--isolation",
+        choices=ISOLATION_MODES,
+        default="none",
+        help="Per-slot Gradle state for parallel runs: cache (own --project-cache-dir), build-dir (also own build/ subdir), worktree (also own git worktree of HEAD) (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--min-free-memory-mb",
+        type=int,
+        default=DEFAULT_MIN_FREE_MEMORY_MB,
+        help="--scheduler=resources: MemAvailable that must remain after a new run's estimate (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--max-load-per-cpu",
+        type=float,
+        default=DEFAULT_MAX_LOAD_PER_CPU,
+        help="--scheduler=resources: do not start new runs while 1-min load average per CPU is at or above this (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--output",
+        choices=("capture", "inherit"),
+        default="capture",
+        help="Parallel runs: 'capture' shows one status line per platform, keeps full logs under build/kmp-scripts/logs/ and prints the tail of failing platforms; 'inherit' streams raw Gradle output (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--keep-going",
+        action="store_true",
+        help="Let every platform run finish instead of stopping at the first failure, then report all failures",
+    )
+    parser.add_argument(
+        "--summary-json",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        help="Write the per-platform results (exit code, duration, log path) and failures as JSON to PATH",
+    )
+    parser.add_argument(
+        "--shard",
+        type=shard_arg,
+        default=None,
+        metavar="I/N",
+        help="Run only shard I of N (1-based): the plan's (library, platform, task) units are split deterministically into N cost-balanced, disjoint slices",
+    )
+    parser.add_argument(
+        "--no-host-check",
+        action="store_true",
+        help="Run every work item even if this host cannot build it (Apple targets without macOS and Xcode); by default those are reported as deferred",
+    )
+    parser.add_argument(
+        "--fail-on-deferred",
+        action="store_true",
+        help="Exit non-zero when work this host cannot build was deferred, even if everything else passed",
+    )
+    parser.add_argument(
+        "--shard-costs",
+        choices=("static", "history"),
+        default="static",
+        help="Unit costs for --shard: built-in per-platform estimates, or the duration history (every node must then see the same history, e.g. restored from a shared cache) (default: %(default)s)",
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Run tests for platforms affected by changed files",
+        epilog="Without a subcommand: plan and execute in one go.",
+    )
+    add_plan_arguments(parser)
+    add_run_arguments(parser)
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running: watch libraries/ and, after each burst of saves, rerun only the affected library/platform tests (a new burst cancels the run in progress). Ctrl-C to stop",
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=DEFAULT_DEBOUNCE_SECONDS,
+        metavar="SECONDS",
+        help="--watch: quiet period that ends a burst of changes (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--poll",
+        action="store_true",
+        help="--watch: re-scan the tree on an interval instead of using inotify",
+    )
+    commands = parser.add_subparsers(dest="command", metavar="{plan,execute}")
+    plan_parser = commands.add_parser(
+        "plan", help="Print the JSON build plan (work items, tasks, runner OS, estimated cost) without running it"
+    )
+    add_plan_arguments(plan_parser, suppress_defaults=True)
+    plan_parser.add_argument(
+        "-o", "--plan-file", type=Path, default=None, metavar="PATH", help="Write the plan to PATH instead of stdout"
+    )
+    execute_parser = commands.add_parser("execute", help="Run the work items of a plan written by 'plan'")
+    execute_parser.add_argument("plan_file", metavar="PLAN", help="Plan file, or - for stdin")
+    execute_parser.add_argument(
+        "--runner-os",
+        choices=RUNNER_OSES,
+        default=None,
+        help="Only run work items that need this runner OS (e.g. one CI matrix job per OS)",
+    )
+    add_run_arguments(execute_parser)
+    return parser
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    try:
+        if args.command == "execute":
+            plan = read_plan(None if args.plan_file == "-" else Path(args.plan_file))
+            deferred: list[DeferredItem] = []
+            code = execute_work(plan_work_items(plan, args.runner_os), args, get_repo_root(), deferred)
+            return deferred_exit_code(code, deferred, args)
+        cwd = get_repo_root()
+        if args.command == "plan":
+            work, libraries, base = plan_work(args, cwd, resolve=True)
+            plan = make_plan(work, libraries, base, DurationHistory.for_repo(cwd).estimate)
+            annotate_plan(plan, detect_host())
+            text = json.dumps(plan, indent=2) + "\n"
+            if args.plan_file is None:
+                sys.stdout.write(text)
             else:
-                task_names = [t for _name, tlist in work for t in tlist]
-                tasks = resolve_library_tasks(cwd, library_projects, task_names)
-                if not tasks:
-                    print(f"No library tasks for platform(s): {', '.join(sorted(allowed))}", file=sys.stderr)
-                    return 0
-        else:
-            tasks = scope_tasks_to_libraries(["build"], library_projects)
-        return run_gradle(tasks, cwd=cwd, dry_run=args.dry_run)
-
-    result = platforms_for_changed_files(paths)
-    if result is None:
-        # Gradle config changed; validate with JVM build only (no native)
-        tasks = scope_tasks_to_libraries(["jvmTest"], library_projects)
-        return run_gradle(tasks, cwd=cwd, dry_run=args.dry_run)
-
-    main_platforms, test_platforms = result
-    platforms_to_test = main_platforms | test_platforms
-
-    if args.platforms is not None:
-        platforms_to_test = platforms_to_test & allowed
-        if not platforms_to_test:
-            platforms_to_test = allowed
-        if not platforms_to_test:
-            print("No platforms to run (--platforms did not match any).", file=sys.stderr)
-            return 1
-
-    if not platforms_to_test:
-        # Touched files don't affect any platform (e.g. scripts only); validate with JVM only
-        tasks = scope_tasks_to_libraries(["jvmTest"], library_projects)
-        return run_gradle(tasks, cwd=cwd, dry_run=args.dry_run)
-
-    work = gradle_test_tasks_by_platform(platforms_to_test)
-    if args.dry_run:
-        work = [(name, scope_tasks_to_libraries(tlist, library_projects)) for name, tlist in work]
+                args.plan_file.parent.mkdir(parents=True, exist_ok=True)
+                args.plan_file.write_text(text)
+            return 0
+        if args.watch:
+            return watch(args, cwd)
+        work, _libraries, _base = plan_work(args, cwd, resolve=not args.dry_run)
+        deferred = []
+        code = execute_work(work, args, cwd, deferred)
+        # Deferred work is still unverified: the next run has to diff from the same base.
+        if code == 0 and not deferred and not args.dry_run and args.shard is None and args.changes == "committed":
+            record_verified(cwd)
+        return deferred_exit_code(code, deferred, args)
+    except PlanError as e:
+        print(e, file=sys.stderr)
+        return 1
+
+
+def route_to_host(
+    work: list[tuple[str, list[str]]], args: argparse.Namespace, deferred: list[DeferredItem] | None = None
+) -> list[tuple[str, list[str]]]:
+    """
+    The part of work this host can run. The rest is deferred to a capable host (see
+    host_capabilities): reported with a warning and appended to deferred (when given).
+    --no-host-check keeps everything.
+    """
+    if args.no_host_check or not work:
+        return work
+    host = detect_host()
+    runnable, skipped = split_work(work, host)
+    if not skipped:
+        return runnable
+    for line in describe_deferred(skipped, host):
+        print(line, file=sys.stderr)
+    warning = (
+        f"{len(skipped)} work item(s) were NOT run on this host; run them on a capable host "
+        "(e.g. 'plan', then 'execute --runner-os macos') or pass --no-host-check"
+    )
+    if os.environ.get("GITHUB_ACTIONS") == "true":
+        print(f"::warning title=Deferred work::{warning}", file=sys.stderr)
+    print(f"warning: {warning}", file=sys.stderr)
+    if not runnable:
+        print("Nothing left to run on this host.", file=sys.stderr)
+    if deferred is not None:
+        deferred.extend(skipped)
+    return runnable
+
+
+def deferred_exit_code(code: int, deferred: list[DeferredItem], args: argparse.Namespace) -> int:
+    """code, or 1 when the run passed but left deferred work and --fail-on-deferred was given."""
+    if code == 0 and deferred and args.fail_on_deferred:
+        print("Failing: deferred work was not run (--fail-on-deferred).", file=sys.stderr)
+        return 1
+    return code
+
+
+def allowed_platforms(platforms: str | None) -> set[str] | None:
+    """Canonical platforms from --platforms, or None when it was not given. Raises PlanError."""
+    if platforms is None:
+        return None
+    allowed_lower = {p.strip().lower() for p in platforms.split(",") if p.strip()}
+    if not allowed_lower:
+        raise PlanError("--platforms specified but no valid platforms provided.")
+    unknown = allowed_lower - KNOWN_PLATFORMS_LOWER
+    if unknown:
+        raise PlanError(
+            f"Unknown platform(s): {', '.join(sorted(unknown))}. "
+            f"Valid: {', '.join(sorted(KNOWN_PLATFORMS))}"
+        )
+    return normalize_platforms(allowed_lower)
+
+
+def plan_work(
+    args: argparse.Namespace, cwd: Path, resolve: bool
+) -> tuple[list[tuple[str, list[str]]], list[str], str]:
+    """
+    Work items (platform, full task paths) for the touched files, the libraries they
+    cover, and a description of the base commit used. resolve: keep only tasks that
+    exist (task inventory; may run Gradle). Raises PlanError when nothing valid can be planned.
+    """
+    allowed = allowed_platforms(args.platforms)
+    library_projects = get_library_project_paths(cwd)
+
+    if args.changes in ("committed", "all"):
+        base, notes = resolve_base(args.base, cwd)
+        for line in describe_resolution(args.base, base, notes):
+            print(line, file=sys.stderr)
+        base_description = base.describe() if base is not None else "none (full build)"
+        base_sha = base.sha if base is not None else None
     else:
-        all_task_names = [t for _name, tlist in work for t in tlist]
-        resolved = resolve_library_tasks(cwd, library_projects, all_task_names) if all_task_names else []
-        work = [
-            (name, [t for t in resolved if t.split(":")[-1] in tlist])
-            for name, tlist in work
-        ]
-    work = [(name, tasks) for name, tasks in work if tasks]
+        base_description = f"none ({args.changes} changes only)"
+        base, base_sha = None, None
+    changes = None
+    if base_sha is not None or args.changes not in ("committed", "all"):
+        try:
+            changes = changes_or_none(base_sha, cwd, args.changes)
+        except RuntimeError as e:
+            raise PlanError(f"Cannot list {args.changes} changes: {e}") from None
+        if changes is None and (base_sha is None or base.at_head):
+            # A clean tree, or HEAD is the base: nothing changed, which is not a reason for a full build.
+            since = f" since {base.ref}" if base_sha is not None else ""
+            print(f"No {args.changes} changes{since}; nothing to test.", file=sys.stderr)
+            return ([], [], base_description)
+    if changes is None:
+        if allowed is None:
+            work = [("all", scope_tasks_to_libraries(["build"], library_projects))]
+            return (work, library_projects, base_description)
+        work = resolved_work({lib: set(allowed) for lib in library_projects}, args, cwd, resolve)
+        if not work:
+            print(f"No library tasks for platform(s): {', '.join(sorted(allowed))}", file=sys.stderr)
+        return (work, library_projects, base_description)
+
+    notes: list[str] = []
+    changes = expand_catalog_changes(changes, cwd, args.changes, base_sha, notes)
+    work, libraries = plan_changes(changes, args, cwd, resolve, allowed, library_projects, notes)
+    return (work, libraries, base_description)
+
+
+def plan_changes(
+    changes: Iterable[FileChange],
+    args: argparse.Namespace,
+    cwd: Path,
+    resolve: bool,
+    allowed: set[str] | None,
+    library_projects: list[str],
+    notes: list[str] | None = None,
+) -> tuple[list[tuple[str, list[str]]], list[str]]:
+    """
+    Work items and libraries for change records (see plan_work): the libraries and
+    platforms they touch, their dependents, filtered by allowed platforms. notes: lines
+    filled while changes are consumed (catalog expansion), printed before any outcome.
+    """
+    try:
+        rules, rule_notes = load_path_rules(cwd)
+    except ValueError as e:
+        raise PlanError(str(e)) from None
+    for line in rule_notes:
+        print(line, file=sys.stderr)
+    declared = declared_platforms_by_library(cwd, library_projects)
+    planned = 0
+    built = 0
+
+    def counted(paths: Iterator[str]) -> Iterator[str]:
+        nonlocal planned
+        for path in paths:
+            planned += 1
+            yield path
+
+    def watched(paths: Iterator[str]) -> Iterator[str]:
+        nonlocal built
+        for path in paths:
+            built += 1
+            yield path
+
+    checks: set[str] = set()
+    effects = RuleEffects()
+    try:
+        impact = platforms_by_library(
+            watched(rules.build_paths(counted(planning_paths(changes)), effects)),
+            libraries=library_projects,
+            checks=checks,
+            declared=declared,
+            costs=DEFAULT_SECONDS_BY_PLATFORM,
+        )
+    except RuntimeError as e:
+        raise PlanError(str(e)) from None
+    for line in notes or ():
+        print(line, file=sys.stderr)
+    if impact is None:
+        # Gradle config changed; validate with JVM build only (no native), or each
+        # library's cheapest declared target when it has no JVM target
+        return (representative_work(library_projects, declared), library_projects)
+    if not planned:
+        print("Only deleted test files or unreferenced catalog entries changed; nothing to build or test.", file=sys.stderr)
+        return ([], [])
+    if not built and not effects:
+        # Short-circuit before any Gradle run: docs, scripts and other paths that
+        # project.yml skips (ci.skip_paths) or does not watch (ci.watch_paths).
+        print("No changed path affects the build (project.yml ci.skip_paths / ci.watch_paths); "
+              "nothing to build or test.", file=sys.stderr)
+        return ([], [])
+    # Platforms from ci.path_rules apply to every library, like a convention-plugin change.
+    for lib in library_projects if effects.platforms else ():
+        plats = impact.setdefault(lib, (set(), set()))
+        if plats is not None:
+            plats[0].update(effects.platforms)
+
+    # Per library: platforms touched by main or test changes. A library whose own
+    # build script changed (None) is validated on its representative platform only.
+    # Main changes also reach every library that (transitively) depends on the
+    # changed one. Only declared targets run; a dependent sharing no target with
+    # the change runs its representative platform.
+    impact = {lib: plats for lib, plats in impact.items() if lib in library_projects}
+    graph = build_dependency_graph(cwd)
+    main_by_lib = {
+        lib: {representative_platform(declared.get(lib), DEFAULT_SECONDS_BY_PLATFORM)} if plats is None else plats[0]
+        for lib, plats in impact.items()
+    }
+    platforms_by_lib = propagate_to_dependents(graph, main_by_lib)
+    for lib, plats in impact.items():
+        if plats is not None:
+            platforms_by_lib[lib] |= plats[1]
+    affected_libraries = sorted(dependents_closure(graph, set(impact)))
+    platforms_by_lib = {
+        lib: restrict_to_declared(plats, declared.get(lib), None if lib in impact else DEFAULT_SECONDS_BY_PLATFORM)
+        for lib, plats in platforms_by_lib.items()
+    }
+    platforms_by_lib = {lib: plats for lib, plats in platforms_by_lib.items() if plats}
+
+    if allowed is not None:
+        filtered = {lib: plats & allowed for lib, plats in platforms_by_lib.items() if plats & allowed}
+        if not filtered:
+            filtered = {lib: set(allowed) for lib in (platforms_by_lib or affected_libraries or library_projects)}
+        platforms_by_lib = filtered
+        if not platforms_by_lib:
+            raise PlanError("No platforms to run (--platforms did not match any).")
+
+    # Checks selected by build-logic rules (e.g. detekt) run on every library; with
+    # --platforms only the requested platforms run.
+    checks_work = check_work(checks, library_projects, args, cwd, resolve) if allowed is None else []
+    # Tasks from ci.path_rules (e.g. the BOM project) run as given, unresolved.
+    checks_work += effects.work_items() if allowed is None else []
+    if not platforms_by_lib:
+        if checks_work:
+            return (checks_work, library_projects)
+        # Watched files don't affect any platform (e.g. workflows only); validate with JVM only,
+        # on the touched libraries and their dependents when any library was touched.
+        libraries = affected_libraries or library_projects
+        return (representative_work(libraries, declared), libraries)
+
+    return (resolved_work(platforms_by_lib, args, cwd, resolve) + checks_work, sorted(platforms_by_lib))
+
+
+def representative_work(
+    libraries: list[str], declared: dict[str, frozenset[str] | None]
+) -> list[tuple[str, list[str]]]:
+    """
+    Work items validating libraries as a whole, each on its representative platform
+    (JVM tests, or the cheapest declared target without JVM); unscoped jvmTest without libraries.
+    """
+    if not libraries:
+        return [("jvm", scope_tasks_to_libraries(["jvmTest"], libraries))]
+    return gradle_test_tasks_by_library({lib: {representative_platform(declared.get(lib), DEFAULT_SECONDS_BY_PLATFORM)} for lib in libraries})
+
+
+def resolved_work(
+    platforms_by_lib: dict[str, set[str]], args: argparse.Namespace, cwd: Path, resolve: bool
+) -> list[tuple[str, list[str]]]:
+    """Per-platform work items for platforms_by_lib, with missing tasks dropped when resolve."""
+    work = gradle_test_tasks_by_library(platforms_by_lib)
+    if resolve:
+        all_task_names = sorted({t.split(":")[-1] for _name, tlist in work for t in tlist})
+        resolved = set(resolve_tasks(
+            cwd, sorted(platforms_by_lib), all_task_names, refresh_cache=args.refresh_task_cache
+        ))
+        work = [(name, [t for t in tlist if t in resolved]) for name, tlist in work]
+    return [(name, tasks) for name, tasks in work if tasks]
+
+
+def check_work(
+    checks: set[str], library_projects: list[str], args: argparse.Namespace, cwd: Path, resolve: bool
+) -> list[tuple[str, list[str]]]:
+    """One work item per check (see CHECK_TASKS) over every library, with missing tasks dropped when resolve."""
+    work = []
+    for check in sorted(checks):
+        tasks = scope_tasks_to_libraries(CHECK_TASKS[check], library_projects)
+        if resolve:
+            resolved = set(resolve_tasks(
+                cwd, library_projects, CHECK_TASKS[check], refresh_cache=args.refresh_task_cache
+            ))
+            tasks = [t for t in tasks if t in resolved]
+        if tasks:
+            work.append((check, tasks))
+    return work
+
+
+def execute_work(
+    work: list[tuple[str, list[str]]],
+    args: argparse.Namespace,
+    cwd: Path,
+    deferred: list[DeferredItem] | None = None,
+) -> int:
+    """
+    Run work (or this shard's part of it): one Gradle command, or one per item in parallel.
+    The shard is taken from the whole plan before routing to this host, so nodes on
+    different hosts given the same --shard agree on it; work this host cannot run is
+    appended to deferred.
+    """
+    history = DurationHistory.for_repo(cwd)
+    unit_cost = static_cost
+    if args.shard_costs == "history":
+        def unit_cost(platform: str, task: str) -> float:
+            return history.estimate(platform, [task])
+
+    work = route_to_host(select_shard(work, args.shard, unit_cost), args, deferred)
+    cache = None if args.no_result_cache else ResultCache(cwd)
+    keys: dict[str, str | None] = {}
+    if cache is not None:
+        work, keys = skip_cached_passes(work, cache)
+    if not work:
+        return 0
     if len(work) == 1:
-        _name, tasks = work[0]
-        return run_gradle(tasks, cwd=cwd, dry_run=args.dry_run)
-    code, failed_platform = run_parallel_gradle(
-        work, cwd=cwd, max_concurrency=args.max_concurrency, dry_run=args.dry_run
+        name, tasks = work[0]
+        started = time.monotonic()
+        code = run_gradle(tasks, cwd=cwd, dry_run=args.dry_run)
+        if not args.dry_run:
+            elapsed = time.monotonic() - started
+            history.record(name, tasks, elapsed, code)
+            if code == 0 and cache is not None:
+                cache.record_pass(keys.get(name), name, tasks)
+            report_results([RunResult(name, code, elapsed, None)], args.summary_json)
+        return code
+    max_concurrency = args.max_concurrency
+    admission = None
+    if args.scheduler == "resources":
+        max_concurrency = max_concurrency or os.cpu_count() or DEFAULT_MAX_CONCURRENCY
+        admission = AdmissionController(
+            max_concurrency,
+            min_free_memory_mb=args.min_free_memory_mb,
+            max_load=args.max_load_per_cpu * (os.cpu_count() or 1),
+        )
+    max_concurrency = max_concurrency or DEFAULT_MAX_CONCURRENCY
+    slot_pool = contextlib.nullcontext()
+    if args.isolation != "none" and not args.dry_run:
+        slot_pool = SlotPool(cwd, min(max_concurrency, len(work)), args.isolation)
+    logs = LogCapture.for_repo(cwd) if args.output == "capture" and not args.dry_run else None
+    results: list[RunResult] = []
+    run_kwargs = dict(
+        cwd=cwd,
+        max_concurrency=max_concurrency,
+        dry_run=args.dry_run,
+        admission=admission,
+        history=history,
+        logs=logs,
+        keep_going=args.keep_going,
+        results=results,
     )
+    with slot_pool as slots:
+        if args.runner == "asyncio":
+            code, failed_platform = asyncio.run(run_parallel_gradle_async(work, slots=slots, **run_kwargs))
+        else:
+            code, failed_platform = run_parallel_gradle(work, slots=slots, **run_kwargs)
+    if logs is not None:
+        logs.print_failures()
+    if cache is not None:
+        tasks_by_platform = dict(work)
+        for r in results:
+            if r.exit_code == 0 and not r.terminated:
+                cache.record_pass(keys.get(r.platform), r.platform, tasks_by_platform[r.platform])
+    if not args.dry_run:
+        report_results(results, args.summary_json)
     if code != 0 and failed_platform:
         print(f"First failing platform: {failed_platform}", file=sys.stderr)
     return code
 
 
+def watch(args: argparse.Namespace, cwd: Path) -> int:
+    """--watch: test each burst of changes under libraries/ until interrupted."""
+    stop = threading.Event()
+    with open_watcher([cwd / "libraries"], polling=args.poll) as watcher:
+        print(f"Watching libraries/ ({watcher.kind}); Ctrl-C to stop.", file=sys.stderr)
+        try:
+            asyncio.run(watch_loop(args, cwd, watcher, stop))
+        except KeyboardInterrupt:
+            print("Stopped watching.", file=sys.stderr)
+    return 0
+
+
+async def watch_loop(args: argparse.Namespace, cwd: Path, watcher, stop: threading.Event) -> None:
+    """
+    Plan and run each burst from the watcher with the asyncio runner. A burst that
+    arrives while a run is in flight cancels it (its process groups are terminated)
+    and is planned together with the cancelled run's changes. The first "run" only
+    starts the Gradle daemon so the first real one finds it warm. Returns once
+    next_burst returns None (stop was set).
+    """
+    allowed = allowed_platforms(args.platforms)
+    library_projects = get_library_project_paths(cwd)
+    history = DurationHistory.for_repo(cwd)
+    burst = asyncio.ensure_future(asyncio.to_thread(next_burst, watcher, cwd, args.debounce, stop))
+    run = None if args.dry_run else asyncio.ensure_future(
+        run_single_gradle_async(["help"], cwd, extra_args=["-q"], output=lambda _chunk: None)
+    )
+    run_changes: dict[str, FileChange] = {}
+    run_logs = None
+    try:
+        while True:
+            done, _ = await asyncio.wait({f for f in (burst, run) if f is not None}, return_when=asyncio.FIRST_COMPLETED)
+            if run in done:
+                report_watch_run(run, run_changes, run_logs)
+                run, run_changes = None, {}
+            if burst not in done:
+                continue
+            changes = burst.result()
+            if changes is None:
+                return
+            burst = asyncio.ensure_future(asyncio.to_thread(next_burst, watcher, cwd, args.debounce, stop))
+            if not changes:
+                continue
+            if run is not None:
+                run.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await run
+                run = None
+                if run_changes:
+                    print("[watch] cancelled the run in progress; planning it again with the new changes", file=sys.stderr)
+            run_changes.update((c.path, c) for c in changes)
+            print(f"[watch] {len(changes)} changed file(s): {', '.join(c.path for c in changes[:5])}"
+                  + (" ..." if len(changes) > 5 else ""), file=sys.stderr)
+            try:
+                # Off the event loop: resolving tasks may query Gradle, and bursts keep coming.
+                work, _libraries = await asyncio.to_thread(
+                    plan_changes, list(run_changes.values()), args, cwd, not args.dry_run, allowed, library_projects
+                )
+            except PlanError as e:
+                print(e, file=sys.stderr)
+                run_changes = {}
+                continue
+            work = route_to_host(work, args)
+            max_concurrency = args.max_concurrency or DEFAULT_MAX_CONCURRENCY
+            if not work or args.dry_run:
+                await run_parallel_gradle_async(work, cwd, max_concurrency, dry_run=True, history=history)
+                run_changes = {}
+                continue
+            run_logs = LogCapture.for_repo(cwd) if args.output == "capture" else None
+            run = asyncio.ensure_future(run_parallel_gradle_async(
+                work, cwd, max_concurrency, history=history, logs=run_logs, keep_going=args.keep_going
+            ))
+    finally:
+        stop.set()
+        if run is not None:
+            run.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await run
+
+
+def report_watch_run(run: asyncio.Future, changes: dict[str, FileChange], logs: LogCapture | None) -> None:
+    """Say how a finished watch run went. The daemon warm-up (no changes) is not reported."""
+    if not changes:
+        run.exception()  # a failed warm-up only means the first real run starts the daemon
+        return
+    try:
+        code, failed_platform = run.result()
+    except Exception as e:  # a broken run must not end the watch session
+        print(f"[watch] run failed: {e}; waiting for changes", file=sys.stderr)
+        return
+    if logs is not None:
+        logs.print_failures()
+    if code == 0:
+        print(f"[watch] passed ({len(changes)} changed file(s)); waiting for changes", file=sys.stderr)
+    else:
+        print(f"[watch] FAILED: {failed_platform} (exit {code}); waiting for changes", file=sys.stderr)
+
+
+def shard_arg(value: str) -> tuple[int, int]:
+    """argparse type for --shard."""
+    try:
+        return parse_shard(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+
+
+def select_shard(
+    work: list[tuple[str, list[str]]], shard: tuple[int, int] | None, cost
+) -> list[tuple[str, list[str]]]:
+    """Return work unchanged without --shard, else this shard's slice (and say what it got)."""
+    if shard is None:
+        return work
+    index, count = shard
+    selected = shard_work(work, index, count, cost)
+    print(
+        f"Shard {index}/{count}: {len(work_units(selected))} of {len(work_units(work))} task(s)"
+        + ("" if selected else " (nothing to run)"),
+        file=sys.stderr,
+    )
+    return selected
+
+
+def skip_cached_passes(
+    work: list[tuple[str, list[str]]], cache: ResultCache
+) -> tuple[list[tuple[str, list[str]]], dict[str, str | None]]:
+    """Drop work items whose key already passed (saying so); return the rest and their keys."""
+    remaining = []
+    keys = {}
+    for name, tasks in work:
+        key = cache.key(name, tasks)
+        if cache.passed(key):
+            print(f"[cached pass] {name}: {len(tasks)} task(s), sources and build config unchanged since a passing run")
+        else:
+            remaining.append((name, tasks))
+            keys[name] = key
+    return (remaining, keys)
+
+
+def report_results(results: list[RunResult], summary_json: Path | None) -> None:
+    """Print the failed runs (if any) and write the JSON summary when requested."""
+    summary = format_failure_summary(results)
+    if summary:
+        print(summary, file=sys.stderr)
+    if summary_json is not None:
+        summary_json.parent.mkdir(parents=True, exist_ok=True)
+        summary_json.write_text(json.dumps(result_summary(results), indent=2) + "\n")
+
+
 if __name__ == "__main__":
     sys.exit(main())
@@ -0,0 +1 @@
+# Benchmarks for scripts/src modules (run directly, not collected by pytest).
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: compiled path classifier vs the per-pattern regex loop.
+
+Run from repo root: python3 scripts/tests/benchmarks/bench_classifier.py [--paths N] [--repeat R]
+"""
+
+import argparse
+import random
+import sys
+import timeit
+from pathlib import Path
+
+_scripts_dir = Path(__file__).resolve().parents[2]
+if str(_scripts_dir) not in sys.path:
+    sys.path.insert(0, str(_scripts_dir))
+
+from src.platform_core import BUILD_LOGIC_RULES, FULL_BUILD_PATTERNS, SRC_SET_PATTERNS, platforms_for_path
+
+
+def loop_platforms_for_path(path: str) -> set[str] | None:
+    """Reference implementation: search every BUILD_LOGIC, FULL_BUILD and SRC_SET pattern in turn."""
+    path_with_slash = f"/{path}" if not path.startswith("/") else path
+    for pattern, plats, _checks in BUILD_LOGIC_RULES:
+        if pattern.match(path):
+            return set(plats)
+    for pattern in FULL_BUILD_PATTERNS:
+        if pattern.search(path):
+            return None
+    platforms = set()
+    for pattern, plats in SRC_SET_PATTERNS:
+        if pattern.search(path_with_slash):
+            platforms |= plats
+    return platforms if platforms else set()
+
+
+def sample_paths(count: int, seed: int = 0) -> list[str]:
+    """Return a deterministic mix of source-set, build-file and unrelated paths."""
+    rng = random.Random(seed)
+    source_sets = [p.pattern.removeprefix("/src/").removesuffix("/") for p, _ in SRC_SET_PATTERNS]
+    others = ["README.md", "docs/docs/index.md", "scripts/src/platform_core.py", "build.gradle.kts"]
+    paths = []
+    for i in range(count):
+        roll = rng.random()
+        if roll < 0.85:
+            source_set = rng.choice(source_sets)
+            paths.append(f"libraries/lib{i % 50}/src/{source_set}/kotlin/pkg/File{i}.kt")
+        elif roll < 0.99:
+            paths.append(rng.choice(others[:-1]))
+        else:
+            paths.append(others[-1])
+    return paths
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark platforms_for_path implementations")
+    parser.add_argument("--paths", type=int, default=20_000, help="Number of paths (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions (default: %(default)s)")
+    args = parser.parse_args()
+
+    paths = sample_paths(args.paths)
+    mismatches = [p for p in paths if platforms_for_path(p) != loop_platforms_for_path(p)]
+    if mismatches:
+        print(f"Mismatch on {len(mismatches)} path(s), e.g. {mismatches[0]}", file=sys.stderr)
+        return 1
+
+    loop = min(timeit.repeat(lambda: [loop_platforms_for_path(p) for p in paths], number=1, repeat=args.repeat))
+    compiled = min(timeit.repeat(lambda: [platforms_for_path(p) for p in paths], number=1, repeat=args.repeat))
+    print(f"paths:    {len(paths)}")
+    print(f"loop:     {loop * 1000:.1f} ms ({loop / len(paths) * 1e6:.2f} us/path)")
+    print(f"compiled: {compiled * 1000:.1f} ms ({compiled / len(paths) * 1e6:.2f} us/path)")
+    print(f"speedup:  {loop / compiled:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the Python planning path on synthetic monorepos, with a regression gate.
+
+Times the path test_platforms.py takes for committed changes: git (changes_or_none on a
+generated repo, drained), classify (expand_catalog_changes -> planning_paths ->
+PathRules.build_paths -> platforms_by_library with declared targets) and tasks
+(gradle_test_tasks_by_library). Times are also stored relative to a fixed calibration
+workload so a baseline recorded on one machine is usable on another.
+
+Run from repo root:
+  python3 scripts/tests/benchmarks/bench_planner.py [--sizes 10,1000,100000] [--update-baseline]
+Exit code 1 when a stage regressed beyond the tolerance against the stored baseline.
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+_scripts_dir = Path(__file__).resolve().parents[2]
+if str(_scripts_dir) not in sys.path:
+    sys.path.insert(0, str(_scripts_dir))
+
+from src.duration_history import DEFAULT_SECONDS_BY_PLATFORM
+from src.file_change import FileChange
+from src.path_rules import PathRules, RuleEffects
+from src.platform_core import (
+    KNOWN_PLATFORMS,
+    gradle_test_tasks_by_library,
+    planning_paths,
+    platforms_by_library,
+    representative_platform,
+)
+from src.task_inventory import declared_platforms
+from src.touched_files import changes_or_none
+from src.version_catalog import expand_catalog_changes
+from tests.benchmarks.synthetic_repo import apply_diff, changed_paths, generate_repo, library_names
+
+BASELINE_PATH = Path(__file__).resolve().parent / "planner_baseline.json"
+BASELINE_VERSION = 3
+# The template's own project.yml path filters, so skipped and unwatched paths are exercised too.
+PATH_RULES = PathRules(
+    skip_paths=["**/*.md", "docs/**", "LICENSE*", "NOTICE*"],
+    watch_paths=["libraries/**", "build-logic/**", "gradle/**", "build.gradle.kts", "settings.gradle.kts", "gradle.properties"],
+)
+# Every synthetic library declares the platforms of the template's example library, as
+# task_inventory reads them from its build script (every planner platform if unreadable).
+DECLARED_PLATFORMS = declared_platforms(_scripts_dir.parent / "libraries" / "example-library") or KNOWN_PLATFORMS
+DEFAULT_SIZES = (10, 1_000, 100_000)
+DEFAULT_LIBRARIES = 100
+# Slower than baseline by more than this factor (relative time) is a regression.
+DEFAULT_TIME_TOLERANCE = 1.5
+DEFAULT_MEMORY_TOLERANCE = 1.25
+# Below these, differences are measurement noise and never count as regressions.
+_TIME_NOISE_FLOOR_MS = 2.0
+_MEMORY_NOISE_FLOOR_KIB = 256.0
+
+
+def _best_of(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def calibrate(repeat: int = 5) -> float:
+    """Seconds for a fixed pure-Python workload (string building, hashing, sorting)."""
+    return _best_of(lambda: sorted({f"libraries/lib{i * 7919 % 100_003}/src/x{i}" for i in range(50_000)}), repeat)
+
+
+def classify(changes: list[FileChange], repo_root: Path, library_projects: list[str]) -> dict | None:
+    """Per-library (main, test) platforms for committed changes, as test_platforms.plan_changes computes them."""
+    declared = {lib: DECLARED_PLATFORMS for lib in library_projects}
+    expanded = expand_catalog_changes(iter(changes), repo_root, "committed", None, [])
+    paths = PATH_RULES.build_paths(planning_paths(expanded), RuleEffects())
+    return platforms_by_library(paths, libraries=library_projects, declared=declared, costs=DEFAULT_SECONDS_BY_PLATFORM)
+
+
+def work_items(impact: dict | None) -> list[tuple[str, list[str]]]:
+    """Scoped test tasks per platform for classify's result (None plats: representative platform)."""
+    return gradle_test_tasks_by_library(
+        {
+            lib: {representative_platform(DECLARED_PLATFORMS, DEFAULT_SECONDS_BY_PLATFORM)} if plats is None else plats[0] | plats[1]
+            for lib, plats in (impact or {}).items()
+        }
+    )
+
+
+def plan(changes: list[FileChange], repo_root: Path, library_projects: list[str]) -> list[tuple[str, list[str]]]:
+    """The planning pipeline from change records to work items."""
+    return work_items(classify(changes, repo_root, library_projects))
+
+
+def _drain(changes) -> list[FileChange]:
+    return list(changes or ())
+
+
+def measure_size(
+    size: int, libraries: int, repeat: int, git_root: Path | None, git_base: str | None
+) -> dict:
+    """Time every stage for one diff size and record the pipeline's peak traced memory."""
+    changes = [FileChange("modified", p) for p in changed_paths(libraries, size, seed=size)]
+    library_projects = [f":libraries:{name}" for name in library_names(libraries)]
+    repo_root = git_root if git_root is not None else Path(".")
+    impact = classify(changes, repo_root, library_projects)
+    stages: dict[str, Callable[[], object]] = {
+        "classify": lambda: classify(changes, repo_root, library_projects),
+        "tasks": lambda: work_items(impact),
+    }
+    if git_root is not None and git_base is not None:
+        stages = {"git": lambda: _drain(changes_or_none(git_base, git_root, "committed")), **stages}
+    result: dict = {"stages": {name: _best_of(fn, repeat) for name, fn in stages.items()}}
+    tracemalloc.start()
+    plan(changes, repo_root, library_projects)
+    result["peak_kib"] = tracemalloc.get_traced_memory()[1] / 1024
+    tracemalloc.stop()
+    return result
+
+
+def run_benchmark(
+    sizes: list[int], libraries: int, repeat: int, git_max_paths: int
+) -> dict:
+    """Return {"calibration_s", "libraries", "sizes": {size: {"stages": {stage: s}, "peak_kib"}}}."""
+    report: dict = {"calibration_s": calibrate(), "libraries": libraries, "sizes": {}}
+    with tempfile.TemporaryDirectory(prefix="kmp-planner-bench-") as tmp:
+        git_root = Path(tmp) / "repo"
+        git_base = generate_repo(git_root, libraries) if any(s <= git_max_paths for s in sizes) else None
+        for size in sizes:
+            with_git = git_base is not None and size <= git_max_paths
+            if with_git:
+                apply_diff(git_root, changed_paths(libraries, size, seed=size), base=git_base)
+            report["sizes"][str(size)] = measure_size(
+                size, libraries, repeat, git_root if with_git else None, git_base if with_git else None
+            )
+    return report
+
+
+def to_baseline(report: dict) -> dict:
+    """Baseline document: per size and stage, seconds relative to calibration, plus peak memory."""
+    calibration = report["calibration_s"]
+    return {
+        "version": BASELINE_VERSION,
+        "libraries": report["libraries"],
+        "sizes": {
+            size: {
+                "relative": {stage: secs / calibration for stage, secs in data["stages"].items()},
+                "peak_kib": round(data["peak_kib"], 1),
+            }
+            for size, data in report["sizes"].items()
+        },
+    }
+
+
+def regressions(
+    report: dict,
+    baseline: dict,
+    time_tolerance: float = DEFAULT_TIME_TOLERANCE,
+    memory_tolerance: float = DEFAULT_MEMORY_TOLERANCE,
+) -> list[str]:
+    """Describe each stage/size that is slower or larger than baseline beyond tolerance."""
+    problems = []
+    calibration = report["calibration_s"]
+    for size, data in report["sizes"].items():
+        base = baseline.get("sizes", {}).get(size)
+        if base is None:
+            continue
+        for stage, secs in data["stages"].items():
+            base_rel = base["relative"].get(stage)
+            if base_rel is None:
+                continue
+            base_ms = base_rel * calibration * 1000
+            if secs * 1000 > _TIME_NOISE_FLOOR_MS and secs / calibration > base_rel * time_tolerance:
+                problems.append(
+                    f"{size} paths, {stage}: {secs * 1000:.1f} ms vs baseline {base_ms:.1f} ms "
+                    f"(> {time_tolerance}x)"
+                )
+        if data["peak_kib"] > _MEMORY_NOISE_FLOOR_KIB and data["peak_kib"] > base["peak_kib"] * memory_tolerance:
+            problems.append(
+                f"{size} paths, peak memory: {data['peak_kib']:.0f} KiB vs baseline {base['peak_kib']:.0f} KiB "
+                f"(> {memory_tolerance}x)"
+            )
+    return problems
+
+
+def print_report(report: dict) -> None:
+    print(f"libraries: {report['libraries']}, calibration: {report['calibration_s'] * 1000:.1f} ms")
+    for size, data in report["sizes"].items():
+        stages = "  ".join(f"{stage} {secs * 1000:.2f} ms" for stage, secs in data["stages"].items())
+        print(f"{int(size):>7} paths: {stages}  peak {data['peak_kib']:.0f} KiB")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the platform planner on synthetic repositories")
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(s) for s in DEFAULT_SIZES),
+        help="Comma-separated changed-path counts (default: %(default)s)",
+    )
+    parser.add_argument("--libraries", type=int, default=DEFAULT_LIBRARIES, help="Libraries in the synthetic repo (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions per stage (default: %(default)s)")
+    parser.add_argument(
+        "--git-max-paths",
+        type=int,
+        default=1_000,
+        help="Also time changes_or_none on a generated git repo for sizes up to this (default: %(default)s)",
+    )
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="Baseline JSON (default: %(default)s)")
+    parser.add_argument("--update-baseline", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--time-tolerance", type=float, default=DEFAULT_TIME_TOLERANCE)
+    parser.add_argument("--memory-tolerance", type=float, default=DEFAULT_MEMORY_TOLERANCE)
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    report = run_benchmark(sizes, args.libraries, args.repeat, args.git_max_paths)
+    print_report(report)
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(to_baseline(report), indent=2, sort_keys=True) + "\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    try:
+        baseline = json.loads(args.baseline.read_text())
+    except (OSError, ValueError):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one.", file=sys.stderr)
+        return 0
+    if baseline.get("version") != BASELINE_VERSION or baseline.get("libraries") != args.libraries:
+        print("Baseline was recorded with different settings; not comparing.", file=sys.stderr)
+        return 0
+    problems = regressions(report, baseline, args.time_tolerance, args.memory_tolerance)
+    for problem in problems:
+        print(f"REGRESSION: {problem}", file=sys.stderr)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Synthetic monorepo generator for planner benchmarks.
+
+Builds fake repositories with N libraries that each have one file in every source set
+of SRC_SET_PATTERNS, and diffs of a configurable number of paths on top of them.
+Everything is deterministic for a given seed.
+"""
+
+import random
+import subprocess
+import sys
+from pathlib import Path
+
+_scripts_dir = Path(__file__).resolve().parents[2]
+if str(_scripts_dir) not in sys.path:
+    sys.path.insert(0, str(_scripts_dir))
+
+from src.platform_core import SRC_SET_PATTERNS
+
+SOURCE_SETS = sorted({p.pattern.removeprefix("/src/").removesuffix("/") for p, _ in SRC_SET_PATTERNS})
+# Paths outside libraries that a diff can also touch (no platform impact).
+OTHER_PATHS = ["README.md", "docs/docs/index.md", "scripts/src/platform_core.py", ".github/workflows/build.yml"]
+
+
+def library_names(count: int) -> list[str]:
+    return [f"lib{i:05d}" for i in range(count)]
+
+
+def changed_paths(libraries: int, count: int, seed: int = 0, other_ratio: float = 0.05) -> list[str]:
+    """
+    Return count distinct changed paths spread over libraries and every source set.
+    About other_ratio of them are outside libraries/ (never a root build file, which
+    would short-circuit planning to a full build).
+    """
+    rng = random.Random(seed)
+    names = library_names(libraries)
+    paths = []
+    for i in range(count):
+        if rng.random() < other_ratio:
+            paths.append(f"{rng.choice(OTHER_PATHS).rsplit('.', 1)[0]}-{i}.md")
+        else:
+            source_set = SOURCE_SETS[i % len(SOURCE_SETS)]
+            paths.append(f"libraries/{rng.choice(names)}/src/{source_set}/kotlin/pkg/Changed{i}.kt")
+    return paths
+
+
+def _git(root: Path, *args: str) -> str:
+    result = subprocess.run(
+        ["git", "-c", "user.name=bench", "-c", "user.email=bench@example.com", *args],
+        cwd=root,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.strip()
+
+
+def generate_repo(root: Path, libraries: int) -> str:
+    """
+    Create a git repository at root with the given number of libraries (build script
+    plus one file per source set each) and return the initial commit SHA.
+    """
+    root.mkdir(parents=True, exist_ok=True)
+    (root / "settings.gradle.kts").write_text('rootProject.name = "synthetic"\n')
+    for name in library_names(libraries):
+        library = root / "libraries" / name
+        library.mkdir(parents=True)
+        (library / "build.gradle.kts").write_text("plugins { id(\"convention.kotlin.multiplatform\") }\n")
+        for source_set in SOURCE_SETS:
+            directory = library / "src" / source_set / "kotlin" / "pkg"
+            directory.mkdir(parents=True)
+            (directory / "Main.kt").write_text(f"package pkg\n\nval {source_set}Marker = \"{name}\"\n")
+    _git(root, "init", "-q")
+    _git(root, "add", "-A")
+    _git(root, "commit", "-q", "-m", "synthetic base")
+    return _git(root, "rev-parse", "HEAD")
+
+
+def apply_diff(root: Path, paths: list[str], base: str | None = None) -> str:
+    """
+    Create or modify each path, commit, and return the new HEAD SHA. With base, the
+    commit goes on top of base (detached HEAD) instead of the current HEAD.
+    """
+    if base is not None:
+        _git(root, "checkout", "-q", "--detach", base)
+    for rel in paths:
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f"changed {rel}\n")
+    _git(root, "add", "-A")
+    _git(root, "commit", "-q", "-m", f"synthetic diff of {len(paths)} paths")
+    return _git(root, "rev-parse", "HEAD")
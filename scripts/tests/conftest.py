@@ -1,4 +1,6 @@
-"""Pytest conftest: ensure scripts dir is on sys.path so tests can import from src."""
+"""Pytest conftest: ensure scripts dir is on sys.path so tests can import from src; shared repo factories."""
+import shutil
+import subprocess
 import sys
 from pathlib import Path
 
@@ -20,3 +22,87 @@ def repo_root():
         return root
     except Exception as e:
         pytest.skip(f"repo root unavailable: {e}")
+
+
+# Left out of checkout_copy: VCS data, build output and caches, and trees the planner never reads.
+_CHECKOUT_COPY_IGNORE = (".git", ".gradle", ".kotlin", "build", "node_modules", "__pycache__", ".pytest_cache", "scripts", "docs", "images")
+
+
+@pytest.fixture
+def checkout_copy(repo_root, tmp_path, git):
+    """
+    Copy of the checkout's build files (libraries, build-logic, gradle/, project.yml, ...)
+    under tmp_path, committed to a fresh repo, so planning runs write their caches there
+    instead of the real tree.
+    """
+    root = tmp_path / "checkout"
+    shutil.copytree(repo_root, root, ignore=shutil.ignore_patterns(*_CHECKOUT_COPY_IGNORE), symlinks=True)
+    git(root, "init", "-q")
+    git(root, "add", "-A")
+    git(root, "commit", "-q", "-m", "checkout")
+    return root
+
+
+@pytest.fixture
+def git():
+    """git(root, *args) -> stripped stdout, with a fixed identity; a failing command fails the test."""
+    def run(root: Path, *args: str) -> str:
+        return subprocess.run(
+            ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+            cwd=root,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+
+    return run
+
+
+@pytest.fixture
+def write_file():
+    """write_file(root, rel, text="") -> path, creating parent directories."""
+    def write(root: Path, rel: str, text: str = "") -> Path:
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+        return path
+
+    return write
+
+
+@pytest.fixture
+def commit(git):
+    """commit(root, message="change") stages every change, commits it and returns the new HEAD sha."""
+    def run(root: Path, message: str = "change") -> str:
+        git(root, "add", "-A")
+        git(root, "commit", "-q", "-m", message)
+        return git(root, "rev-parse", "HEAD")
+
+    return run
+
+
+@pytest.fixture
+def init_repo(git, write_file, commit):
+    """init_repo(root, files=None, branch=None) -> root: a git repo, with files ({path: text}) committed as "base"."""
+    def init(root: Path, files: dict[str, str] | None = None, branch: str | None = None) -> Path:
+        root.mkdir(parents=True, exist_ok=True)
+        git(root, "init", "-q", *(["-b", branch] if branch else []))
+        for rel, text in (files or {}).items():
+            write_file(root, rel, text)
+        if files:
+            commit(root, "base")
+        return root
+
+    return init
+
+
+@pytest.fixture
+def make_library(write_file):
+    """make_library(root, name, script="", targets=None) -> libraries/<name>, with kmp.targets when targets is set."""
+    def make(root: Path, name: str, script: str = "", targets: str | None = None) -> Path:
+        lib_dir = write_file(root, f"libraries/{name}/build.gradle.kts", script).parent
+        if targets is not None:
+            write_file(lib_dir, "gradle.properties", f"# targets\nkmp.targets={targets}\n")
+        return lib_dir
+
+    return make
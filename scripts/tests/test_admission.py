@@ -0,0 +1,94 @@
+"""Tests for admission (resource-aware admission control)."""
+
+import threading
+
+from src.admission import (
+    AdmissionController,
+    memory_estimate_mb,
+    read_load_average,
+    read_mem_available_mb,
+)
+
+
+class TestProcReaders:
+    """Tests for /proc readers."""
+
+    def test_reads_mem_available(self, tmp_path):
+        meminfo = tmp_path / "meminfo"
+        meminfo.write_text("MemTotal:       16384000 kB\nMemAvailable:    8192000 kB\n")
+        assert read_mem_available_mb(meminfo) == 8000
+
+    def test_mem_available_missing_returns_none(self, tmp_path):
+        assert read_mem_available_mb(tmp_path / "nope") is None
+
+    def test_reads_load_average(self, tmp_path):
+        loadavg = tmp_path / "loadavg"
+        loadavg.write_text("2.50 1.00 0.50 1/100 12345\n")
+        assert read_load_average(loadavg) == 2.5
+
+    def test_load_average_missing_returns_none(self, tmp_path):
+        assert read_load_average(tmp_path / "nope") is None
+
+
+def _controller(memory, load=0.0, **kwargs):
+    return AdmissionController(
+        8,
+        min_free_memory_mb=1000,
+        max_load=4.0,
+        read_memory=lambda: memory,
+        read_load=lambda: load,
+        **kwargs,
+    )
+
+
+class TestAdmissionController:
+    """Tests for AdmissionController."""
+
+    def test_native_estimate_exceeds_jvm(self):
+        assert memory_estimate_mb("ios") > memory_estimate_mb("jvm")
+
+    def test_first_process_always_admitted(self):
+        controller = _controller(memory=0, load=100.0)
+        assert controller.acquire("ios") is not None
+
+    def test_second_process_needs_memory_headroom(self):
+        controller = _controller(memory=memory_estimate_mb("jvm") * 2 + 1000)
+        assert controller.acquire("jvm") is not None
+        # First run's estimate is still pending (warm-up), so only one jvm estimate is left.
+        assert controller.acquire("ios", should_abort=lambda: True) is None
+        assert controller.acquire("jvm") is not None
+
+    def test_high_load_blocks_second_process(self):
+        controller = _controller(memory=100_000, load=5.0)
+        assert controller.acquire("jvm") is not None
+        assert controller.acquire("jvm", should_abort=lambda: True) is None
+
+    def test_max_concurrency_caps_admissions(self):
+        controller = AdmissionController(1, read_memory=lambda: 100_000, read_load=lambda: 0.0)
+        assert controller.acquire("jvm") is not None
+        assert controller.acquire("jvm", should_abort=lambda: True) is None
+
+    def test_without_proc_only_concurrency_applies(self):
+        controller = AdmissionController(2, read_memory=lambda: None, read_load=lambda: None)
+        assert controller.acquire("ios") is not None
+        assert controller.acquire("ios") is not None
+        assert controller.acquire("ios", should_abort=lambda: True) is None
+
+    def test_warmed_up_processes_no_longer_reserve_memory(self):
+        now = [0.0]
+        controller = _controller(memory=memory_estimate_mb("ios") + 1000, warmup_seconds=10, clock=lambda: now[0])
+        assert controller.acquire("ios") is not None
+        assert controller.acquire("ios", should_abort=lambda: True) is None
+        now[0] = 11.0
+        assert controller.acquire("ios") is not None
+
+    def test_release_wakes_waiting_worker(self):
+        controller = AdmissionController(1, read_memory=lambda: None, read_load=lambda: None)
+        first = controller.acquire("jvm")
+        admitted = []
+        waiter = threading.Thread(target=lambda: admitted.append(controller.acquire("jvm")))
+        waiter.start()
+        controller.release(first)
+        waiter.join(timeout=5)
+        assert not waiter.is_alive()
+        assert admitted and admitted[0] is not None
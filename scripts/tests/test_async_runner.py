@@ -0,0 +1,119 @@
+"""Tests for async_runner (asyncio runner with process-group termination)."""
+
+import asyncio
+import os
+import time
+
+import pytest
+
+from src.async_runner import run_parallel_gradle_async, run_single_gradle_async
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="process groups via POSIX sessions")
+
+# Fake gradlew: "./gradlew --daemon <mode> [pidfile]".
+#   ok   -> exit 0;  fail -> exit 3
+#   hang -> start a background child, write its pid to pidfile, wait forever
+FAKE_GRADLEW = """#!/bin/sh
+mode="$2"
+case "$mode" in
+  ok) exit 0 ;;
+  fail) sleep 0.2; exit 3 ;;
+  hang) sleep 60 & echo $! > "$3"; wait ;;
+esac
+"""
+
+
+@pytest.fixture
+def fake_root(tmp_path):
+    gradlew = tmp_path / "gradlew"
+    gradlew.write_text(FAKE_GRADLEW)
+    gradlew.chmod(0o755)
+    return tmp_path
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+def _wait_dead(pid: int, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if not _alive(pid):
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def _wait_for_file(path, timeout: float = 5.0) -> str:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if path.exists() and path.read_text().strip():
+            return path.read_text().strip()
+        time.sleep(0.02)
+    raise AssertionError(f"{path} not written")
+
+
+class TestRunSingleGradleAsync:
+    """Tests for run_single_gradle_async."""
+
+    def test_returns_exit_code(self, fake_root):
+        assert asyncio.run(run_single_gradle_async(["ok"], fake_root)) == 0
+        assert asyncio.run(run_single_gradle_async(["fail"], fake_root)) == 3
+
+    def test_cancel_kills_whole_process_group(self, fake_root):
+        pidfile = fake_root / "child.pid"
+
+        async def scenario():
+            task = asyncio.ensure_future(run_single_gradle_async(["hang", str(pidfile)], fake_root, grace_seconds=1))
+            await asyncio.to_thread(_wait_for_file, pidfile)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(scenario())
+        assert _wait_dead(int(pidfile.read_text()))
+
+
+class TestRunParallelGradleAsync:
+    """Tests for run_parallel_gradle_async (same contract as run_parallel_gradle)."""
+
+    def test_all_succeed_returns_zero(self, fake_root):
+        work = [("a", ["ok"]), ("b", ["ok"])]
+        assert asyncio.run(run_parallel_gradle_async(work, fake_root, max_concurrency=2)) == (0, None)
+
+    def test_empty_work_returns_zero(self, fake_root):
+        assert asyncio.run(run_parallel_gradle_async([], fake_root, max_concurrency=2)) == (0, None)
+
+    def test_dry_run_prints(self, fake_root, capsys):
+        work = [("jvm", ["jvmTest"])]
+        assert asyncio.run(run_parallel_gradle_async(work, fake_root, max_concurrency=1, dry_run=True)) == (0, None)
+        assert "[dry-run] would run jvm" in capsys.readouterr().out
+
+    def test_fail_fast_kills_children_of_other_runs(self, fake_root):
+        pidfile = fake_root / "child.pid"
+        work = [("hang", ["hang", str(pidfile)]), ("fail", ["fail"])]
+        code, failed = asyncio.run(run_parallel_gradle_async(work, fake_root, max_concurrency=2, grace_seconds=1))
+        assert (code, failed) == (3, "fail")
+        assert _wait_dead(int(_wait_for_file(pidfile)))
+
+    def test_queued_items_do_not_start_after_failure(self, fake_root):
+        work = [("fail", ["fail"]), ("later", ["hang", str(fake_root / "never.pid")])]
+        code, failed = asyncio.run(run_parallel_gradle_async(work, fake_root, max_concurrency=1))
+        assert (code, failed) == (3, "fail")
+        assert not (fake_root / "never.pid").exists()
+
+    def test_keep_going_runs_queued_items_and_collects_results(self, fake_root):
+        from src.parallel_runner import RunResult, result_summary
+
+        results: list[RunResult] = []
+        work = [("fail", ["fail"]), ("later", ["ok"])]
+        code, failed = asyncio.run(run_parallel_gradle_async(
+            work, fake_root, max_concurrency=1, keep_going=True, results=results
+        ))
+        assert (code, failed) == (3, "fail")
+        assert sorted((r.platform, r.exit_code) for r in results) == [("fail", 3), ("later", 0)]
+        assert [f["platform"] for f in result_summary(results)["failures"]] == ["fail"]
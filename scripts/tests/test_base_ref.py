@@ -0,0 +1,118 @@
+"""Tests for base_ref (base commit resolution with fallbacks)."""
+
+import pytest
+
+from src.base_ref import describe_resolution, last_verified, record_verified, resolve_base
+
+
+@pytest.fixture
+def touch_commit(write_file, commit):
+    """touch_commit(root, name) commits a new file name and returns the new HEAD sha."""
+    def run(root, name):
+        write_file(root, name, name)
+        return commit(root, name)
+
+    return run
+
+
+@pytest.fixture
+def repo(tmp_path, git, init_repo):
+    """Repo on branch 'trunk' (so main/master do not exist) with one commit, then branch 'feature'."""
+    root = init_repo(tmp_path / "work", {"base.txt": "base.txt"}, branch="trunk")
+    git(root, "checkout", "-q", "-b", "feature")
+    return root
+
+
+@pytest.fixture
+def remote(tmp_path, repo, git):
+    bare = tmp_path / "remote.git"
+    git(tmp_path, "init", "-q", "--bare", str(bare))
+    git(repo, "remote", "add", "origin", str(bare))
+    return bare
+
+
+class TestResolveBase:
+    """Tests for resolve_base."""
+
+    def test_requested_ref(self, repo, git, touch_commit):
+        base_sha = git(repo, "rev-parse", "trunk")
+        touch_commit(repo, "f.txt")
+        base, _notes = resolve_base("trunk", repo)
+        assert (base.sha, base.source) == (base_sha, "requested")
+
+    def test_upstream_when_requested_missing(self, repo, remote, git, touch_commit):
+        git(repo, "push", "-q", "-u", "origin", "feature")
+        pushed = git(repo, "rev-parse", "HEAD")
+        touch_commit(repo, "f.txt")
+        base, notes = resolve_base("origin/main", repo)
+        assert (base.sha, base.source, base.ref) == (pushed, "upstream", "origin/feature")
+        assert any("requested" in n for n in notes)
+
+    def test_merge_base_with_default_branch(self, repo, git, touch_commit):
+        git(repo, "branch", "-m", "trunk", "main")
+        fork = git(repo, "rev-parse", "main")
+        touch_commit(repo, "f.txt")
+        base, _notes = resolve_base("origin/main", repo)
+        assert (base.sha, base.source, base.ref) == (fork, "merge-base", "main")
+
+    def test_last_push_from_reflog(self, repo, remote, git, touch_commit):
+        touch_commit(repo, "f.txt")
+        git(repo, "push", "-q", "origin", "feature")
+        pushed = git(repo, "rev-parse", "HEAD")
+        touch_commit(repo, "g.txt")
+        base, _notes = resolve_base("origin/nope", repo)
+        # origin/feature exists but is not the upstream; the push reflog finds it.
+        assert (base.sha, base.source) == (pushed, "reflog push")
+
+    def test_last_verified(self, repo, touch_commit):
+        touch_commit(repo, "f.txt")
+        record_verified(repo)
+        verified = last_verified(repo)
+        touch_commit(repo, "g.txt")
+        base, _notes = resolve_base("origin/main", repo)
+        assert (base.sha, base.source) == (verified, "last verified")
+
+    def test_nothing_usable(self, repo):
+        base, notes = resolve_base("origin/main", repo)
+        assert base is None
+        assert any("not found" in n for n in notes)
+        assert describe_resolution("origin/main", base, notes)[-1] == "Falling back to a full build."
+
+    def test_head_itself_is_a_base_with_nothing_since(self, repo):
+        record_verified(repo)
+        base, _notes = resolve_base("HEAD", repo)
+        assert base is not None and base.at_head
+        assert base.source == "requested"
+
+    def test_head_on_requested_ref(self, repo, remote, git):
+        """HEAD == origin/main: the requested ref is used (nothing since it), not a full build."""
+        git(repo, "push", "-q", "origin", "HEAD:main")
+        git(repo, "fetch", "-q", "origin")
+        base, notes = resolve_base("origin/main", repo)
+        assert base is not None
+        assert (base.source, base.ref, base.at_head) == ("requested", "origin/main", True)
+        assert base.sha == git(repo, "rev-parse", "HEAD")
+        assert describe_resolution("origin/main", base, notes) == [f"Base: {base.sha[:12]} (requested: origin/main, HEAD itself)"]
+
+    def test_last_verified_head_is_used(self, repo):
+        record_verified(repo)
+        base, _notes = resolve_base("origin/main", repo)
+        assert (base.source, base.at_head) == ("last verified", True)
+
+
+class TestDescribeResolution:
+    """Tests for describe_resolution."""
+
+    def test_requested_is_one_line(self, repo, touch_commit):
+        touch_commit(repo, "f.txt")
+        base, notes = resolve_base("trunk", repo)
+        assert describe_resolution("trunk", base, notes) == [f"Base: {base.sha[:12]} (requested: trunk)"]
+
+    def test_fallback_lists_notes(self, repo, touch_commit):
+        touch_commit(repo, "f.txt")
+        record_verified(repo)
+        touch_commit(repo, "g.txt")
+        base, notes = resolve_base("origin/main", repo)
+        lines = describe_resolution("origin/main", base, notes)
+        assert lines[0].endswith("(last verified: " + base.ref + ")")
+        assert len(lines) == 1 + len(notes)
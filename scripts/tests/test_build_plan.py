@@ -0,0 +1,72 @@
+"""Tests for build_plan (JSON build plan document)."""
+
+import json
+
+import pytest
+
+from src.build_plan import PlanError, make_plan, plan_work_items, read_plan, runner_os
+
+WORK = [
+    ("jvm", [":libraries:a:jvmTest"]),
+    ("ios", [":libraries:a:iosSimulatorArm64Test"]),
+    ("mingwX64", [":libraries:a:mingwX64Test"]),
+]
+
+
+def _plan():
+    return make_plan(WORK, [":libraries:a"], "origin/main", lambda platform, tasks: 10.0 * len(tasks))
+
+
+class TestRunnerOs:
+    """Tests for runner_os."""
+
+    def test_apple_targets_need_macos(self):
+        assert {runner_os(p) for p in ("ios", "macos", "tvos", "watchos")} == {"macos"}
+
+    def test_others(self):
+        assert runner_os("jvm") == "linux"
+        assert runner_os("android") == "linux"
+        assert runner_os("mingwX64") == "linux"  # Kotlin/Native cross-compiles it
+
+
+class TestMakePlan:
+    """Tests for make_plan."""
+
+    def test_document_fields(self):
+        plan = _plan()
+        assert plan["version"] == 1
+        assert plan["platforms"] == ["ios", "jvm", "mingwX64"]
+        assert plan["runner_os"] == ["linux", "macos"]
+        assert plan["estimated_seconds"] == 30.0
+        assert plan["work_items"][1] == {
+            "platform": "ios",
+            "tasks": [":libraries:a:iosSimulatorArm64Test"],
+            "runner_os": "macos",
+            "estimated_seconds": 10.0,
+        }
+
+    def test_no_apple_work_needs_no_macos(self):
+        plan = make_plan(WORK[:1], [":libraries:a"], "HEAD~1", lambda p, t: 1.0)
+        assert plan["runner_os"] == ["linux"]
+
+
+class TestReadPlan:
+    """Tests for read_plan and plan_work_items."""
+
+    def test_round_trip_and_filter(self, tmp_path):
+        path = tmp_path / "plan.json"
+        path.write_text(json.dumps(_plan()))
+        plan = read_plan(path)
+        assert plan_work_items(plan) == WORK
+        assert plan_work_items(plan, "macos") == [WORK[1]]
+
+    @pytest.mark.parametrize("text", ["not json", "[]", '{"version": 99, "work_items": []}', '{"version": 1}'])
+    def test_invalid(self, tmp_path, text):
+        path = tmp_path / "plan.json"
+        path.write_text(text)
+        with pytest.raises(PlanError):
+            read_plan(path)
+
+    def test_missing_file(self, tmp_path):
+        with pytest.raises(PlanError):
+            read_plan(tmp_path / "missing.json")
@@ -0,0 +1,74 @@
+"""Integration tests for build_platforms.py wiring (change records -> compile tasks)."""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Ensure scripts dir is on path so we can import build_platforms.
+_scripts_dir = Path(__file__).resolve().parent.parent
+if str(_scripts_dir) not in sys.path:
+    sys.path.insert(0, str(_scripts_dir))
+
+from src.file_change import FileChange
+
+
+def _compile(checkout_copy, paths):
+    """Tasks build_platforms.py --dry-run passes to Gradle for worktree changes to paths (None: no run)."""
+    import build_platforms as bp
+    changes = iter([FileChange("modified", p) for p in paths])
+    with patch.object(bp, "changes_or_none", return_value=changes):
+        with patch.object(bp, "get_repo_root", return_value=checkout_copy):
+            with patch.object(bp, "run_gradle", return_value=0) as run_gradle:
+                with patch.object(sys, "argv", ["build_platforms.py", "--dry-run", "--changes", "worktree"]):
+                    assert bp.main() == 0
+    return run_gradle.call_args.args[0] if run_gradle.called else None
+
+
+def test_build_configuration_change_compiles_representative_platform(checkout_copy, capsys):
+    """A root build script change compiles each library's representative platform only (not every target)."""
+    assert _compile(checkout_copy, ["build.gradle.kts"]) == [":libraries:example-library:compileKotlinJvm"]
+    assert "representative platform" in capsys.readouterr().err
+
+
+def test_build_script_targets_are_compiled(checkout_copy):
+    """jsMain compiles the JS target example-library adds in its build script."""
+    assert _compile(checkout_copy, ["libraries/example-library/src/jsMain/kotlin/F.kt"]) == [
+        ":libraries:example-library:compileKotlinJs"
+    ]
+
+
+def test_catalog_note_precedes_nothing_to_build(checkout_copy, capsys):
+    """An unchanged catalog expands to nothing; its note is printed before the outcome."""
+    assert _compile(checkout_copy, ["gradle/libs.versions.toml"]) is None
+    err = capsys.readouterr().err
+    assert err.index("gradle/libs.versions.toml: changed") < err.index("nothing to build")
+
+
+def test_worktree_git_failure_exits_non_zero(checkout_copy, capsys):
+    """A failed git status is reported as an error, not as a clean worktree."""
+    import build_platforms as bp
+    failure = RuntimeError("git status failed (exit 128): not a git repository")
+    with patch.object(bp, "changes_or_none", side_effect=failure):
+        with patch.object(bp, "get_repo_root", return_value=checkout_copy):
+            with patch.object(bp, "run_gradle", return_value=0) as run_gradle:
+                with patch.object(sys, "argv", ["build_platforms.py", "--dry-run", "--changes", "worktree"]):
+                    assert bp.main() == 1
+    assert not run_gradle.called
+    assert "git status failed" in capsys.readouterr().err
+
+
+def test_git_failure_while_streaming_changes_exits_non_zero(checkout_copy, capsys):
+    """git failing after the first change record is an error message, not a traceback."""
+    import build_platforms as bp
+
+    def changes():
+        yield FileChange("modified", "libraries/example-library/src/jvmMain/kotlin/F.kt")
+        raise RuntimeError("git diff failed (exit 128): fatal: bad object")
+
+    with patch.object(bp, "changes_or_none", return_value=changes()):
+        with patch.object(bp, "get_repo_root", return_value=checkout_copy):
+            with patch.object(bp, "run_gradle", return_value=0) as run_gradle:
+                with patch.object(sys, "argv", ["build_platforms.py", "--dry-run", "--changes", "worktree"]):
+                    assert bp.main() == 1
+    assert not run_gradle.called
+    assert "git diff failed" in capsys.readouterr().err
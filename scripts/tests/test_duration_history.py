@@ -0,0 +1,73 @@
+"""Tests for duration_history (SQLite duration store and LPT scheduling)."""
+
+from src.duration_history import (
+    DEFAULT_SECONDS_BY_PLATFORM,
+    DurationHistory,
+    longest_first,
+    predicted_makespan,
+)
+
+
+class TestDurationHistory:
+    """Tests for DurationHistory."""
+
+    def test_default_estimate_scales_with_libraries(self, tmp_path):
+        history = DurationHistory(tmp_path / "h.sqlite")
+        one = history.estimate("ios", [":libraries:a:compileKotlinIosSimulatorArm64"])
+        two = history.estimate("ios", [
+            ":libraries:a:compileKotlinIosSimulatorArm64",
+            ":libraries:b:compileKotlinIosSimulatorArm64",
+        ])
+        assert one == DEFAULT_SECONDS_BY_PLATFORM["ios"]
+        assert two == 2 * one
+
+    def test_estimate_does_not_create_the_database(self, tmp_path):
+        history = DurationHistory(tmp_path / "kmp-scripts" / "h.sqlite")
+        assert history.estimate("jvm", [":libraries:a:jvmTest"]) == DEFAULT_SECONDS_BY_PLATFORM["jvm"]
+        assert not (tmp_path / "kmp-scripts").exists()
+
+    def test_exact_task_set_uses_recent_successful_mean(self, tmp_path):
+        history = DurationHistory(tmp_path / "h.sqlite")
+        tasks = [":libraries:a:jvmTest"]
+        history.record("jvm", tasks, 10.0, 0)
+        history.record("jvm", tasks, 20.0, 0)
+        history.record("jvm", tasks, 500.0, 1)
+        assert history.estimate("jvm", tasks) == 15.0
+
+    def test_other_task_sets_use_per_task_platform_mean(self, tmp_path):
+        history = DurationHistory(tmp_path / "h.sqlite")
+        history.record("jvm", [":libraries:a:jvmTest", ":libraries:b:jvmTest"], 40.0, 0)
+        assert history.estimate("jvm", [":libraries:c:jvmTest"]) == 20.0
+
+    def test_persists_across_instances(self, tmp_path):
+        DurationHistory(tmp_path / "h.sqlite").record("js", [":libraries:a:compileKotlinJs"], 7.0, 0)
+        assert DurationHistory(tmp_path / "h.sqlite").estimate("js", [":libraries:a:compileKotlinJs"]) == 7.0
+
+    def test_unwritable_location_falls_back_to_default(self, tmp_path):
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+        history = DurationHistory(blocker / "h.sqlite")
+        history.record("jvm", [":libraries:a:jvmTest"], 1.0, 0)
+        assert history.estimate("jvm", [":libraries:a:jvmTest"]) == DEFAULT_SECONDS_BY_PLATFORM["jvm"]
+
+
+class TestScheduling:
+    """Tests for longest_first and predicted_makespan."""
+
+    def test_longest_first_orders_by_estimate(self):
+        estimates = {"jvm": 10.0, "ios": 300.0, "js": 90.0}
+        work = [("ios", ["a"]), ("js", ["b"]), ("jvm", ["c"])]
+        assert [n for n, _ in longest_first(work, lambda n, _t: estimates[n])] == ["ios", "js", "jvm"]
+
+    def test_longest_first_ties_keep_name_order(self):
+        work = [("b", []), ("a", [])]
+        assert [n for n, _ in longest_first(work, lambda _n, _t: 1.0)] == ["a", "b"]
+
+    def test_makespan_single_slot_is_sum(self):
+        assert predicted_makespan([3.0, 2.0, 1.0], 1) == 6.0
+
+    def test_makespan_lpt_order(self):
+        assert predicted_makespan([5.0, 4.0, 3.0, 3.0], 2) == 8.0
+
+    def test_makespan_empty(self):
+        assert predicted_makespan([], 3) == 0.0
@@ -0,0 +1,110 @@
+"""Tests for file_watcher (inotify and polling watchers, debounced bursts)."""
+
+import sys
+import threading
+
+import pytest
+
+from src.file_watcher import InotifyWatcher, PollingWatcher, ignored_file, next_burst, skip_dir
+from src.file_change import DELETED, MODIFIED, FileChange
+
+
+def _inotify(roots):
+    try:
+        return InotifyWatcher(roots)
+    except OSError as e:
+        pytest.skip(f"inotify unavailable: {e}")
+
+
+@pytest.fixture(params=["inotify", "polling"])
+def make_watcher(request):
+    if request.param == "inotify" and not sys.platform.startswith("linux"):
+        pytest.skip("inotify is Linux only")
+    if request.param == "inotify":
+        return _inotify
+    return lambda roots: PollingWatcher(roots, interval=0.02)
+
+
+@pytest.fixture
+def tree(tmp_path):
+    src = tmp_path / "libraries" / "core" / "src" / "commonMain"
+    src.mkdir(parents=True)
+    (src / "A.kt").write_text("a\n")
+    return tmp_path
+
+
+def _drain(watcher, rounds=3):
+    changed = set()
+    for _ in range(rounds):
+        changed |= watcher.poll(0.1)
+    return changed
+
+
+class TestWatchers:
+    """Both watchers report the same changes for the same activity."""
+
+    def test_create_modify_delete(self, make_watcher, tree):
+        src = tree / "libraries" / "core" / "src" / "commonMain"
+        with make_watcher([tree / "libraries"]) as watcher:
+            (src / "B.kt").write_text("b\n")
+            (src / "A.kt").unlink()
+            assert _drain(watcher) == {src / "A.kt", src / "B.kt"}
+            assert watcher.poll(0.05) == set()
+
+    def test_new_directory_files_reported_and_watched(self, make_watcher, tree):
+        new = tree / "libraries" / "core" / "src" / "iosMain" / "kotlin"
+        with make_watcher([tree / "libraries"]) as watcher:
+            new.mkdir(parents=True)
+            (new / "I.kt").write_text("i\n")
+            assert new / "I.kt" in _drain(watcher)
+            (new / "I.kt").write_text("changed\n")
+            assert _drain(watcher) == {new / "I.kt"}
+
+    def test_build_dirs_and_scratch_files_ignored(self, make_watcher, tree):
+        lib = tree / "libraries" / "core"
+        (lib / "build").mkdir()
+        with make_watcher([tree / "libraries"]) as watcher:
+            (lib / "build" / "out.class").write_text("x")
+            (lib / "src" / "commonMain" / ".A.kt.swp").write_text("x")
+            (lib / "src" / "commonMain" / "A.kt~").write_text("x")
+            assert _drain(watcher) == set()
+
+
+class TestFilters:
+    """Tests for skip_dir and ignored_file."""
+
+    def test_skip_dir(self):
+        assert skip_dir("build") and skip_dir(".gradle") and skip_dir(".idea")
+        assert not skip_dir("commonMain")
+
+    def test_ignored_file(self):
+        assert ignored_file(".F.kt.swp") and ignored_file("F.kt~") and ignored_file("4913")
+        assert not ignored_file("F.kt")
+
+
+class TestNextBurst:
+    """Tests for next_burst."""
+
+    class Scripted:
+        def __init__(self, batches):
+            self.batches = list(batches)
+
+        def poll(self, timeout):
+            return self.batches.pop(0) if self.batches else set()
+
+    def test_merges_until_quiet_and_marks_deletions(self, tmp_path):
+        (tmp_path / "kept.kt").write_text("k\n")
+        watcher = self.Scripted([set(), {tmp_path / "kept.kt"}, {tmp_path / "gone.kt"}, set(), {tmp_path / "later.kt"}])
+        assert next_burst(watcher, tmp_path, 0.01, threading.Event()) == [
+            FileChange(DELETED, "gone.kt"),
+            FileChange(MODIFIED, "kept.kt"),
+        ]
+
+    def test_paths_outside_repo_dropped(self, tmp_path):
+        watcher = self.Scripted([{tmp_path.parent / "elsewhere.kt"}])
+        assert next_burst(watcher, tmp_path, 0.01, threading.Event()) == []
+
+    def test_returns_none_once_stopped(self, tmp_path):
+        stop = threading.Event()
+        stop.set()
+        assert next_burst(self.Scripted([]), tmp_path, 0.01, stop) is None
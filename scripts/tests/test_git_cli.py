@@ -0,0 +1,21 @@
+"""Tests for git_cli (short git commands, failures as None)."""
+
+import subprocess
+
+from src.git_cli import git_output, run_git
+
+
+class TestGitCli:
+    """Tests for run_git and git_output."""
+
+    def test_output_of_successful_command(self, tmp_path):
+        subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+        assert git_output(tmp_path, "rev-parse", "--is-inside-work-tree") == "true\n"
+
+    def test_failure_is_none(self, tmp_path):
+        assert git_output(tmp_path, "rev-parse", "HEAD") is None
+        assert run_git(tmp_path, "rev-parse", "HEAD").returncode != 0
+
+    def test_missing_directory_is_none(self, tmp_path):
+        assert run_git(tmp_path / "missing", "status") is None
+        assert git_output(tmp_path / "missing", "status") is None
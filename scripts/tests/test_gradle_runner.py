@@ -1,12 +1,13 @@
 """Minimal tests for gradle_runner (run_gradle with dry_run, resolve_library_tasks)."""
 
+import json
 import subprocess
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 
-from src.gradle_runner import run_gradle, resolve_library_tasks
+from src.gradle_runner import TASK_INVENTORY_INIT_SCRIPT, run_gradle, resolve_library_tasks
 
 
 class TestRunGradle:
@@ -21,8 +22,18 @@ class TestRunGradle:
         assert rc == 0
 
 
+def _inventory_run(projects, returncode=0, stderr=""):
+    """Fake subprocess.run that writes the JSON inventory the init script would write."""
+    def fake_run(cmd, **kwargs):
+        output = next(a.split("=", 1)[1] for a in cmd if a.startswith("-Dkmp.inventory.output="))
+        if returncode == 0:
+            Path(output).write_text(json.dumps({"version": 1, "projects": projects}))
+        return subprocess.CompletedProcess(args=cmd, returncode=returncode, stdout="", stderr=stderr)
+    return fake_run
+
+
 class TestResolveLibraryTasks:
-    """Tests for resolve_library_tasks (mocked subprocess)."""
+    """Tests for resolve_library_tasks (mocked subprocess, JSON inventory)."""
 
     def test_empty_task_names_returns_empty(self, tmp_path):
         assert resolve_library_tasks(tmp_path, [":libraries:example-library"], []) == []
@@ -30,17 +41,26 @@ class TestResolveLibraryTasks:
     def test_empty_library_projects_returns_empty(self, tmp_path):
         assert resolve_library_tasks(tmp_path, [], ["jvmTest"]) == []
 
-    def test_filters_by_library_prefix_and_task_name(self, tmp_path):
-        output = """
-:libraries:example-library:jvmTest - Run unit tests
-:libraries:example-library:build - Build
-:samples:example-library:jvmTest - Run sample tests
-:libraries:other-lib:jvmTest - Run unit tests
-        """
-        with patch("src.gradle_runner.subprocess.run") as m:
-            m.return_value = subprocess.CompletedProcess(
-                args=[], returncode=0, stdout=output, stderr=""
-            )
+    def test_init_script_exists(self):
+        assert TASK_INVENTORY_INIT_SCRIPT.is_file()
+
+    def test_command_uses_init_script_and_requested_projects(self, tmp_path):
+        fake = _inventory_run({":libraries:example-library": ["jvmTest"]})
+        with patch("src.gradle_runner.subprocess.run", side_effect=fake) as m:
+            resolve_library_tasks(tmp_path, [":libraries:example-library"], ["testAndroid", "jvmTest"])
+        cmd = m.call_args.args[0]
+        assert "--configure-on-demand" in cmd
+        assert str(TASK_INVENTORY_INIT_SCRIPT) in cmd
+        assert "-Dkmp.inventory.tasks=jvmTest,testAndroid" in cmd
+        assert ":libraries:example-library:help" in cmd
+        assert "tasks" not in cmd
+
+    def test_filters_by_library_and_task_name(self, tmp_path):
+        fake = _inventory_run({
+            ":libraries:example-library": ["jvmTest", "build"],
+            ":libraries:other-lib": ["jvmTest"],
+        })
+        with patch("src.gradle_runner.subprocess.run", side_effect=fake):
             result = resolve_library_tasks(
                 tmp_path,
                 [":libraries:example-library"],
@@ -49,15 +69,8 @@ class TestResolveLibraryTasks:
         assert result == [":libraries:example-library:jvmTest"]
 
     def test_returns_multiple_matching_tasks(self, tmp_path):
-        output = """
-:libraries:example-library:jvmTest - Run
-:libraries:example-library:testAndroid - Run
-:libraries:example-library:build - Build
-        """
-        with patch("src.gradle_runner.subprocess.run") as m:
-            m.return_value = subprocess.CompletedProcess(
-                args=[], returncode=0, stdout=output, stderr=""
-            )
+        fake = _inventory_run({":libraries:example-library": ["jvmTest", "testAndroid", "jvmTest"]})
+        with patch("src.gradle_runner.subprocess.run", side_effect=fake):
             result = resolve_library_tasks(
                 tmp_path,
                 [":libraries:example-library"],
@@ -69,10 +82,8 @@ class TestResolveLibraryTasks:
         ]
 
     def test_raises_on_nonzero_exit_code(self, tmp_path):
-        with patch("src.gradle_runner.subprocess.run") as m:
-            m.return_value = subprocess.CompletedProcess(
-                args=[], returncode=1, stdout="", stderr="No JDK found"
-            )
+        fake = _inventory_run({}, returncode=1, stderr="No JDK found")
+        with patch("src.gradle_runner.subprocess.run", side_effect=fake):
             with pytest.raises(RuntimeError) as exc_info:
                 resolve_library_tasks(
                     tmp_path,
@@ -82,20 +93,8 @@ class TestResolveLibraryTasks:
         assert "exit 1" in str(exc_info.value)
         assert "No JDK found" in str(exc_info.value)
 
-    def test_ignores_malformed_lines(self, tmp_path):
-        output = """
-:libraries:example-library:jvmTest - Run
-no dash here
-:lib:short - Skip
-:libraries:example-library:jvmTest - Duplicate
-        """
+    def test_raises_when_inventory_missing(self, tmp_path):
         with patch("src.gradle_runner.subprocess.run") as m:
-            m.return_value = subprocess.CompletedProcess(
-                args=[], returncode=0, stdout=output, stderr=""
-            )
-            result = resolve_library_tasks(
-                tmp_path,
-                [":libraries:example-library"],
-                ["jvmTest"],
-            )
-        assert result == [":libraries:example-library:jvmTest"]
+            m.return_value = subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr="")
+            with pytest.raises(RuntimeError):
+                resolve_library_tasks(tmp_path, [":libraries:example-library"], ["jvmTest"])
@@ -0,0 +1,69 @@
+"""Tests for host_capabilities (host model and routing of work items to capable hosts)."""
+
+import pytest
+
+from src.host_capabilities import (
+    DeferredItem,
+    HostCapabilities,
+    annotate_plan,
+    deferral_reason,
+    describe_deferred,
+    detect_host,
+    split_work,
+)
+
+LINUX = HostCapabilities("linux", "x64")
+MAC = HostCapabilities("macos", "arm64", xcode=True)
+MAC_WITHOUT_XCODE = HostCapabilities("macos", "arm64", xcode=False)
+WINDOWS = HostCapabilities("windows", "x64")
+
+
+class TestDeferralReason:
+    """Tests for deferral_reason."""
+
+    @pytest.mark.parametrize("platform", ["jvm", "android", "js", "linuxX64", "mingwX64", "detekt", "all"])
+    def test_linux_runner_work_runs_anywhere(self, platform):
+        for host in (LINUX, MAC_WITHOUT_XCODE, WINDOWS):
+            assert deferral_reason(platform, host) is None
+
+    @pytest.mark.parametrize("platform", ["ios", "macos", "tvos", "watchos"])
+    def test_apple_targets_need_macos_with_xcode(self, platform):
+        assert deferral_reason(platform, LINUX) == "needs a macOS host"
+        assert deferral_reason(platform, MAC_WITHOUT_XCODE).startswith("needs Xcode")
+        assert deferral_reason(platform, MAC) is None
+
+
+class TestSplitWork:
+    """Tests for split_work, describe_deferred and annotate_plan."""
+
+    WORK = [("ios", [":a:compileKotlinIosSimulatorArm64"]), ("jvm", [":a:jvmTest"]), ("mingwX64", [":a:m"])]
+
+    def test_split_keeps_order(self):
+        runnable, deferred = split_work(self.WORK, LINUX)
+        assert runnable == [("jvm", [":a:jvmTest"]), ("mingwX64", [":a:m"])]
+        assert [d.platform for d in deferred] == ["ios"]
+
+    def test_describe(self):
+        lines = describe_deferred([DeferredItem("ios", [":a:t"], "needs a macOS host")], LINUX)
+        assert lines == [
+            "Deferred to a capable host (this host: linux-x64):",
+            "  [deferred] ios: needs a macOS host: :a:t",
+        ]
+        assert describe_deferred([], LINUX) == []
+
+    def test_annotate_plan(self):
+        plan = {"work_items": [{"platform": p, "tasks": t} for p, t in self.WORK]}
+        annotate_plan(plan, LINUX)
+        assert plan["host"] == {"os": "linux", "arch": "x64", "xcode": False}
+        assert [i["deferred_reason"] for i in plan["work_items"]] == ["needs a macOS host", None, None]
+
+
+class TestDetectHost:
+    """Tests for detect_host."""
+
+    def test_describes_this_machine(self):
+        host = detect_host()
+        assert host.os in ("linux", "macos", "windows")
+        assert host.arch
+        assert host.xcode is False or host.os == "macos"
+        assert host.describe().startswith(f"{host.os}-{host.arch}")
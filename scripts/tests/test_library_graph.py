@@ -0,0 +1,92 @@
+"""Tests for library_graph (static inter-library dependency graph)."""
+
+from src.library_graph import (
+    build_dependency_graph,
+    dependents_closure,
+    parse_library_dependencies,
+    propagate_to_dependents,
+)
+from src.script_cache import cache_dir
+
+
+class TestParseLibraryDependencies:
+    """Tests for parse_library_dependencies."""
+
+    def test_project_call(self):
+        script = 'dependencies { implementation(project(":libraries:core")) }'
+        assert parse_library_dependencies(script, set()) == {":libraries:core"}
+
+    def test_project_call_with_named_path(self):
+        script = 'api(project(path = ":libraries:core"))'
+        assert parse_library_dependencies(script, set()) == {":libraries:core"}
+
+    def test_type_safe_accessor(self):
+        script = "commonMain.dependencies { api(projects.libraries.exampleLibrary) }"
+        assert parse_library_dependencies(script, {"example-library"}) == {":libraries:example-library"}
+
+    def test_ignores_comments_and_non_library_projects(self):
+        script = """
+            // implementation(project(":libraries:old"))
+            /* api(project(":libraries:older")) */
+            implementation(project(":samples:demo"))
+        """
+        assert parse_library_dependencies(script, set()) == set()
+
+
+class TestBuildDependencyGraph:
+    """Tests for build_dependency_graph."""
+
+    def test_empty_without_libraries_dir(self, tmp_path):
+        assert build_dependency_graph(tmp_path) == {}
+
+    def test_builds_graph_and_drops_self_references(self, tmp_path, make_library):
+        make_library(tmp_path, "core")
+        make_library(tmp_path, "net", 'implementation(project(":libraries:core"))')
+        make_library(tmp_path, "app", 'api(projects.libraries.net)\nimplementation(project(":libraries:app"))')
+        assert build_dependency_graph(tmp_path) == {
+            ":libraries:core": set(),
+            ":libraries:net": {":libraries:core"},
+            ":libraries:app": {":libraries:net"},
+        }
+
+    def test_cache_reused_until_build_file_changes(self, tmp_path, make_library):
+        make_library(tmp_path, "core")
+        make_library(tmp_path, "net", 'implementation(project(":libraries:core"))')
+        assert build_dependency_graph(tmp_path)[":libraries:net"] == {":libraries:core"}
+        assert (cache_dir(tmp_path) / "library-graph.json").exists()
+
+        (tmp_path / "libraries" / "net" / "build.gradle.kts").write_text("")
+        assert build_dependency_graph(tmp_path)[":libraries:net"] == set()
+
+
+class TestDependentsClosure:
+    """Tests for dependents_closure and propagate_to_dependents."""
+
+    GRAPH = {
+        ":libraries:core": set(),
+        ":libraries:net": {":libraries:core"},
+        ":libraries:app": {":libraries:net"},
+        ":libraries:other": set(),
+    }
+
+    def test_includes_transitive_dependents_only(self):
+        assert dependents_closure(self.GRAPH, {":libraries:core"}) == {
+            ":libraries:core", ":libraries:net", ":libraries:app"
+        }
+
+    def test_leaf_has_no_dependents(self):
+        assert dependents_closure(self.GRAPH, {":libraries:app"}) == {":libraries:app"}
+
+    def test_empty_changed_set(self):
+        assert dependents_closure(self.GRAPH, set()) == set()
+
+    def test_propagate_copies_platforms_to_dependents(self):
+        result = propagate_to_dependents(self.GRAPH, {":libraries:net": {"ios"}, ":libraries:other": {"jvm"}})
+        assert result == {
+            ":libraries:net": {"ios"},
+            ":libraries:app": {"ios"},
+            ":libraries:other": {"jvm"},
+        }
+
+    def test_propagate_skips_libraries_without_platforms(self):
+        assert propagate_to_dependents(self.GRAPH, {":libraries:core": set()}) == {":libraries:core": set()}
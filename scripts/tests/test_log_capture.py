@@ -0,0 +1,119 @@
+"""Tests for log_capture (bounded per-platform capture of parallel Gradle output)."""
+
+import asyncio
+import gzip
+import io
+import os
+
+import pytest
+
+from src.async_runner import run_parallel_gradle_async
+from src.log_capture import LogCapture
+from src.parallel_runner import run_parallel_gradle
+
+# Fake gradlew: the last argument is "<mode>-<lines>"; prints that many numbered
+# lines on stdout and one on stderr, then exits 0 (ok) or 2 (fail).
+FAKE_GRADLEW = """#!/bin/sh
+for last; do :; done
+mode="${last%-*}"
+count="${last#*-}"
+i=1
+while [ "$i" -le "$count" ]; do echo "$mode line $i"; i=$((i+1)); done
+echo "$mode stderr" >&2
+[ "$mode" = ok ] && exit 0
+exit 2
+"""
+
+
+@pytest.fixture
+def fake_root(tmp_path):
+    gradlew = tmp_path / "gradlew"
+    gradlew.write_text(FAKE_GRADLEW)
+    gradlew.chmod(0o755)
+    return tmp_path
+
+
+def _capture(tmp_path, **kwargs) -> tuple[LogCapture, io.StringIO]:
+    stream = io.StringIO()
+    return LogCapture(tmp_path / "logs", stream=stream, live=False, **kwargs), stream
+
+
+class TestLogCapture:
+    """Tests for LogCapture."""
+
+    def test_tail_is_bounded_and_spill_has_everything(self, tmp_path):
+        logs, _ = _capture(tmp_path, tail_lines=3)
+        logs.start("jvm")
+        for i in range(10):
+            logs.feed("jvm", f"line {i}\n".encode())
+        logs.finish("jvm", 0)
+        assert logs.tail("jvm") == ["line 7", "line 8", "line 9"]
+        with gzip.open(logs.log_path("jvm"), "rt") as f:
+            assert f.read().splitlines() == [f"line {i}" for i in range(10)]
+
+    def test_lines_split_across_chunks_are_joined(self, tmp_path):
+        logs, _ = _capture(tmp_path)
+        logs.start("js")
+        for chunk in (b"> Task :a", b"\r\n> Task", b" :b\nno newline"):
+            logs.feed("js", chunk)
+        logs.finish("js", 1)
+        assert logs.tail("js") == ["> Task :a", "> Task :b", "no newline"]
+
+    def test_status_lines_without_terminal(self, tmp_path):
+        logs, stream = _capture(tmp_path)
+        logs.start("jvm")
+        logs.start("ios")
+        logs.feed("jvm", b"noise\n")
+        logs.finish("ios", 1)
+        logs.finish("jvm", 143, cancelled=True)
+        lines = stream.getvalue().splitlines()
+        assert lines[:2] == ["[start] jvm", "[start] ios"]
+        assert lines[2].startswith("[FAIL] ios exit 1")
+        assert lines[3] == "[cancelled] jvm"
+        assert "noise" not in stream.getvalue()
+
+    def test_print_failures_only_dumps_failed_platforms(self, tmp_path):
+        logs, _ = _capture(tmp_path)
+        for platform, code in (("jvm", 0), ("ios", 1), ("js", 143)):
+            logs.start(platform)
+            logs.feed(platform, f"{platform} output\n".encode())
+            logs.finish(platform, code, cancelled=platform == "js")
+        out = io.StringIO()
+        logs.print_failures(out)
+        assert logs.failed_platforms() == ["ios"]
+        assert "ios output" in out.getvalue()
+        assert "jvm output" not in out.getvalue() and "js output" not in out.getvalue()
+
+    def test_live_mode_redraws_block_in_place(self, tmp_path):
+        stream = io.StringIO()
+        logs = LogCapture(tmp_path / "logs", stream=stream, live=True)
+        logs.start("jvm")
+        logs.start("ios")
+        assert "\x1b[1F" in stream.getvalue()
+
+
+@pytest.mark.skipif(os.name == "nt", reason="fake gradlew is a POSIX shell script")
+class TestRunnersWithCapture:
+    """Both runners pipe output into LogCapture instead of the terminal."""
+
+    def test_thread_runner_captures_output(self, fake_root, tmp_path):
+        logs, _ = _capture(tmp_path, tail_lines=5)
+        code, failed = run_parallel_gradle(
+            [("jvm", ["ok-20"]), ("ios", ["fail-3"])], fake_root, max_concurrency=1, logs=logs
+        )
+        assert (code, failed) == (2, "ios")
+        assert logs.tail("jvm")[-1] == "ok stderr"
+        assert len(logs.tail("jvm")) == 5
+        assert logs.failed_platforms() == ["ios"]
+        with gzip.open(logs.log_path("jvm"), "rt") as f:
+            assert f.read().count("ok line") == 20
+
+    def test_async_runner_captures_output(self, fake_root, tmp_path):
+        logs, _ = _capture(tmp_path)
+        code, failed = asyncio.run(run_parallel_gradle_async(
+            [("jvm", ["ok-2"]), ("js", ["ok-1"])], fake_root, max_concurrency=2, logs=logs
+        ))
+        assert (code, failed) == (0, None)
+        assert logs.tail("jvm") == ["ok line 1", "ok line 2", "ok stderr"]
+        assert logs.tail("js") == ["ok line 1", "ok stderr"]
+        assert logs.failed_platforms() == []
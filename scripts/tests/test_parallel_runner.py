@@ -104,3 +104,144 @@ class TestRunParallelGradle:
         )
         assert code == 0
         assert failed_platform is None
+
+
+class TestAdmission:
+    """Tests for run_parallel_gradle with an AdmissionController (fake Gradle runs)."""
+
+    def test_admission_limits_running_processes(self, tmp_path):
+        from src.admission import AdmissionController
+
+        lock = threading.Lock()
+        current = 0
+        max_seen = [0]
+
+        def fake_run(tasks, cwd, register_process=None):
+            nonlocal current
+            with lock:
+                current += 1
+                max_seen[0] = max(max_seen[0], current)
+            time.sleep(0.05)
+            with lock:
+                current -= 1
+            return (True, 0)
+
+        admission = AdmissionController(1, read_memory=lambda: None, read_load=lambda: None)
+        work = [("p1", ["a"]), ("p2", ["b"]), ("p3", ["c"])]
+        with patch.object(parallel_runner, "run_single_gradle", fake_run):
+            code, failed = run_parallel_gradle(work, tmp_path, max_concurrency=3, admission=admission)
+        assert (code, failed) == (0, None)
+        assert max_seen[0] == 1
+
+    def test_failure_aborts_waiting_items(self, tmp_path):
+        from src.admission import AdmissionController
+
+        started = []
+
+        def fake_run(tasks, cwd, register_process=None):
+            started.append(tasks[0])
+            return (False, 2)
+
+        admission = AdmissionController(1, read_memory=lambda: None, read_load=lambda: None)
+        work = [("p1", ["a"]), ("p2", ["b"]), ("p3", ["c"])]
+        with patch.object(parallel_runner, "run_single_gradle", fake_run):
+            code, failed = run_parallel_gradle(work, tmp_path, max_concurrency=3, admission=admission)
+        assert code == 2
+        assert failed is not None
+        assert len(started) == 1
+
+
+class TestHistory:
+    """Tests for run_parallel_gradle with a DurationHistory (fake Gradle runs)."""
+
+    def test_starts_longest_first_and_records(self, tmp_path):
+        from src.duration_history import DurationHistory
+
+        history = DurationHistory(tmp_path / "h.sqlite")
+        history.record("jvm", ["j"], 1.0, 0)
+        history.record("ios", ["i"], 100.0, 0)
+        started = []
+
+        def fake_run(tasks, cwd, register_process=None):
+            started.append(tasks[0])
+            return (True, 0)
+
+        work = [("ios", ["i"]), ("jvm", ["j"])]
+        work.reverse()
+        with patch.object(parallel_runner, "run_single_gradle", fake_run):
+            run_parallel_gradle(work, tmp_path, max_concurrency=1, history=history)
+        assert started == ["i", "j"]
+        assert history.estimate("ios", ["i"]) < 100.0
+
+    def test_dry_run_prints_predicted_makespan(self, tmp_path, capsys):
+        from src.duration_history import DurationHistory
+
+        history = DurationHistory(tmp_path / "h.sqlite")
+        history.record("jvm", ["j"], 10.0, 0)
+        history.record("js", ["k"], 30.0, 0)
+        run_parallel_gradle([("jvm", ["j"]), ("js", ["k"])], tmp_path, max_concurrency=2, dry_run=True, history=history)
+        out = capsys.readouterr().out
+        assert "predicted makespan: 30s" in out
+        assert out.index("would run js") < out.index("would run jvm")
+
+
+class TestSlots:
+    """Tests for run_parallel_gradle with a SlotPool (fake Gradle runs)."""
+
+    def test_each_run_uses_a_slot(self, tmp_path):
+        from src.slots import SlotPool
+
+        seen = []
+
+        def fake_run(tasks, cwd, register_process=None, extra_args=None):
+            seen.append((tasks[0], cwd, tuple(extra_args or [])))
+            return (True, 0)
+
+        work = [("p1", ["a"]), ("p2", ["b"])]
+        with SlotPool(tmp_path, 2, "cache") as slots:
+            with patch.object(parallel_runner, "run_single_gradle", fake_run):
+                code, _ = run_parallel_gradle(work, tmp_path, max_concurrency=2, slots=slots)
+        assert code == 0
+        assert all(args[0] == "--project-cache-dir" for _t, _c, args in seen)
+
+
+class TestKeepGoing:
+    """Tests for run_parallel_gradle with keep_going and results (fake Gradle runs)."""
+
+    def test_runs_everything_and_reports_all_failures(self, tmp_path):
+        from src.parallel_runner import RunResult, format_failure_summary, result_summary
+
+        codes = {"a": 2, "b": 0, "c": 5}
+        started = []
+
+        def fake_run(tasks, cwd, register_process=None):
+            started.append(tasks[0])
+            return (codes[tasks[0]] == 0, codes[tasks[0]])
+
+        results: list[RunResult] = []
+        work = [("p1", ["a"]), ("p2", ["b"]), ("p3", ["c"])]
+        with patch.object(parallel_runner, "run_single_gradle", fake_run):
+            code, failed = run_parallel_gradle(
+                work, tmp_path, max_concurrency=1, keep_going=True, results=results
+            )
+        assert (code, failed) == (2, "p1")
+        assert started == ["a", "b", "c"]
+        failures = result_summary(results)["failures"]
+        assert [(f["platform"], f["exit_code"]) for f in failures] == [("p1", 2), ("p3", 5)]
+        assert "2 of 3 platform run(s) failed" in format_failure_summary(results)
+
+    def test_fail_fast_still_default(self, tmp_path):
+        started = []
+
+        def fake_run(tasks, cwd, register_process=None):
+            started.append(tasks[0])
+            return (False, 1)
+
+        with patch.object(parallel_runner, "run_single_gradle", fake_run):
+            run_parallel_gradle([("p1", ["a"]), ("p2", ["b"])], tmp_path, max_concurrency=1)
+        assert started == ["a"]
+
+    def test_no_failures_formats_empty(self):
+        from src.parallel_runner import RunResult, format_failure_summary
+
+        assert format_failure_summary([RunResult("jvm", 0, 1.0, None)]) == ""
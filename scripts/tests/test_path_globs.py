@@ -0,0 +1,59 @@
+"""Tests for path_globs (glob matching and precedence without the planner)."""
+
+import re
+
+import pytest
+
+from src.path_globs import BUILD, RULE, SKIP, UNWATCHED, PathMatcher, glob_to_regex
+
+
+class TestGlobToRegex:
+    """Tests for glob_to_regex."""
+
+    @pytest.mark.parametrize("glob,path", [
+        ("**/*.md", "README.md"),
+        ("**/*.md", "libraries/core/README.md"),
+        ("docs/**", "docs/a/b.md"),
+        ("LICENSE*", "LICENSE.md"),
+        ("libraries/*/api/**", "libraries/core/api/core.api"),
+        ("build.gradle.kts", "build.gradle.kts"),
+        ("file?.txt", "file1.txt"),
+    ])
+    def test_matches(self, glob, path):
+        assert re.fullmatch(glob_to_regex(glob), path)
+
+    @pytest.mark.parametrize("glob,path", [
+        ("*.md", "docs/a.md"),
+        ("docs/**", "mkdocs/a.md"),
+        ("libraries/*/api/**", "libraries/core/src/api/x.kt"),
+        ("build.gradle.kts", "libraries/core/build.gradle.kts"),
+        ("build.gradle.kts", "buildXgradle.kts"),
+    ])
+    def test_no_match(self, glob, path):
+        assert not re.fullmatch(glob_to_regex(glob), path)
+
+
+class TestPathMatcher:
+    """Tests for PathMatcher.from_config on raw (unvalidated) project.yml entries."""
+
+    CONFIG = {
+        "ci": {
+            "skip_paths": ["**/*.md"],
+            "watch_paths": ["libraries/**"],
+            "path_rules": [{"paths": "bom/**", "tasks": [":bom:build"]}, {"paths": ["libraries/*/api/**"], "skip": True}],
+        }
+    }
+
+    def test_classify(self):
+        matcher = PathMatcher.from_config(self.CONFIG)
+        assert matcher.classify("bom/build.gradle.kts") == (RULE, self.CONFIG["ci"]["path_rules"][0])
+        assert matcher.classify("libraries/core/api/core.api")[0] == SKIP
+        assert matcher.classify("libraries/core/README.md")[0] == SKIP
+        assert matcher.classify("libraries/core/src/A.kt")[0] == BUILD
+        assert matcher.classify("scripts/x.py")[0] == UNWATCHED
+
+    def test_needs_build(self):
+        matcher = PathMatcher.from_config(self.CONFIG)
+        assert not matcher.needs_build(["README.md", "scripts/x.py", "libraries/core/api/core.api"])
+        assert matcher.needs_build(["README.md", "bom/x"])
+        assert PathMatcher.from_config({}).needs_build(["scripts/x.py"])
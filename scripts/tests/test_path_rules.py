@@ -0,0 +1,79 @@
+"""Tests for path_rules (project.yml path rules, skip_paths and watch_paths)."""
+
+import pytest
+
+from src.path_globs import BUILD, RULE, SKIP, UNWATCHED
+from src.path_rules import PathRules, RuleEffects, load_path_rules
+
+CONFIG = {
+    "ci": {
+        "skip_paths": ["**/*.md", "docs/**", "LICENSE*"],
+        "watch_paths": ["libraries/**", "gradle/**", "build.gradle.kts"],
+        "path_rules": [
+            {"paths": ["kotlin-js-store/**"], "platforms": ["js", "WASMJS"]},
+            {"name": "bom", "paths": "bom/**", "tasks": [":bom:build"]},
+            {"paths": ["libraries/*/api/**"], "skip": True},
+        ],
+    }
+}
+
+
+class TestPathRules:
+    """Tests for PathRules.classify and build_paths."""
+
+    def test_precedence(self):
+        rules = PathRules.from_config(CONFIG)
+        assert rules.classify("libraries/core/src/commonMain/A.kt").kind == BUILD
+        assert rules.classify("libraries/core/README.md").kind == SKIP  # skip before watch
+        assert rules.classify("libraries/core/api/core.api").kind == SKIP  # rule before watch
+        assert rules.classify("kotlin-js-store/yarn.lock").kind == RULE
+        assert rules.classify("scripts/test_platforms.py").kind == UNWATCHED
+
+    def test_without_watch_paths_everything_builds(self):
+        rules = PathRules.from_config({"ci": {"skip_paths": ["docs/**"]}})
+        assert rules.classify("scripts/x.py").kind == BUILD
+        assert rules.classify("docs/a.md").kind == SKIP
+        assert PathRules().classify("anything").kind == BUILD
+
+    def test_build_paths_collects_effects(self):
+        rules = PathRules.from_config(CONFIG)
+        effects = RuleEffects()
+        paths = ["README.md", "kotlin-js-store/yarn.lock", "bom/build.gradle.kts", "gradle/libs.versions.toml"]
+        assert list(rules.build_paths(paths, effects)) == ["gradle/libs.versions.toml"]
+        assert effects.platforms == {"js", "wasmJs"}
+        assert effects.work_items() == [("bom", [":bom:build"])]
+
+    def test_needs_build(self):
+        rules = PathRules.from_config(CONFIG)
+        assert not rules.needs_build(["README.md", "scripts/x.py"])
+        assert rules.needs_build(["README.md", "bom/build.gradle.kts"])
+
+
+class TestFromConfig:
+    """Malformed ci.path_rules entries raise ValueError."""
+
+    @pytest.mark.parametrize("rule,message", [
+        ({"platforms": ["js"]}, "'paths'"),
+        ({"paths": ["x/**"], "platforms": ["beos"]}, "unknown platform"),
+        ({"paths": ["x/**"]}, "needs 'platforms'"),
+        ("x/**", "expected a mapping"),
+    ])
+    def test_invalid_rule(self, rule, message):
+        with pytest.raises(ValueError, match=message):
+            PathRules.from_config({"ci": {"path_rules": [rule]}})
+
+
+class TestLoadPathRules:
+    """Tests for load_path_rules."""
+
+    def test_missing_file_builds_everything(self, tmp_path):
+        rules, notes = load_path_rules(tmp_path)
+        assert rules.classify("scripts/x.py").kind == BUILD
+        assert notes == []
+
+    def test_reads_project_yml(self, tmp_path):
+        pytest.importorskip("yaml")
+        (tmp_path / "project.yml").write_text("ci:\n  watch_paths: ['libraries/**']\n")
+        rules, notes = load_path_rules(tmp_path)
+        assert rules.classify("scripts/x.py").kind == UNWATCHED
+        assert notes == []
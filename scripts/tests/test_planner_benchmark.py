@@ -0,0 +1,71 @@
+"""Tests for the planner benchmark suite (synthetic repo generator and regression gate).
+
+The benchmark itself runs only with KMP_PLANNER_BENCHMARK=1, since timings are noisy on
+shared machines; the generator and gate logic are always tested.
+"""
+
+import json
+import os
+
+import pytest
+
+from src.touched_files import get_touched_files
+from tests.benchmarks.bench_planner import (
+    BASELINE_PATH,
+    DEFAULT_LIBRARIES,
+    regressions,
+    run_benchmark,
+    to_baseline,
+)
+from tests.benchmarks.synthetic_repo import SOURCE_SETS, apply_diff, changed_paths, generate_repo
+
+
+class TestSyntheticRepo:
+    """Tests for the synthetic repo generator."""
+
+    def test_changed_paths_cover_every_source_set(self):
+        paths = changed_paths(10, 500)
+        assert len(set(paths)) == 500
+        assert {p.split("/")[3] for p in paths if p.startswith("libraries/")} == set(SOURCE_SETS)
+
+    def test_changed_paths_are_deterministic(self):
+        assert changed_paths(5, 50, seed=3) == changed_paths(5, 50, seed=3)
+
+    def test_generated_diff_is_seen_by_get_touched_files(self, tmp_path):
+        base = generate_repo(tmp_path, 2)
+        paths = changed_paths(2, 20)
+        apply_diff(tmp_path, paths, base=base)
+        assert sorted(get_touched_files(base, repo_root=tmp_path)) == sorted(paths)
+
+
+class TestRegressionGate:
+    """Tests for regressions()."""
+
+    @staticmethod
+    def _report(classify_s: float, peak_kib: float) -> dict:
+        return {
+            "calibration_s": 0.1,
+            "libraries": 1,
+            "sizes": {"1000": {"stages": {"classify": classify_s}, "peak_kib": peak_kib}},
+        }
+
+    def test_within_tolerance(self):
+        baseline = to_baseline(self._report(0.010, 1000))
+        assert regressions(self._report(0.014, 1200), baseline) == []
+
+    def test_slower_and_larger_are_reported(self):
+        baseline = to_baseline(self._report(0.010, 1000))
+        problems = regressions(self._report(0.020, 2000), baseline)
+        assert len(problems) == 2
+        assert "classify" in problems[0]
+
+    def test_noise_floor(self):
+        baseline = to_baseline(self._report(0.0001, 10))
+        assert regressions(self._report(0.001, 100), baseline) == []
+
+
+@pytest.mark.skipif(os.environ.get("KMP_PLANNER_BENCHMARK") != "1", reason="set KMP_PLANNER_BENCHMARK=1")
+def test_planner_has_not_regressed():
+    baseline = json.loads(BASELINE_PATH.read_text())
+    report = run_benchmark([10, 1_000, 100_000], DEFAULT_LIBRARIES, repeat=3, git_max_paths=0)
+    assert regressions(report, baseline) == []
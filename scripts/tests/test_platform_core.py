@@ -7,16 +7,31 @@ Run from repo root: PYTHONPATH=scripts pytest scripts/tests/test_platform_core.p
 
 import pytest
 from src.platform_core import (
+    KNOWN_PLATFORMS,
+    SRC_SET_PATTERNS,
+    build_logic_rule,
+    cheapest_platform,
+    classify_paths,
     get_library_project_paths,
     gradle_compile_tasks,
+    gradle_compile_tasks_by_library,
     gradle_test_tasks,
+    gradle_test_tasks_by_library,
     gradle_test_tasks_by_platform,
     is_test_path,
+    library_for_path,
     normalize_platforms,
+    planning_paths,
+    platforms_by_library,
     platforms_for_changed_files,
     platforms_for_path,
+    representative_platform,
+    restrict_to_declared,
     scope_tasks_to_libraries,
 )
+from src.duration_history import DEFAULT_SECONDS_BY_PLATFORM as COSTS
+from src.file_change import FileChange
+from tests.benchmarks.bench_classifier import loop_platforms_for_path, sample_paths
 
 
 class TestPlatformsForPath:
@@ -149,6 +164,61 @@ class TestPlatformsForPath:
         assert platforms_for_path("libraries/foo/src/commonMain/kotlin/Foo.kt") == {"jvm"}
 
 
+class TestCompiledClassifier:
+    """The compiled classifier must match the per-pattern loop exactly."""
+
+    @pytest.mark.parametrize("pattern,_plats", SRC_SET_PATTERNS)
+    def test_every_source_set_matches_loop(self, pattern, _plats):
+        path = f"libraries/foo{pattern.pattern}kotlin/X.kt"
+        assert platforms_for_path(path) == loop_platforms_for_path(path)
+
+    @pytest.mark.parametrize("path", [
+        "libraries/foo/src/commonMain/src/iosMain/X.kt",
+        "libraries/x/src/src/jvmMain/X.kt",
+        "/src/jvmMain/X.kt",
+        "src/jvmMain/X.kt",
+        "libraries/foo/src/commonMain",
+        "libraries/foo/src/unknownMain/X.kt",
+        "libraries/foo/src/jvmMain/build.gradle.kts",
+        "docs/gradle/notes.md",
+        "libraries/foo/gradle.properties.bak",
+        "libraries/foo/src/\nweird/jvmMain/X.kt",
+    ])
+    def test_edge_cases_match_loop(self, path):
+        assert platforms_for_path(path) == loop_platforms_for_path(path)
+
+    def test_sampled_paths_match_loop(self):
+        for path in sample_paths(2_000):
+            assert platforms_for_path(path) == loop_platforms_for_path(path), path
+
+    def test_returns_fresh_set(self):
+        first = platforms_for_path("libraries/foo/src/jvmMain/X.kt")
+        first.add("mutated")
+        assert platforms_for_path("libraries/foo/src/jvmMain/X.kt") == {"jvm"}
+
+
+class TestClassifyPaths:
+    """Tests for the batch classify_paths API."""
+
+    def test_yields_platforms_and_test_flag(self):
+        result = list(classify_paths([
+            "libraries/a/src/commonMain/kotlin/X.kt",
+            "libraries/a/src/iosTest/kotlin/XTest.kt",
+            "build.gradle.kts",
+            "README.md",
+        ]))
+        assert result == [
+            ("libraries/a/src/commonMain/kotlin/X.kt", {"jvm"}, False),
+            ("libraries/a/src/iosTest/kotlin/XTest.kt", {"ios"}, True),
+            ("build.gradle.kts", None, False),
+            ("README.md", set(), False),
+        ]
+
+    def test_accepts_generator(self):
+        paths = (f"libraries/a/src/jsMain/F{i}.kt" for i in range(3))
+        assert [plats for _p, plats, _t in classify_paths(paths)] == [{"js"}] * 3
+
+
 class TestIsTestPath:
     """Tests for test vs main path detection."""
 
@@ -200,6 +270,108 @@ class TestPlatformsForChangedFiles:
         ]) == ({"jvm"}, {"jvm"})
 
 
+class TestPlatformsByLibrary:
+    """Tests for per-library (main_platforms, test_platforms) impact."""
+
+    def test_library_for_path(self):
+        assert library_for_path("libraries/core/src/commonMain/X.kt") == ":libraries:core"
+        assert library_for_path("samples/core/src/commonMain/X.kt") is None
+        assert library_for_path("libraries/README.md") is None
+
+    def test_empty_list_returns_empty_map(self):
+        assert platforms_by_library([]) == {}
+
+    def test_splits_platforms_per_library(self):
+        assert platforms_by_library([
+            "libraries/a/src/commonMain/kotlin/X.kt",
+            "libraries/b/src/iosTest/kotlin/XTest.kt",
+        ]) == {":libraries:a": ({"jvm"}, set()), ":libraries:b": (set(), {"ios"})}
+
+    def test_library_build_script_marks_only_that_library(self):
+        assert platforms_by_library([
+            "libraries/a/src/commonMain/kotlin/X.kt",
+            "libraries/a/build.gradle.kts",
+            "libraries/b/src/jsMain/kotlin/X.kt",
+            "libraries/a/src/iosMain/kotlin/X.kt",
+        ]) == {":libraries:a": None, ":libraries:b": ({"js"}, set())}
+
+    def test_root_full_build_path_returns_none(self):
+        assert platforms_by_library([
+            "libraries/a/src/commonMain/kotlin/X.kt",
+            "settings.gradle.kts",
+        ]) is None
+
+    def test_non_platform_library_file_maps_to_empty_sets(self):
+        assert platforms_by_library(["libraries/a/README.md"]) == {":libraries:a": (set(), set())}
+
+    def test_paths_outside_libraries_are_ignored(self):
+        assert platforms_by_library(["samples/x/src/commonMain/kotlin/X.kt", "README.md"]) == {}
+
+
+
+class TestBuildLogicRules:
+    """Convention files with a narrower effect than a full build."""
+
+    CONFIG = "build-logic/convention/src/main/kotlin/config/"
+
+    def test_rule_table(self):
+        assert build_logic_rule(self.CONFIG + "AndroidLibraryConfig.kt") == ({"android"}, set())
+        assert build_logic_rule(self.CONFIG + "KotlinMultiplatformConfig.kt") == (KNOWN_PLATFORMS, set())
+        assert build_logic_rule(self.CONFIG + "DocumentationConfig.kt") == (set(), {"dokka"})
+        assert build_logic_rule(self.CONFIG + "CodeQualityConfig.kt") == (set(), {"detekt"})
+        assert build_logic_rule("config/detekt/detekt.yaml") == (set(), {"detekt"})
+
+    def test_unlisted_build_logic_still_full_build(self):
+        assert build_logic_rule(self.CONFIG + "PublishingConfig.kt") is None
+        assert platforms_for_path(self.CONFIG + "PublishingConfig.kt") is None
+        assert platforms_for_path("build-logic/convention/src/main/kotlin/KmpLibraryConventionPlugin.kt") is None
+
+    def test_platforms_for_path_uses_rule(self):
+        assert platforms_for_path(self.CONFIG + "AndroidLibraryConfig.kt") == {"android"}
+        assert platforms_for_path(self.CONFIG + "DocumentationConfig.kt") == set()
+
+    def test_by_library_applies_rule_platforms_to_every_library(self):
+        checks = set()
+        impact = platforms_by_library(
+            [self.CONFIG + "AndroidLibraryConfig.kt", self.CONFIG + "CodeQualityConfig.kt", "libraries/a/build.gradle.kts"],
+            libraries=[":libraries:a", ":libraries:b"],
+            checks=checks,
+        )
+        assert impact == {":libraries:a": None, ":libraries:b": ({"android"}, set())}
+        assert checks == {"detekt"}
+
+    def test_by_library_without_libraries_ignores_rule_platforms(self):
+        assert platforms_by_library([self.CONFIG + "AndroidLibraryConfig.kt"]) == {}
+
+class TestTasksByLibrary:
+    """Tests for library-scoped task lists."""
+
+    def test_test_tasks_grouped_by_platform(self):
+        assert gradle_test_tasks_by_library({
+            ":libraries:a": {"jvm"},
+            ":libraries:b": {"jvm", "ios"},
+        }) == [
+            ("ios", [":libraries:b:compileKotlinIosSimulatorArm64"]),
+            ("jvm", [":libraries:a:jvmTest", ":libraries:b:jvmTest"]),
+        ]
+
+    def test_test_tasks_empty_map_returns_empty(self):
+        assert gradle_test_tasks_by_library({}) == []
+
+    def test_test_tasks_skip_unknown_platforms(self):
+        assert gradle_test_tasks_by_library({":libraries:a": {"unknown"}}) == []
+
+    def test_compile_tasks_scoped_per_library(self):
+        assert gradle_compile_tasks_by_library({
+            ":libraries:b": {"js"},
+            ":libraries:a": {"jvm", "android"},
+        }) == [
+            ":libraries:a:compileDebugKotlinAndroidMain",
+            ":libraries:a:compileKotlinJvm",
+            ":libraries:b:compileKotlinJs",
+        ]
+
+
 class TestTestTasksForPlatforms:
     """Tests for platform set -> test task list."""
 
@@ -371,3 +543,79 @@ class TestLibraryScoping:
             [":libraries:a-lib", ":libraries:b-lib"],
         )
         assert got == [":libraries:a-lib:build", ":libraries:b-lib:build"]
+
+
+class TestPlanningPaths:
+    """Tests for planning_paths (change records -> paths worth planning for)."""
+
+    def test_deleted_test_file_is_dropped(self):
+        changes = [
+            FileChange("deleted", "libraries/a/src/iosTest/kotlin/T.kt"),
+            FileChange("deleted", "libraries/a/src/iosMain/kotlin/M.kt"),
+        ]
+        assert list(planning_paths(changes)) == ["libraries/a/src/iosMain/kotlin/M.kt"]
+
+    def test_rename_counts_new_and_non_test_old_path(self):
+        changes = [
+            FileChange("renamed", "libraries/a/src/jsMain/kotlin/N.kt", "libraries/a/src/jvmMain/kotlin/O.kt"),
+            FileChange("renamed", "libraries/a/src/jsTest/kotlin/N.kt", "libraries/a/src/jvmTest/kotlin/O.kt"),
+        ]
+        assert list(planning_paths(changes)) == [
+            "libraries/a/src/jsMain/kotlin/N.kt",
+            "libraries/a/src/jvmMain/kotlin/O.kt",
+            "libraries/a/src/jsTest/kotlin/N.kt",
+        ]
+
+    def test_added_and_modified_pass_through(self):
+        changes = [FileChange("added", "a.kt"), FileChange("modified", "b.kt"), FileChange("copied", "c.kt", "b.kt")]
+        assert list(planning_paths(changes)) == ["a.kt", "b.kt", "c.kt"]
+
+
+class TestDeclaredTargets:
+    """Tests for platform narrowing by a library's declared targets."""
+
+    DECLARED = frozenset({"android", "jvm", "ios", "linuxX64"})
+
+    @pytest.mark.parametrize("source_set,expected", [
+        ("commonMain", {"jvm"}),
+        ("nativeMain", {"linuxX64"}),
+        ("appleTest", {"ios"}),
+        ("iosMain", {"ios"}),
+        ("mingwMain", set()),
+        ("webMain", set()),
+        ("androidNativeMain", set()),
+    ])
+    def test_platforms_for_path(self, source_set, expected):
+        path = f"libraries/a/src/{source_set}/kotlin/F.kt"
+        assert platforms_for_path(path, self.DECLARED, COSTS) == expected
+
+    def test_shared_source_set_without_jvm(self):
+        path = "libraries/a/src/commonMain/kotlin/F.kt"
+        assert platforms_for_path(path, frozenset({"ios", "android"}), COSTS) == {"android"}
+        assert platforms_for_path(path) == {"jvm"}  # unknown targets: SRC_SET_PATTERNS
+
+    def test_platforms_by_library(self):
+        paths = ["libraries/a/src/nativeMain/kotlin/F.kt", "libraries/b/src/nativeMain/kotlin/F.kt"]
+        declared = {":libraries:a": frozenset({"ios"}), ":libraries:b": None}
+        assert platforms_by_library(paths, declared=declared, costs=COSTS) == {
+            ":libraries:a": ({"ios"}, set()),
+            ":libraries:b": ({"ios", "linuxX64", "mingwX64"}, set()),
+        }
+
+    def test_cheapest_and_representative(self):
+        assert cheapest_platform({"ios", "linuxX64", "android"}, COSTS) == "android"
+        assert cheapest_platform({"js", "wasmJs"}, COSTS) == "js"
+        assert representative_platform(frozenset({"ios", "linuxX64"}), COSTS) == "linuxX64"
+        assert representative_platform(None, COSTS) == "jvm"
+
+    def test_cheapest_uses_the_given_costs(self):
+        costs = {"ios": 10.0, "android": 50.0}
+        assert cheapest_platform({"ios", "linuxX64", "android"}, costs) == "ios"
+        assert platforms_for_path("libraries/a/src/commonMain/kotlin/F.kt", frozenset({"ios", "android"}), costs) == {"ios"}
+
+    def test_restrict_to_declared(self):
+        assert restrict_to_declared({"js", "jvm"}, self.DECLARED) == {"jvm"}
+        assert restrict_to_declared({"js"}, self.DECLARED) == set()
+        assert restrict_to_declared({"js"}, frozenset({"ios", "linuxX64"}), COSTS) == {"linuxX64"}
+        assert restrict_to_declared(set(), self.DECLARED, COSTS) == set()
+        assert restrict_to_declared({"js"}, None) == {"js"}
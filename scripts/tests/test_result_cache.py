@@ -0,0 +1,90 @@
+"""Tests for result_cache (content-addressed cache of passing runs)."""
+
+import pytest
+
+from src.result_cache import ResultCache, source_set_relevant
+
+JVM = [":libraries:a:jvmTest"]
+JS = [":libraries:a:jsTest"]
+
+
+@pytest.fixture
+def repo(tmp_path, init_repo):
+    return init_repo(tmp_path, {
+        "settings.gradle.kts": "",
+        "libraries/a/build.gradle.kts": "dependencies { implementation(project(\":libraries:b\")) }\n",
+        "libraries/a/src/commonMain/kotlin/A.kt": "a",
+        "libraries/a/src/jsMain/kotlin/A.kt": "a",
+        "libraries/b/build.gradle.kts": "",
+        "libraries/b/src/commonMain/kotlin/B.kt": "b",
+    })
+
+
+class TestSourceSetRelevant:
+    """Tests for source_set_relevant."""
+
+    def test_other_platform_is_irrelevant(self):
+        assert not source_set_relevant("jsMain", "jvm")
+        assert source_set_relevant("jsMain", "js")
+
+    def test_shared_and_unknown_are_relevant(self):
+        assert source_set_relevant("commonMain", "ios")
+        assert source_set_relevant("appleMain", "macos")
+        assert source_set_relevant("someCustomMain", "jvm")
+        assert source_set_relevant("nonJvmMain", "js")
+
+    def test_shared_source_sets_cover_every_platform_they_compile_for(self):
+        assert source_set_relevant("linuxMain", "linuxArm64")
+        assert source_set_relevant("linuxTest", "linuxX64")
+        assert source_set_relevant("androidNativeMain", "androidNative")
+        assert source_set_relevant("androidNativeTest", "androidNative")
+        assert source_set_relevant("nativeMain", "watchos")
+        assert not source_set_relevant("linuxMain", "ios")
+        assert not source_set_relevant("androidNativeMain", "jvm")
+
+    def test_every_source_set_is_relevant_to_a_check(self):
+        assert source_set_relevant("jsMain", "detekt")
+
+
+class TestResultCache:
+    """Tests for ResultCache."""
+
+    def test_records_and_finds_pass(self, repo):
+        cache = ResultCache(repo)
+        key = cache.key("jvm", JVM)
+        assert key is not None
+        assert not cache.passed(key)
+        cache.record_pass(key, "jvm", JVM)
+        assert ResultCache(repo).passed(ResultCache(repo).key("jvm", JVM))
+
+    def test_only_relevant_source_sets_change_key(self, repo, write_file, commit):
+        jvm, js = ResultCache(repo).key("jvm", JVM), ResultCache(repo).key("js", JS)
+        write_file(repo, "libraries/a/src/jsMain/kotlin/A.kt", "changed")
+        commit(repo)
+        assert ResultCache(repo).key("jvm", JVM) == jvm
+        assert ResultCache(repo).key("js", JS) != js
+
+    def test_dependency_sources_change_key(self, repo, write_file, commit):
+        before = ResultCache(repo).key("jvm", JVM)
+        write_file(repo, "libraries/b/src/commonMain/kotlin/B.kt", "changed")
+        commit(repo)
+        assert ResultCache(repo).key("jvm", JVM) != before
+
+    def test_build_config_changes_key(self, repo, write_file):
+        before = ResultCache(repo).key("jvm", JVM)
+        write_file(repo, "gradle.properties", "kotlin.code.style=official\n")
+        assert ResultCache(repo).key("jvm", JVM) != before
+
+    def test_uncommitted_sources_are_not_cacheable(self, repo, write_file):
+        write_file(repo, "libraries/b/src/commonMain/kotlin/New.kt", "untracked")
+        assert ResultCache(repo).key("jvm", JVM) is None
+        assert not ResultCache(repo).passed(None)
+
+    def test_non_library_tasks_are_not_cacheable(self, repo):
+        assert ResultCache(repo).key("jvm", ["help"]) is None
+
+    def test_lru_eviction(self, repo):
+        cache = ResultCache(repo, max_entries=2)
+        for i in range(3):
+            cache.record_pass(f"{i:064x}", "jvm", JVM)
+        assert len(list(cache.directory.glob("*.json"))) == 2
@@ -0,0 +1,53 @@
+"""Tests for sharding (deterministic cost-balanced split across CI nodes)."""
+
+import pytest
+
+from src.sharding import assign_shards, parse_shard, shard_work, static_cost, work_units
+
+WORK = [
+    ("jvm", [":libraries:a:jvmTest", ":libraries:b:jvmTest", ":libraries:c:jvmTest"]),
+    ("ios", [":libraries:a:iosSimulatorArm64Test", ":libraries:b:iosSimulatorArm64Test"]),
+    ("js", [":libraries:a:jsTest"]),
+]
+
+
+class TestParseShard:
+    """Tests for parse_shard."""
+
+    def test_valid(self):
+        assert parse_shard("1/4") == (1, 4)
+        assert parse_shard("4/4") == (4, 4)
+
+    @pytest.mark.parametrize("spec", ["0/2", "3/2", "1/0", "1", "a/b", "1/2/3"])
+    def test_invalid(self, spec):
+        with pytest.raises(ValueError):
+            parse_shard(spec)
+
+
+class TestShardWork:
+    """Tests for assign_shards and shard_work."""
+
+    @pytest.mark.parametrize("count", [1, 2, 3, 7])
+    def test_shards_are_disjoint_and_cover_all_units(self, count):
+        shards = [shard_work(WORK, i, count, static_cost) for i in range(1, count + 1)]
+        units = [u for shard in shards for u in work_units(shard)]
+        assert sorted(units) == work_units(WORK)
+        assert len(units) == len(set(units))
+
+    def test_independent_of_input_order(self):
+        shuffled = [(p, list(reversed(t))) for p, t in reversed(WORK)]
+        assert assign_shards(WORK, 3, static_cost) == assign_shards(shuffled, 3, static_cost)
+
+    def test_balances_by_cost(self):
+        costs = {"jvm": 1.0, "ios": 10.0, "js": 5.0}
+        shards = assign_shards(WORK, 2, lambda platform, _task: costs[platform])
+        loads = sorted(sum(costs[p] for p, _t in shard) for shard in shards)
+        assert loads == [13.0, 15.0]
+
+    def test_keeps_platform_grouping_and_order(self):
+        shard = shard_work(WORK, 1, 1, static_cost)
+        assert [p for p, _ in shard] == ["jvm", "ios", "js"]
+        assert shard[0][1] == WORK[0][1]
+
+    def test_more_shards_than_units_leaves_some_empty(self):
+        assert shard_work([("jvm", [":libraries:a:jvmTest"])], 2, 2, static_cost) == []
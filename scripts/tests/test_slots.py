@@ -0,0 +1,52 @@
+"""Tests for slots (isolated Gradle state per concurrent slot)."""
+
+import pytest
+
+from src.script_cache import cache_dir
+from src.slots import BUILD_DIR_INIT_SCRIPT, SlotPool
+
+
+class TestSlotPool:
+    """Tests for SlotPool."""
+
+    def test_unknown_mode_raises(self, tmp_path):
+        with pytest.raises(ValueError):
+            SlotPool(tmp_path, 2, "bogus")
+
+    def test_none_mode_shares_checkout(self, tmp_path):
+        with SlotPool(tmp_path, 2, "none") as pool:
+            slot = pool.acquire()
+            assert slot.cwd == tmp_path
+            assert slot.gradle_args == []
+
+    def test_cache_mode_gives_distinct_project_cache_dirs(self, tmp_path):
+        with SlotPool(tmp_path, 2, "cache") as pool:
+            a, b = pool.acquire(), pool.acquire()
+        assert a.cwd == b.cwd == tmp_path
+        assert a.gradle_args[0] == b.gradle_args[0] == "--project-cache-dir"
+        assert a.gradle_args[1] != b.gradle_args[1]
+        assert a.gradle_args[1].startswith(str(cache_dir(tmp_path)))
+
+    def test_build_dir_mode_adds_init_script(self, tmp_path):
+        with SlotPool(tmp_path, 1, "build-dir") as pool:
+            slot = pool.acquire()
+        assert str(BUILD_DIR_INIT_SCRIPT) in slot.gradle_args
+        assert "-Dkmp.slot.buildDir=kmp-slot-0" in slot.gradle_args
+        assert BUILD_DIR_INIT_SCRIPT.is_file()
+
+    def test_release_returns_slot(self, tmp_path):
+        with SlotPool(tmp_path, 1, "cache") as pool:
+            slot = pool.acquire()
+            pool.release(slot)
+            assert pool.acquire() is slot
+
+    def test_worktree_mode_creates_and_removes_worktrees(self, tmp_path, git, init_repo):
+        root = init_repo(tmp_path, {"gradlew": "#!/bin/sh\n"})
+        with SlotPool(root, 2, "worktree") as pool:
+            a, b = pool.acquire(), pool.acquire()
+            assert a.cwd != b.cwd
+            assert (a.cwd / "gradlew").exists()
+            assert (b.cwd / "gradlew").exists()
+        assert not a.cwd.exists()
+        assert not b.cwd.exists()
+        assert len(git(root, "worktree", "list").splitlines()) == 1
@@ -0,0 +1,90 @@
+"""Tests for task_cache (persistent cache for Gradle task queries)."""
+
+from unittest.mock import patch
+
+import pytest
+
+from src.script_cache import cache_dir
+from src.task_cache import (
+    TASK_CACHE_DIR,
+    build_config_files,
+    build_config_hash,
+    resolve_library_tasks_cached,
+)
+
+
+@pytest.fixture
+def repo(tmp_path, write_file, make_library):
+    """Build inputs of every kind, plus a build script under src/ that is not one."""
+    write_file(tmp_path, "settings.gradle.kts", "rootProject.name = \"x\"")
+    write_file(tmp_path, "gradle/libs.versions.toml", "[versions]\n")
+    make_library(tmp_path, "a", "plugins {}", targets="jvm")
+    write_file(tmp_path, "libraries/a/src/commonMain/build.gradle.kts", "not a build file")
+    write_file(tmp_path, "build-logic/convention/src/Plugin.kt", "class Plugin")
+    return tmp_path
+
+
+class TestBuildConfigHash:
+    """Tests for build_config_files / build_config_hash."""
+
+    def test_collects_build_inputs_and_skips_src(self, repo):
+        rel = {p.relative_to(repo).as_posix() for p in build_config_files(repo)}
+        assert rel == {
+            "settings.gradle.kts",
+            "gradle/libs.versions.toml",
+            "libraries/a/build.gradle.kts",
+            "libraries/a/gradle.properties",
+            "build-logic/convention/src/Plugin.kt",
+        }
+
+    def test_hash_changes_with_build_logic(self, repo):
+        before = build_config_hash(repo)
+        (repo / "build-logic" / "convention" / "src" / "Plugin.kt").write_text("class Changed")
+        assert build_config_hash(repo) != before
+
+    def test_hash_ignores_source_files(self, repo):
+        before = build_config_hash(repo)
+        (repo / "libraries" / "a" / "src" / "commonMain" / "X.kt").write_text("fun x() = 1")
+        assert build_config_hash(repo) == before
+
+
+class TestResolveLibraryTasksCached:
+    """Tests for resolve_library_tasks_cached."""
+
+    def test_second_call_skips_gradle(self, repo):
+        with patch("src.task_cache.resolve_library_tasks", return_value=[":libraries:a:jvmTest"]) as m:
+            first = resolve_library_tasks_cached(repo, [":libraries:a"], ["jvmTest"])
+            second = resolve_library_tasks_cached(repo, [":libraries:a"], ["jvmTest"])
+        assert first == second == [":libraries:a:jvmTest"]
+        assert m.call_count == 1
+
+    def test_refresh_queries_again(self, repo):
+        with patch("src.task_cache.resolve_library_tasks", return_value=[]) as m:
+            resolve_library_tasks_cached(repo, [":libraries:a"], ["jvmTest"])
+            resolve_library_tasks_cached(repo, [":libraries:a"], ["jvmTest"], refresh=True)
+        assert m.call_count == 2
+
+    def test_build_config_change_invalidates(self, repo):
+        with patch("src.task_cache.resolve_library_tasks", return_value=[]) as m:
+            resolve_library_tasks_cached(repo, [":libraries:a"], ["jvmTest"])
+            (repo / "libraries" / "a" / "gradle.properties").write_text("kmp.targets=jvm,ios")
+            resolve_library_tasks_cached(repo, [":libraries:a"], ["jvmTest"])
+        assert m.call_count == 2
+
+    def test_evicts_beyond_max_entries(self, repo):
+        with patch("src.task_cache.resolve_library_tasks", return_value=[]):
+            for name in ["t1", "t2", "t3", "t4"]:
+                resolve_library_tasks_cached(repo, [":libraries:a"], [name], max_entries=2)
+        assert len(list((cache_dir(repo) / TASK_CACHE_DIR).glob("*.json"))) == 2
+
+    def test_failures_are_not_cached(self, repo):
+        with patch("src.task_cache.resolve_library_tasks", side_effect=RuntimeError("boom")):
+            try:
+                resolve_library_tasks_cached(repo, [":libraries:a"], ["jvmTest"])
+            except RuntimeError:
+                pass
+        assert not (cache_dir(repo) / TASK_CACHE_DIR).exists()
+
+    def test_empty_inputs_return_empty(self, tmp_path):
+        assert resolve_library_tasks_cached(tmp_path, [], ["jvmTest"]) == []
+        assert resolve_library_tasks_cached(tmp_path, [":libraries:a"], []) == []
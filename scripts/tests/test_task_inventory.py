@@ -0,0 +1,147 @@
+"""Tests for task_inventory (static task resolution from kmp.targets)."""
+
+from unittest.mock import patch
+
+from src.task_inventory import (
+    declared_platforms,
+    declared_platforms_by_library,
+    declared_targets,
+    platform_for_target,
+    read_gradle_property,
+    resolve_tasks,
+    static_library_tasks,
+    target_for_task,
+)
+
+CONVENTION = 'plugins {\n    id("convention.library")\n}\n'
+
+
+class TestReadGradleProperty:
+    """Tests for read_gradle_property."""
+
+    def test_reads_value_and_skips_comments(self, tmp_path):
+        f = tmp_path / "gradle.properties"
+        f.write_text("# kmp.targets=ios\n! other\nkmp.targets = android, jvm\n")
+        assert read_gradle_property(f, "kmp.targets") == "android, jvm"
+
+    def test_missing_file_returns_none(self, tmp_path):
+        assert read_gradle_property(tmp_path / "nope.properties", "kmp.targets") is None
+
+
+class TestDeclaredTargets:
+    """Tests for declared_targets."""
+
+    def test_kmp_targets_expand_like_convention_plugin(self, tmp_path, make_library):
+        lib = make_library(tmp_path, "a", CONVENTION, targets="android,jvm,ios,linux")
+        assert declared_targets(lib) == {"android", "jvm", "iosArm64", "iosSimulatorArm64", "linuxX64"}
+
+    def test_build_script_presets_are_added(self, tmp_path, make_library):
+        script = CONVENTION + "kotlin {\n    js(IR) { browser() }\n    wasmJs { browser() }\n    mingwX64()\n}\n"
+        lib = make_library(tmp_path, "a", script, targets="jvm")
+        assert declared_targets(lib) == {"jvm", "js", "wasmJs", "mingwX64"}
+
+    def test_commented_presets_are_ignored(self, tmp_path, make_library):
+        lib = make_library(tmp_path, "a", CONVENTION + "// mingwX64()\n/* js(IR) */\n", targets="jvm")
+        assert declared_targets(lib) == {"jvm"}
+
+    def test_missing_kmp_targets_is_undecidable(self, tmp_path, make_library):
+        assert declared_targets(make_library(tmp_path, "a", CONVENTION, targets=None)) is None
+
+    def test_invalid_kmp_target_is_undecidable(self, tmp_path, make_library):
+        assert declared_targets(make_library(tmp_path, "a", CONVENTION, targets="jvm,windows")) is None
+
+    def test_without_convention_plugin_is_undecidable(self, tmp_path, make_library):
+        assert declared_targets(make_library(tmp_path, "a", "plugins { kotlin(\"jvm\") }", targets="jvm")) is None
+
+    def test_dynamic_targets_are_undecidable(self, tmp_path, make_library):
+        script = CONVENTION + "kotlin { targetFromPreset(presets.getByName(\"x\")) }"
+        lib = make_library(tmp_path, "a", script, targets="jvm")
+        assert declared_targets(lib) is None
+
+
+class TestDeclaredPlatforms:
+    """Tests for declared_platforms and platform_for_target."""
+
+    def test_targets_map_to_platform_keys(self):
+        assert platform_for_target("iosSimulatorArm64") == "ios"
+        assert platform_for_target("androidNativeArm64") == "androidNative"
+        assert platform_for_target("android") == "android"
+        assert platform_for_target("wasmJs") == "wasmJs"
+
+    def test_build_script_only_targets_are_declared(self, tmp_path, make_library):
+        script = CONVENTION + "kotlin {\n    js(IR) { browser() }\n    wasmJs { browser() }\n    mingwX64()\n}\n"
+        lib = make_library(tmp_path, "a", script, targets="jvm,ios")
+        assert declared_platforms(lib) == {"jvm", "ios", "js", "wasmJs", "mingwX64"}
+
+    def test_by_library(self, tmp_path, make_library):
+        make_library(tmp_path, "a", CONVENTION, targets="linux")
+        make_library(tmp_path, "b", CONVENTION, targets=None)
+        assert declared_platforms_by_library(tmp_path, [":libraries:a", ":libraries:b"]) == {
+            ":libraries:a": {"linuxX64"},
+            ":libraries:b": None,
+        }
+
+
+class TestTargetForTask:
+    """Tests for target_for_task."""
+
+    def test_known_tasks(self):
+        assert target_for_task("jvmTest") == "jvm"
+        assert target_for_task("compileKotlinIosSimulatorArm64") == "iosSimulatorArm64"
+        assert target_for_task("compileKotlinWasmJs") == "wasmJs"
+
+    def test_unknown_task(self):
+        assert target_for_task("build") is None
+
+    def test_android_tasks_are_left_to_gradle(self):
+        assert target_for_task("testAndroid") is None
+        assert target_for_task("compileDebugKotlinAndroidMain") is None
+
+
+class TestStaticLibraryTasks:
+    """Tests for static_library_tasks and resolve_tasks."""
+
+    def test_filters_tasks_by_declared_targets(self, tmp_path, make_library):
+        make_library(tmp_path, "a", CONVENTION, targets="jvm,ios")
+        make_library(tmp_path, "b", CONVENTION, targets="linux")
+        tasks, undecided = static_library_tasks(
+            tmp_path,
+            [":libraries:a", ":libraries:b"],
+            ["jvmTest", "compileKotlinLinuxX64", "compileKotlinIosSimulatorArm64"],
+        )
+        assert tasks == [
+            ":libraries:a:compileKotlinIosSimulatorArm64",
+            ":libraries:a:jvmTest",
+            ":libraries:b:compileKotlinLinuxX64",
+        ]
+        assert undecided == []
+
+    def test_unknown_task_name_leaves_all_undecided(self, tmp_path, make_library):
+        make_library(tmp_path, "a", CONVENTION, targets="jvm")
+        assert static_library_tasks(tmp_path, [":libraries:a"], ["build"]) == ([], [":libraries:a"])
+
+    def test_resolve_tasks_does_not_query_gradle_when_decidable(self, tmp_path, make_library):
+        make_library(tmp_path, "a", CONVENTION, targets="jvm")
+        with patch("src.task_inventory.resolve_library_tasks_cached") as m:
+            assert resolve_tasks(tmp_path, [":libraries:a"], ["jvmTest"]) == [":libraries:a:jvmTest"]
+        m.assert_not_called()
+
+    def test_resolve_tasks_queries_gradle_only_for_undecided(self, tmp_path, make_library):
+        make_library(tmp_path, "a", CONVENTION, targets="jvm")
+        make_library(tmp_path, "b", CONVENTION, targets=None)
+        with patch("src.task_inventory.resolve_library_tasks_cached", return_value=[":libraries:b:jvmTest"]) as m:
+            result = resolve_tasks(tmp_path, [":libraries:a", ":libraries:b"], ["jvmTest"])
+        m.assert_called_once_with(tmp_path, [":libraries:b"], ["jvmTest"], refresh=False)
+        assert result == [":libraries:a:jvmTest", ":libraries:b:jvmTest"]
+
+    def test_template_android_tasks_come_from_gradle(self, repo_root):
+        """example-library declares android (kmp.targets); its task names are only known to Gradle."""
+        library = ":libraries:example-library"
+        names = ["jvmTest", "testAndroid", "compileDebugKotlinAndroidMain"]
+        with patch("src.task_inventory.resolve_library_tasks_cached", return_value=[f"{library}:jvmTest"]) as m:
+            assert resolve_tasks(repo_root, [library], names) == [f"{library}:jvmTest"]
+        m.assert_called_once_with(repo_root, [library], names, refresh=False)
+
+    def test_resolve_tasks_empty_inputs(self, tmp_path):
+        assert resolve_tasks(tmp_path, [], ["jvmTest"]) == []
+        assert resolve_tasks(tmp_path, [":libraries:a"], []) == []
@@ -1,6 +1,7 @@
 """Integration tests for test_platforms.py wiring (parallel vs single vs full build)."""
 
 import sys
+import time
 from pathlib import Path
 from unittest.mock import patch
 
@@ -9,16 +10,43 @@ _scripts_dir = Path(__file__).resolve().parent.parent
 if str(_scripts_dir) not in sys.path:
     sys.path.insert(0, str(_scripts_dir))
 
+import pytest
 
-def test_dry_run_multiple_platforms_shows_per_platform_lines(repo_root, capsys):
+from src.base_ref import BaseRef
+from src.file_change import FileChange
+from src.host_capabilities import HostCapabilities
+
+
+@pytest.fixture(autouse=True)
+def fixed_base():
+    """Base resolution is covered in test_base_ref; here every run diffs against one fixed base."""
+    import test_platforms as tp
+    with patch.object(tp, "resolve_base", return_value=(BaseRef("0" * 40, "requested", "origin/main"), [])):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def apple_host():
+    """Host routing is covered in test_host_capabilities; here Apple work runs (macOS with Xcode)."""
+    import test_platforms as tp
+    with patch.object(tp, "detect_host", return_value=HostCapabilities("macos", "arm64", True)):
+        yield
+
+
+def _changes(paths, kind="modified"):
+    """What changes_or_none returns for paths (None when there are none)."""
+    return iter([FileChange(kind, p) for p in paths]) if paths else None
+
+
+def test_dry_run_multiple_platforms_shows_per_platform_lines(checkout_copy, capsys):
     """With changed files that touch jvm and ios, dry-run prints one line per platform."""
     import test_platforms as tp
     paths = [
-        "libraries/foo/src/commonMain/kotlin/F.kt",
-        "libraries/foo/src/iosMain/kotlin/F.kt",
+        "libraries/example-library/src/commonMain/kotlin/F.kt",
+        "libraries/example-library/src/iosMain/kotlin/F.kt",
     ]
-    with patch.object(tp, "get_touched_files", return_value=paths):
-        with patch.object(tp, "get_repo_root", return_value=repo_root):
+    with patch.object(tp, "changes_or_none", return_value=_changes(paths)):
+        with patch.object(tp, "get_repo_root", return_value=checkout_copy):
             with patch.object(sys, "argv", ["test_platforms.py", "--dry-run"]):
                 code = tp.main()
     assert code == 0
@@ -28,12 +56,12 @@ def test_dry_run_multiple_platforms_shows_per_platform_lines(repo_root, capsys):
     assert "ios" in out
 
 
-def test_dry_run_single_platform_uses_single_invocation(repo_root, capsys):
+def test_dry_run_single_platform_uses_single_invocation(checkout_copy, capsys):
     """With only jvm changes, dry-run prints one would-run line (no per-platform)."""
     import test_platforms as tp
-    paths = ["libraries/foo/src/commonMain/kotlin/F.kt"]
-    with patch.object(tp, "get_touched_files", return_value=paths):
-        with patch.object(tp, "get_repo_root", return_value=repo_root):
+    paths = ["libraries/example-library/src/commonMain/kotlin/F.kt"]
+    with patch.object(tp, "changes_or_none", return_value=_changes(paths)):
+        with patch.object(tp, "get_repo_root", return_value=checkout_copy):
             with patch.object(sys, "argv", ["test_platforms.py", "--dry-run"]):
                 code = tp.main()
     assert code == 0
@@ -42,13 +70,535 @@ def test_dry_run_single_platform_uses_single_invocation(repo_root, capsys):
     assert "jvmTest" in out or "build" in out
 
 
-def test_empty_platforms_returns_error(repo_root, capsys):
+def test_empty_platforms_returns_error(checkout_copy, capsys):
     """--platforms= or --platforms=,  (empty) yields exit 1."""
     import test_platforms as tp
-    with patch.object(tp, "get_touched_files", return_value=[]):
-        with patch.object(tp, "get_repo_root", return_value=repo_root):
+    with patch.object(tp, "changes_or_none", return_value=_changes([])):
+        with patch.object(tp, "get_repo_root", return_value=checkout_copy):
             with patch.object(sys, "argv", ["test_platforms.py", "--platforms="]):
                 code = tp.main()
     assert code == 1
     err = capsys.readouterr().err
     assert "no valid platforms" in err.lower()
+
+
+def test_dry_run_schedules_only_touched_libraries(checkout_copy, capsys):
+    """Only libraries with changes get tasks; each platform lists only its libraries."""
+    import test_platforms as tp
+    paths = [
+        "libraries/a-lib/src/commonMain/kotlin/F.kt",
+        "libraries/b-lib/src/iosMain/kotlin/F.kt",
+    ]
+    libs = [":libraries:a-lib", ":libraries:b-lib", ":libraries:c-lib"]
+    with patch.object(tp, "changes_or_none", return_value=_changes(paths)):
+        with patch.object(tp, "get_repo_root", return_value=checkout_copy):
+            with patch.object(tp, "get_library_project_paths", return_value=libs):
+                with patch.object(sys, "argv", ["test_platforms.py", "--dry-run"]):
+                    code = tp.main()
+    assert code == 0
+    out = capsys.readouterr().out
+    assert ":libraries:a-lib:jvmTest" in out
+    assert ":libraries:b-lib:compileKotlinIosSimulatorArm64" in out
+    assert ":libraries:b-lib:jvmTest" not in out
+    assert "c-lib" not in out
+
+
+def test_dry_run_library_build_script_change_runs_that_library_only(checkout_copy, capsys):
+    """A library's own build.gradle.kts change validates only that library (JVM)."""
+    import test_platforms as tp
+    libs = [":libraries:a-lib", ":libraries:b-lib"]
+    with patch.object(tp, "changes_or_none", return_value=_changes(["libraries/a-lib/build.gradle.kts"])):
+        with patch.object(tp, "get_repo_root", return_value=checkout_copy):
+            with patch.object(tp, "get_library_project_paths", return_value=libs):
+                with patch.object(sys, "argv", ["test_platforms.py", "--dry-run"]):
+                    code = tp.main()
+    assert code == 0
+    out = capsys.readouterr().out
+    assert ":libraries:a-lib:jvmTest" in out
+    assert "b-lib" not in out
+
+
+def test_dry_run_shards_are_disjoint(checkout_copy, capsys):
+    """--shard 1/2 and 2/2 together schedule each task exactly once."""
+    import test_platforms as tp
+    paths = [
+        "libraries/a-lib/src/commonMain/kotlin/F.kt",
+        "libraries/b-lib/src/commonMain/kotlin/F.kt",
+        "libraries/b-lib/src/iosMain/kotlin/F.kt",
+    ]
+    libs = [":libraries:a-lib", ":libraries:b-lib"]
+    scheduled = []
+    for shard in ("1/2", "2/2"):
+        with patch.object(tp, "changes_or_none", return_value=_changes(paths)):
+            with patch.object(tp, "get_repo_root", return_value=checkout_copy):
+                with patch.object(tp, "get_library_project_paths", return_value=libs):
+                    with patch.object(sys, "argv", ["test_platforms.py", "--dry-run", "--shard", shard]):
+                        assert tp.main() == 0
+        captured = capsys.readouterr()
+        out = captured.out
+        assert f"Shard {shard}:" in captured.err
+        assert "Shard" not in out
+        scheduled += [w for w in out.split() if w.startswith(":libraries:")]
+    assert len(scheduled) == len(set(scheduled))
+    assert ":libraries:a-lib:jvmTest" in scheduled
+    assert ":libraries:b-lib:jvmTest" in scheduled
+
+
+def test_plan_then_execute(checkout_copy, tmp_path, capsys):
+    """'plan' writes work items with runner OS; 'execute --runner-os' runs only matching items."""
+    import json
+    import test_platforms as tp
+    paths = [
+        "libraries/a-lib/src/commonMain/kotlin/F.kt",
+        "libraries/a-lib/src/iosMain/kotlin/F.kt",
+    ]
+    libs = [":libraries:a-lib"]
+    plan_file = tmp_path / "plan.json"
+    with patch.object(tp, "changes_or_none", return_value=_changes(paths)):
+        with patch.object(tp, "get_repo_root", return_value=checkout_copy):
+            with patch.object(tp, "get_library_project_paths", return_value=libs):
+                with patch.object(tp, "resolve_tasks", side_effect=lambda cwd, libs, names, **kw: [
+                    f"{lib}:{name}" for lib in libs for name in names
+                ]):
+                    with patch.object(sys, "argv", ["test_platforms.py", "plan", "-o", str(plan_file)]):
+                        assert tp.main() == 0
+    plan = json.loads(plan_file.read_text())
+    assert plan["libraries"] == libs
+    assert plan["runner_os"] == ["linux", "macos"]
+    by_platform = {item["platform"]: item for item in plan["work_items"]}
+    assert by_platform["ios"]["runner_os"] == "macos"
+    assert ":libraries:a-lib:jvmTest" in by_platform["jvm"]["tasks"]
+
+    argv = ["test_platforms.py", "execute", str(plan_file), "--runner-os", "linux", "--dry-run"]
+    with patch.object(tp, "get_repo_root", return_value=checkout_copy):
+        with patch.object(sys, "argv", argv):
+            assert tp.main() == 0
+    out = capsys.readouterr().out
+    assert ":libraries:a-lib:jvmTest" in out
+    assert "Ios" not in out
+
+
+def test_plan_options_before_subcommand_are_kept():
+    """'--base X --platforms jvm plan' plans against X; the plan subparser's defaults do not overwrite it."""
+    import test_platforms as tp
+    args = tp.build_parser().parse_args(["--base", "HEAD~3", "--platforms", "jvm", "--changes", "staged", "plan"])
+    assert (args.base, args.platforms, args.changes) == ("HEAD~3", "jvm", "staged")
+    args = tp.build_parser().parse_args(["plan", "--base", "HEAD~3"])
+    assert (args.base, args.platforms, args.changes, args.refresh_task_cache) == ("HEAD~3", None, "committed", False)
+
+
+def test_execute_rejects_invalid_plan(checkout_copy, tmp_path, capsys):
+    import test_platforms as tp
+    plan_file = tmp_path / "plan.json"
+    plan_file.write_text("{}")
+    with patch.object(tp, "get_repo_root", return_value=checkout_copy):
+        with patch.object(sys, "argv", ["test_platforms.py", "execute", str(plan_file)]):
+            assert tp.main() == 1
+    assert "unsupported plan" in capsys.readouterr().err
+
+
+def test_cached_passes_are_skipped(checkout_copy, capsys):
+    """Work items whose result-cache key already passed are reported, not run."""
+    import test_platforms as tp
+
+    class AllPassed:
+        def __init__(self, _root):
+            pass
+
+        def key(self, platform, tasks):
+            return platform
+
+        def passed(self, key):
+            return True
+
+    paths = ["libraries/example-library/src/commonMain/kotlin/F.kt"]
+    with patch.object(tp, "changes_or_none", return_value=_changes(paths)):
+        with patch.object(tp, "get_repo_root", return_value=checkout_copy):
+            with patch.object(tp, "ResultCache", AllPassed):
+                with patch.object(tp, "run_gradle") as run_gradle:
+                    with patch.object(sys, "argv", ["test_platforms.py", "--dry-run"]):
+                        assert tp.main() == 0
+    assert not run_gradle.called
+    assert "[cached pass] jvm" in capsys.readouterr().out
+
+
+def test_dry_run_only_deleted_test_files_runs_nothing(checkout_copy, capsys):
+    """Deleting test files leaves nothing to compile or run."""
+    import test_platforms as tp
+    paths = ["libraries/example-library/src/iosTest/kotlin/FTest.kt"]
+    with patch.object(tp, "changes_or_none", return_value=_changes(paths, kind="deleted")):
+        with patch.object(tp, "get_repo_root", return_value=checkout_copy):
+            with patch.object(tp, "run_gradle") as run_gradle:
+                with patch.object(sys, "argv", ["test_platforms.py", "--dry-run"]):
+                    assert tp.main() == 0
+    assert not run_gradle.called
+    assert "Only deleted test files or unreferenced catalog entries" in capsys.readouterr().err
+
+
+def test_catalog_note_precedes_nothing_to_test(checkout_copy, capsys):
+    """An unchanged catalog expands to nothing; its note is printed before the outcome."""
+    import test_platforms as tp
+    with patch.object(tp, "changes_or_none", return_value=_changes(["gradle/libs.versions.toml"])):
+        with patch.object(tp, "get_repo_root", return_value=checkout_copy):
+            with patch.object(tp, "run_gradle") as run_gradle:
+                with patch.object(sys, "argv", ["test_platforms.py", "--dry-run", "--changes", "worktree"]):
+                    assert tp.main() == 0
+    assert not run_gradle.called
+    err = capsys.readouterr().err
+    assert err.index("gradle/libs.versions.toml: changed") < err.index("nothing to build or test")
+
+
+def test_dry_run_worktree_changes_skip_base_resolution(checkout_copy, capsys):
+    """--changes worktree plans from uncommitted files only and never resolves a base."""
+    import test_platforms as tp
+    paths = ["libraries/example-library/src/jvmMain/kotlin/F.kt"]
+    with patch.object(tp, "changes_or_none", return_value=_changes(paths)) as changes_or_none:
+        with patch.object(tp, "get_repo_root", return_value=checkout_copy):
+            with patch.object(tp, "resolve_base") as resolve_base:
+                with patch.object(sys, "argv", ["test_platforms.py", "--dry-run", "--changes", "worktree"]):
+                    assert tp.main() == 0
+    assert not resolve_base.called
+    assert changes_or_none.call_args.args[2] == "worktree"
+    assert ":libraries:example-library:jvmTest" in capsys.readouterr().out
+
+
+def test_dry_run_no_worktree_changes_runs_nothing(checkout_copy, capsys):
+    """A clean worktree is not a reason for a full build."""
+    import test_platforms as tp
+    with patch.object(tp, "changes_or_none", return_value=None):
+        with patch.object(tp, "get_repo_root", return_value=checkout_copy):
+            with patch.object(tp, "run_gradle") as run_gradle:
+                with patch.object(sys, "argv", ["test_platforms.py", "--dry-run", "--changes", "staged"]):
+                    assert tp.main() == 0
+    assert not run_gradle.called
+    assert "No staged changes" in capsys.readouterr().err
+
+
+def test_head_at_base_runs_nothing(checkout_copy, capsys):
+    """HEAD already on the base (e.g. origin/main) means nothing to test, not a full build."""
+    import test_platforms as tp
+    base = BaseRef("1" * 40, "requested", "origin/main", at_head=True)
+    with patch.object(tp, "resolve_base", return_value=(base, [])):
+        with patch.object(tp, "changes_or_none", return_value=None):
+            with patch.object(tp, "get_repo_root", return_value=checkout_copy):
+                with patch.object(tp, "run_gradle") as run_gradle:
+                    with patch.object(sys, "argv", ["test_platforms.py", "--dry-run"]):
+                        assert tp.main() == 0
+    assert not run_gradle.called
+    assert "No committed changes since origin/main" in capsys.readouterr().err
+
+
+def test_staged_git_failure_is_an_error_not_a_clean_tree(checkout_copy, capsys):
+    """A failed git status exits non-zero instead of reporting no staged changes."""
+    import test_platforms as tp
+    failure = RuntimeError("git status failed (exit 128): not a git repository")
+    with patch.object(tp, "changes_or_none", side_effect=failure):
+        with patch.object(tp, "get_repo_root", return_value=checkout_copy):
+            with patch.object(tp, "run_gradle") as run_gradle:
+                with patch.object(sys, "argv", ["test_platforms.py", "--dry-run", "--changes", "staged"]):
+                    assert tp.main() == 1
+    assert not run_gradle.called
+    err = capsys.readouterr().err
+    assert "git status failed" in err
+    assert "No staged changes" not in err
+
+
+class _QueuedWatcher:
+    """Watcher double: poll() sleeps, then returns the next queued path set; stops when empty."""
+
+    kind = "fake"
+
+    def __init__(self, root, batches, stop):
+        self.root, self.batches, self.stop = root, list(batches), stop
+
+    def poll(self, timeout):
+        if not self.batches:
+            time.sleep(0.3)
+            self.stop.set()
+            return set()
+        delay, names = self.batches.pop(0)
+        time.sleep(delay)
+        return {self.root / n for n in names}
+
+
+def test_watch_new_burst_cancels_run_and_replans_both(checkout_copy):
+    """A burst during a run cancels it; the next run covers the cancelled changes too."""
+    import asyncio
+    import threading
+
+    import test_platforms as tp
+
+    jvm = "libraries/example-library/src/jvmMain/kotlin/F.kt"
+    ios = "libraries/example-library/src/iosMain/kotlin/F.kt"
+    stop = threading.Event()
+    watcher = _QueuedWatcher(checkout_copy, [(0, [jvm]), (0, []), (0.5, [ios]), (0, [])], stop)
+    planned, runs = [], []
+
+    def plan_changes(changes, *_args):
+        planned.append(sorted(c.path for c in changes))
+        return ([(p.split("/")[3], [p]) for p in planned[-1]], [])
+
+    async def run_parallel(work, *_args, **_kwargs):
+        runs.append({"work": work, "cancelled": False})
+        try:
+            await asyncio.sleep(5 if len(runs) == 1 else 0)
+        except asyncio.CancelledError:
+            runs[-1]["cancelled"] = True
+            raise
+        return (0, None)
+
+    async def warm_up(*_args, **_kwargs):
+        return 0
+
+    args = tp.build_parser().parse_args(["--watch", "--debounce", "0.05", "--output", "inherit"])
+    with patch.object(tp, "plan_changes", side_effect=plan_changes):
+        with patch.object(tp, "run_parallel_gradle_async", side_effect=run_parallel):
+            with patch.object(tp, "run_single_gradle_async", side_effect=warm_up):
+                asyncio.run(asyncio.wait_for(tp.watch_loop(args, checkout_copy, watcher, stop), timeout=10))
+
+    assert planned == [[jvm], [ios, jvm]]
+    assert [r["cancelled"] for r in runs] == [True, False]
+    assert sorted(name for name, _tasks in runs[1]["work"]) == ["iosMain", "jvmMain"]
+
+
+def test_watch_reports_a_broken_run_and_keeps_watching(checkout_copy, capsys):
+    """A run that raises is reported; the next burst is still planned (off the event loop) and run."""
+    import asyncio
+    import threading
+
+    import test_platforms as tp
+
+    jvm = "libraries/example-library/src/jvmMain/kotlin/F.kt"
+    ios = "libraries/example-library/src/iosMain/kotlin/F.kt"
+    stop = threading.Event()
+    watcher = _QueuedWatcher(checkout_copy, [(0, [jvm]), (0, []), (0.5, [ios]), (0, [])], stop)
+    planned, planning_threads, runs = [], set(), []
+
+    def plan_changes(changes, *_args):
+        planning_threads.add(threading.current_thread() is threading.main_thread())
+        planned.append(sorted(c.path for c in changes))
+        return ([("jvm", planned[-1])], [])
+
+    async def run_parallel(work, *_args, **_kwargs):
+        runs.append(work)
+        if len(runs) == 1:
+            raise RuntimeError("boom")
+        return (0, None)
+
+    async def warm_up(*_args, **_kwargs):
+        return 0
+
+    args = tp.build_parser().parse_args(["--watch", "--debounce", "0.05", "--output", "inherit"])
+    with patch.object(tp, "plan_changes", side_effect=plan_changes):
+        with patch.object(tp, "run_parallel_gradle_async", side_effect=run_parallel):
+            with patch.object(tp, "run_single_gradle_async", side_effect=warm_up):
+                asyncio.run(asyncio.wait_for(tp.watch_loop(args, checkout_copy, watcher, stop), timeout=10))
+
+    assert planned == [[jvm], [ios]]
+    assert planning_threads == {False}
+    assert len(runs) == 2
+    err = capsys.readouterr().err
+    assert "[watch] run failed: boom" in err
+    assert "[watch] passed" in err
+
+
+def test_dry_run_documentation_config_runs_dokka_only(checkout_copy, capsys):
+    """A Dokka convention change runs the Dokka check on every library, no tests."""
+    import test_platforms as tp
+    paths = ["build-logic/convention/src/main/kotlin/config/DocumentationConfig.kt"]
+    with patch.object(tp, "changes_or_none", return_value=_changes(paths)):
+        with patch.object(tp, "get_repo_root", return_value=checkout_copy):
+            with patch.object(sys, "argv", ["test_platforms.py", "--dry-run"]):
+                assert tp.main() == 0
+    out = capsys.readouterr().out
+    assert ":libraries:example-library:dokkaGeneratePublicationHtml" in out
+    assert "jvmTest" not in out
+
+
+def test_dry_run_scripts_and_docs_only_runs_nothing(checkout_copy, capsys):
+    """Paths project.yml skips or does not watch short-circuit before any Gradle run."""
+    pytest.importorskip("yaml")
+    import test_platforms as tp
+    paths = ["scripts/src/platform_core.py", "docs/index.md", "libraries/example-library/README.md"]
+    with patch.object(tp, "changes_or_none", return_value=_changes(paths)):
+        with patch.object(tp, "get_repo_root", return_value=checkout_copy):
+            with patch.object(tp, "run_gradle") as run_gradle:
+                with patch.object(sys, "argv", ["test_platforms.py", "--dry-run"]):
+                    assert tp.main() == 0
+    assert not run_gradle.called
+    assert "No changed path affects the build" in capsys.readouterr().err
+
+
+def test_dry_run_path_rules_add_platforms_and_tasks(checkout_copy, capsys):
+    """project.yml ci.path_rules: kotlin-js-store/ tests js and wasmJs, bom/ runs the BOM build."""
+    pytest.importorskip("yaml")
+    import test_platforms as tp
+    paths = ["kotlin-js-store/yarn.lock", "bom/build.gradle.kts"]
+    undeclared = {":libraries:example-library": None}  # targets unknown: nothing pruned
+    with patch.object(tp, "changes_or_none", return_value=_changes(paths)):
+        with patch.object(tp, "get_repo_root", return_value=checkout_copy):
+            with patch.object(tp, "declared_platforms_by_library", return_value=undeclared):
+                with patch.object(sys, "argv", ["test_platforms.py", "--dry-run"]):
+                    assert tp.main() == 0
+    out = capsys.readouterr().out
+    assert ":libraries:example-library:compileKotlinJs" in out
+    assert ":libraries:example-library:compileKotlinWasmJs" in out
+    assert ":bom:build" in out
+    assert "jvmTest" not in out
+
+
+def test_dry_run_undeclared_targets_are_pruned(checkout_copy, capsys):
+    """example-library declares no macOS or wasmWasi target: changes there run neither."""
+    import test_platforms as tp
+    paths = [
+        "libraries/example-library/src/macosMain/kotlin/F.kt",
+        "libraries/example-library/src/wasmWasiMain/kotlin/F.kt",
+    ]
+    with patch.object(tp, "changes_or_none", return_value=_changes(paths)):
+        with patch.object(tp, "get_repo_root", return_value=checkout_copy):
+            with patch.object(sys, "argv", ["test_platforms.py", "--dry-run"]):
+                assert tp.main() == 0
+    out = capsys.readouterr().out
+    assert "compileKotlinMacosArm64" not in out and "compileKotlinWasmWasi" not in out
+
+
+def test_dry_run_build_script_targets_count_as_declared(checkout_copy, capsys):
+    """js, wasmJs and mingwX64 come from example-library's build.gradle.kts, not kmp.targets."""
+    import test_platforms as tp
+    paths = [
+        "libraries/example-library/src/jsMain/kotlin/F.kt",
+        "libraries/example-library/src/wasmJsMain/kotlin/F.kt",
+        "libraries/example-library/src/mingwX64Main/kotlin/F.kt",
+    ]
+    with patch.object(tp, "changes_or_none", return_value=_changes(paths)):
+        with patch.object(tp, "get_repo_root", return_value=checkout_copy):
+            with patch.object(sys, "argv", ["test_platforms.py", "--dry-run"]):
+                assert tp.main() == 0
+    out = capsys.readouterr().out
+    assert ":libraries:example-library:compileKotlinJs" in out
+    assert ":libraries:example-library:compileKotlinWasmJs" in out
+    assert ":libraries:example-library:compileKotlinMingwX64" in out
+
+
+def test_dry_run_native_main_runs_cheapest_declared_native_target(checkout_copy, capsys):
+    """nativeMain is compiled by every native target; linuxX64 stands for ios too."""
+    import test_platforms as tp
+    paths = ["libraries/example-library/src/nativeMain/kotlin/F.kt"]
+    with patch.object(tp, "changes_or_none", return_value=_changes(paths)):
+        with patch.object(tp, "get_repo_root", return_value=checkout_copy):
+            with patch.object(sys, "argv", ["test_platforms.py", "--dry-run"]):
+                assert tp.main() == 0
+    out = capsys.readouterr().out
+    assert ":libraries:example-library:compileKotlinLinuxX64" in out
+    assert "IosSimulatorArm64" not in out and "MingwX64" not in out
+
+
+def test_linux_host_defers_apple_work_and_keeps_base(checkout_copy, capsys):
+    """On Linux, ios is reported as deferred, jvm still runs, and HEAD is not recorded as verified."""
+    import test_platforms as tp
+    paths = [
+        "libraries/example-library/src/jvmMain/kotlin/F.kt",
+        "libraries/example-library/src/iosMain/kotlin/F.kt",
+    ]
+    with patch.object(tp, "changes_or_none", return_value=_changes(paths)):
+        with patch.object(tp, "get_repo_root", return_value=checkout_copy):
+            with patch.object(tp, "detect_host", return_value=HostCapabilities("linux", "x64")):
+                with patch.object(tp, "resolve_tasks", side_effect=lambda cwd, libs, names, **kw: [
+                    f"{lib}:{name}" for lib in libs for name in names
+                ]):
+                    with patch.object(tp, "run_gradle", return_value=0) as run_gradle:
+                        with patch.object(tp, "record_verified") as record_verified:
+                            with patch.object(sys, "argv", ["test_platforms.py", "--no-result-cache"]):
+                                assert tp.main() == 0
+    assert run_gradle.call_args.args[0] == [":libraries:example-library:jvmTest"]
+    assert not record_verified.called
+    err = capsys.readouterr().err
+    assert "this host: linux-x64" in err
+    assert "[deferred] ios: needs a macOS host" in err
+
+
+def test_no_host_check_keeps_apple_work(checkout_copy, capsys):
+    """--no-host-check runs what the plan says regardless of the host."""
+    import test_platforms as tp
+    paths = ["libraries/example-library/src/iosMain/kotlin/F.kt"]
+    with patch.object(tp, "changes_or_none", return_value=_changes(paths)):
+        with patch.object(tp, "get_repo_root", return_value=checkout_copy):
+            with patch.object(tp, "detect_host", return_value=HostCapabilities("linux", "x64")):
+                with patch.object(sys, "argv", ["test_platforms.py", "--dry-run", "--no-host-check"]):
+                    assert tp.main() == 0
+    captured = capsys.readouterr()
+    assert ":libraries:example-library:compileKotlinIosSimulatorArm64" in captured.out
+    assert "[deferred]" not in captured.err
+
+
+def test_plan_records_host_and_deferral(checkout_copy, tmp_path):
+    """'plan' keeps every item (CI routes them by runner_os) and notes which this host cannot run."""
+    import json
+    import test_platforms as tp
+    paths = ["libraries/example-library/src/jvmMain/kotlin/F.kt", "libraries/example-library/src/iosMain/kotlin/F.kt"]
+    plan_file = tmp_path / "plan.json"
+    with patch.object(tp, "changes_or_none", return_value=_changes(paths)):
+        with patch.object(tp, "get_repo_root", return_value=checkout_copy):
+            with patch.object(tp, "detect_host", return_value=HostCapabilities("macos", "arm64", False)):
+                with patch.object(tp, "resolve_tasks", side_effect=lambda cwd, libs, names, **kw: [
+                    f"{lib}:{name}" for lib in libs for name in names
+                ]):
+                    with patch.object(sys, "argv", ["test_platforms.py", "plan", "-o", str(plan_file)]):
+                        assert tp.main() == 0
+    plan = json.loads(plan_file.read_text())
+    assert plan["host"] == {"os": "macos", "arch": "arm64", "xcode": False}
+    reasons = {item["platform"]: item["deferred_reason"] for item in plan["work_items"]}
+    assert reasons["jvm"] is None
+    assert reasons["ios"].startswith("needs Xcode")
+
+
+def test_shard_is_taken_before_routing_to_host(checkout_copy):
+    """Linux and macOS nodes given the same --shard agree on it; each only defers what it cannot run."""
+    import test_platforms as tp
+    work = [
+        ("ios", [f":libraries:{lib}:compileKotlinIosSimulatorArm64" for lib in "abcd"]),
+        ("jvm", [f":libraries:{lib}:jvmTest" for lib in "abcd"]),
+    ]
+
+    def shard_on(host, shard):
+        """(tasks run, tasks deferred) by a node on host running --shard shard."""
+        ran, deferred = set(), []
+
+        async def run_parallel(items, *_args, **_kwargs):
+            ran.update(t for _name, tasks in items for t in tasks)
+            return (0, None)
+
+        def run_single(tasks, **_kwargs):
+            ran.update(tasks)
+            return 0
+
+        args = tp.build_parser().parse_args(["--dry-run", "--no-result-cache", "--shard", shard])
+        with patch.object(tp, "detect_host", return_value=host):
+            with patch.object(tp, "run_parallel_gradle_async", side_effect=run_parallel):
+                with patch.object(tp, "run_gradle", side_effect=run_single):
+                    assert tp.execute_work(work, args, checkout_copy, deferred) == 0
+        return ran, {t for item in deferred for t in item.tasks}
+
+    slices = []
+    for shard in ("1/2", "2/2"):
+        linux_ran, linux_deferred = shard_on(HostCapabilities("linux", "x64"), shard)
+        mac_ran, mac_deferred = shard_on(HostCapabilities("macos", "arm64", True), shard)
+        assert mac_deferred == set()
+        assert linux_ran | linux_deferred == mac_ran
+        assert all("Ios" in t for t in linux_deferred)
+        slices.append(mac_ran)
+    assert slices[0].isdisjoint(slices[1])
+    assert slices[0] | slices[1] == {t for _name, tasks in work for t in tasks}
+
+
+def test_fail_on_deferred_exits_non_zero(checkout_copy, capsys):
+    """Deferred work is a warning by default and a failure with --fail-on-deferred."""
+    import test_platforms as tp
+    paths = ["libraries/example-library/src/iosMain/kotlin/F.kt"]
+    for extra, expected in (([], 0), (["--fail-on-deferred"], 1)):
+        with patch.object(tp, "changes_or_none", return_value=_changes(paths)):
+            with patch.object(tp, "get_repo_root", return_value=checkout_copy):
+                with patch.object(tp, "detect_host", return_value=HostCapabilities("linux", "x64")):
+                    with patch.object(sys, "argv", ["test_platforms.py", "--dry-run", *extra]):
+                        assert tp.main() == expected
+        assert "warning: 1 work item(s) were NOT run on this host" in capsys.readouterr().err
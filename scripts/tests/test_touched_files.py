@@ -1,9 +1,17 @@
-"""Minimal tests for touched_files (get_repo_root, get_touched_files)."""
+"""Tests for touched_files (get_repo_root, get_touched_files, iter_changes, iter_status_changes)."""
 
 import pytest
 from pathlib import Path
 
-from src.touched_files import get_repo_root, get_touched_files
+from src.file_change import ADDED, DELETED, MODIFIED, RENAMED, FileChange
+from src.touched_files import (
+    changes_or_none,
+    get_repo_root,
+    get_touched_files,
+    iter_changes,
+    iter_mode_changes,
+    iter_status_changes,
+)
 
 
 class TestGetRepoRoot:
@@ -32,3 +40,93 @@ class TestGetTouchedFiles:
         root = get_repo_root()
         result = get_touched_files("origin/main", repo_root=root)
         assert isinstance(result, list)
+
+
+@pytest.fixture
+def diff_repo(tmp_path, git, init_repo, commit):
+    """Repo whose HEAD adds, modifies, deletes and renames files relative to the base tag."""
+    init_repo(tmp_path, {"keep.txt": "keep\n", "gone.txt": "gone\n", "old name.kt": "fun renamed() = 42\n" * 20})
+    git(tmp_path, "tag", "base")
+    (tmp_path / "keep.txt").write_text("changed\n")
+    (tmp_path / "gone.txt").unlink()
+    (tmp_path / "old name.kt").rename(tmp_path / "new\nname.kt")
+    (tmp_path / "caf\xe9.kt").write_text("new\n")
+    commit(tmp_path, "change")
+    return tmp_path
+
+
+class TestIterChanges:
+    """Tests for iter_changes (streaming git diff -z --name-status -M)."""
+
+    def test_typed_records(self, diff_repo):
+        changes = sorted(iter_changes("base", diff_repo))
+        assert changes == sorted([
+            FileChange(MODIFIED, "keep.txt"),
+            FileChange(DELETED, "gone.txt"),
+            FileChange(RENAMED, "new\nname.kt", "old name.kt"),
+            FileChange(ADDED, "caf\xe9.kt"),
+        ])
+
+    def test_get_touched_files_lists_both_rename_names(self, diff_repo):
+        assert sorted(get_touched_files("base", repo_root=diff_repo)) == sorted(
+            ["keep.txt", "gone.txt", "old name.kt", "new\nname.kt", "caf\xe9.kt"]
+        )
+
+    def test_unknown_base_raises_and_get_touched_files_returns_empty(self, diff_repo):
+        with pytest.raises(RuntimeError):
+            list(iter_changes("no-such-ref", diff_repo))
+        assert get_touched_files("no-such-ref", repo_root=diff_repo) == []
+        assert changes_or_none("no-such-ref", diff_repo) is None
+
+    def test_changes_or_none(self, diff_repo):
+        assert changes_or_none("HEAD", diff_repo) is None
+        assert len(list(changes_or_none("base", diff_repo))) == 4
+
+    def test_stopping_early_does_not_hang(self, diff_repo):
+        changes = iter_changes("base", diff_repo)
+        next(changes)
+        changes.close()
+
+
+@pytest.fixture
+def dirty_repo(diff_repo, git):
+    """diff_repo plus a staged rename, a staged edit, an unstaged edit and an untracked file."""
+    git(diff_repo, "mv", "keep.txt", "kept.txt")
+    (diff_repo / "staged.kt").write_text("staged\n")
+    git(diff_repo, "add", "staged.kt")
+    (diff_repo / "caf\xe9.kt").write_text("edited\n")
+    (diff_repo / "untracked dir").mkdir()
+    (diff_repo / "untracked dir" / "new.kt").write_text("new\n")
+    return diff_repo
+
+
+class TestIterStatusChanges:
+    """Tests for iter_status_changes and the --changes modes built on it."""
+
+    def test_staged(self, dirty_repo):
+        changes = set(iter_status_changes(dirty_repo, staged=True, unstaged=False, untracked=False))
+        assert changes == {FileChange(RENAMED, "kept.txt", "keep.txt"), FileChange(ADDED, "staged.kt")}
+
+    def test_unstaged_and_untracked(self, dirty_repo):
+        changes = set(iter_status_changes(dirty_repo, staged=False, unstaged=True, untracked=True))
+        assert changes == {FileChange(MODIFIED, "caf\xe9.kt"), FileChange(ADDED, "untracked dir/new.kt")}
+
+    def test_modes(self, dirty_repo):
+        def paths(mode):
+            return sorted(c.path for c in iter_mode_changes(mode, "base", dirty_repo))
+
+        assert paths("committed") == ["caf\xe9.kt", "gone.txt", "keep.txt", "new\nname.kt"]
+        assert paths("staged") == ["kept.txt", "staged.kt"]
+        assert paths("worktree") == ["caf\xe9.kt", "untracked dir/new.kt"]
+        assert set(paths("all")) == set(paths("committed") + paths("staged") + paths("worktree"))
+
+    def test_clean_worktree_is_none(self, diff_repo):
+        assert changes_or_none(None, diff_repo, mode="worktree") is None
+        assert changes_or_none(None, diff_repo, mode="staged") is None
+
+    def test_git_failure_raises_instead_of_looking_clean(self, tmp_path):
+        with pytest.raises(RuntimeError, match="git status failed"):
+            changes_or_none(None, tmp_path, mode="staged")
+        with pytest.raises(RuntimeError, match="git status failed"):
+            changes_or_none(None, tmp_path, mode="worktree")
+        assert changes_or_none("base", tmp_path, mode="committed") is None
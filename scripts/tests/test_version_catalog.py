@@ -0,0 +1,176 @@
+"""Tests for version_catalog (catalog diff and the build files that reference changed entries)."""
+
+import tomllib
+from unittest.mock import patch
+
+import pytest
+
+from src.file_change import DELETED, MODIFIED, FileChange
+from src.version_catalog import (
+    CATALOG_PATH,
+    catalog_revisions,
+    changed_entries,
+    expand_catalog_changes,
+    references,
+    referencing_files,
+)
+
+CATALOG = """
+[versions]
+kotlin = "2.4.0"
+mokkery = "3.4.2"
+coroutines = "1.11.0"
+android-compileSdk = "36"
+
+[libraries]
+kotlin-gradle-plugin = { module = "org.jetbrains.kotlin:kotlin-gradle-plugin", version.ref = "kotlin" }
+kotlinx-coroutines-core = { module = "org.jetbrains.kotlinx:kotlinx-coroutines-core", version.ref = "coroutines" }
+kotlinx-coroutines-test = { module = "org.jetbrains.kotlinx:kotlinx-coroutines-test", version.ref = "coroutines" }
+turbine = "app.cash.turbine:turbine:1.2.1"
+
+[bundles]
+testing = ["kotlinx-coroutines-test", "turbine"]
+
+[plugins]
+kotlinMultiplatform = { id = "org.jetbrains.kotlin.multiplatform", version.ref = "kotlin" }
+mokkery = { id = "dev.mokkery", version.ref = "mokkery" }
+"""
+
+
+def _catalog(old: str = "", new: str = "") -> dict:
+    """CATALOG parsed, with old replaced by new."""
+    return tomllib.loads(CATALOG.replace(old, new) if old else CATALOG)
+
+
+class TestChangedEntries:
+    """Tests for changed_entries."""
+
+    def test_version_bump_reaches_libraries_plugins_and_bundles(self):
+        new = _catalog('coroutines = "1.11.0"', 'coroutines = "1.12.0"')
+        assert changed_entries(_catalog(), new) == {
+            ("versions", "coroutines"),
+            ("libraries", "kotlinx.coroutines.core"),
+            ("libraries", "kotlinx.coroutines.test"),
+            ("bundles", "testing"),
+        }
+
+    def test_inline_version_and_plugin(self):
+        assert changed_entries(_catalog(), _catalog("turbine:1.2.1", "turbine:1.2.2")) == {
+            ("libraries", "turbine"),
+            ("bundles", "testing"),
+        }
+        new = _catalog('mokkery = "3.4.2"', 'mokkery = "3.4.3"')
+        assert ("plugins", "mokkery") in changed_entries(_catalog(), new)
+
+    def test_identical_catalogs(self):
+        assert changed_entries(_catalog(), _catalog()) == set()
+
+
+class TestReferences:
+    """Tests for references."""
+
+    ENTRIES = {("libraries", "kotlinx.coroutines.core"), ("versions", "android.compileSdk"), ("plugins", "mokkery")}
+
+    @pytest.mark.parametrize("text", [
+        "implementation(libs.kotlinx.coroutines.core)",
+        "compileSdk = libs.versions.android.compileSdk.get().toInt()",
+        "alias(libs.plugins.mokkery)",
+        'implementation(libs.findLibrary("kotlinx-coroutines-core").get())',
+        'libs.findVersion("android-compileSdk")',
+    ])
+    def test_matches(self, text):
+        assert references(text, self.ENTRIES)
+
+    @pytest.mark.parametrize("text", [
+        "implementation(libs.kotlinx.coroutines.core.extra)",
+        "implementation(libs.kotlinx.coroutines.test)",
+        "alias(libs.plugins.mokkery2)",
+        'libs.findLibrary("kotlinx-coroutines-test")',
+        'libs.findPlugin("kotlinx-coroutines-core")',
+    ])
+    def test_no_match(self, text):
+        assert not references(text, self.ENTRIES)
+
+    def test_plugin_id_literal(self):
+        assert references('apply("dev.mokkery")', set(), {"dev.mokkery"})
+
+
+@pytest.fixture
+def catalog_repo(tmp_path, git, init_repo):
+    """Repo with the catalog, a root script, two libraries and build-logic, committed as 'base'."""
+    init_repo(tmp_path, {
+        CATALOG_PATH: CATALOG,
+        "build.gradle.kts": "plugins {\n    alias(libs.plugins.mokkery) apply false\n    alias(libs.plugins.kotlinMultiplatform)\n}\n",
+        "libraries/a/build.gradle.kts": "plugins { alias(libs.plugins.mokkery) }\n",
+        "libraries/a/src/commonMain/kotlin/A.kt": "val x = libs.kotlinx.coroutines.core\n",
+        "libraries/b/build.gradle.kts": "dependencies { implementation(libs.kotlinx.coroutines.core) }\n",
+        "build-logic/convention/src/main/kotlin/Plugin.kt": 'fun f() = libs.findLibrary("turbine")\n',
+    })
+    git(tmp_path, "tag", "base")
+    return tmp_path
+
+
+class TestReferencingFiles:
+    """Tests for referencing_files."""
+
+    def test_skips_sources_and_root_apply_false(self, catalog_repo):
+        assert referencing_files(catalog_repo, {("plugins", "mokkery")}) == ["libraries/a/build.gradle.kts"]
+        assert referencing_files(catalog_repo, {("libraries", "kotlinx.coroutines.core")}) == [
+            "libraries/b/build.gradle.kts"
+        ]
+
+    def test_build_logic_and_root(self, catalog_repo):
+        assert referencing_files(catalog_repo, {("libraries", "turbine"), ("plugins", "kotlinMultiplatform")}) == [
+            "build.gradle.kts",
+            "build-logic/convention/src/main/kotlin/Plugin.kt",
+        ]
+
+
+class TestExpandCatalogChanges:
+    """Tests for expand_catalog_changes and catalog_revisions."""
+
+    def test_worktree_bump_becomes_referencing_files(self, catalog_repo):
+        (catalog_repo / CATALOG_PATH).write_text(CATALOG.replace('mokkery = "3.4.2"', 'mokkery = "3.4.3"'))
+        notes = []
+        changes = [FileChange(MODIFIED, "README.md"), FileChange(MODIFIED, CATALOG_PATH)]
+        assert list(expand_catalog_changes(changes, catalog_repo, "worktree", None, notes)) == [
+            FileChange(MODIFIED, "README.md"),
+            FileChange(MODIFIED, "libraries/a/build.gradle.kts"),
+        ]
+        assert "plugins.mokkery" in notes[0]
+
+    def test_committed_bump_diffs_merge_base_and_head(self, catalog_repo, commit):
+        (catalog_repo / CATALOG_PATH).write_text(CATALOG.replace('coroutines = "1.11.0"', 'coroutines = "1.12.0"'))
+        commit(catalog_repo, "bump")
+        assert catalog_revisions("committed", "base", catalog_repo)[1] == "HEAD"
+        changes = [FileChange(MODIFIED, CATALOG_PATH)]
+        assert [c.path for c in expand_catalog_changes(changes, catalog_repo, "committed", "base")] == [
+            "libraries/b/build.gradle.kts"
+        ]
+
+    def test_unreferenced_library_expands_to_nothing(self, catalog_repo):
+        (catalog_repo / CATALOG_PATH).write_text(CATALOG.replace(':kotlin-gradle-plugin"', ':kotlin-gradle-plugin-api"'))
+        assert list(expand_catalog_changes([FileChange(MODIFIED, CATALOG_PATH)], catalog_repo, "worktree")) == []
+
+    def test_unreferenced_version_passes_through(self, catalog_repo):
+        """A [versions] entry no build file uses (e.g. java-ci, read by CI) is a full build."""
+        (catalog_repo / CATALOG_PATH).write_text(CATALOG.replace('"36"', '"37"'))
+        notes = []
+        changes = [FileChange(MODIFIED, CATALOG_PATH)]
+        assert list(expand_catalog_changes(changes, catalog_repo, "worktree", None, notes)) == changes
+        assert "versions.android.compileSdk" in notes[0]
+        assert "build configuration change" in notes[0]
+
+    def test_deleted_or_unreadable_catalog_passes_through(self, catalog_repo):
+        deleted = [FileChange(DELETED, CATALOG_PATH)]
+        assert list(expand_catalog_changes(deleted, catalog_repo, "worktree")) == deleted
+        (catalog_repo / CATALOG_PATH).write_text("not = [valid")
+        modified = [FileChange(MODIFIED, CATALOG_PATH)]
+        assert list(expand_catalog_changes(modified, catalog_repo, "worktree")) == modified
+
+    def test_missing_git_passes_through(self, catalog_repo):
+        """git that cannot run is a full build (the catalog passes through), not a crash."""
+        modified = [FileChange(MODIFIED, CATALOG_PATH)]
+        with patch("src.git_cli.subprocess.run", side_effect=FileNotFoundError("git")):
+            assert catalog_revisions("committed", "base", catalog_repo) == ("base", "HEAD")
+            assert list(expand_catalog_changes(modified, catalog_repo, "committed", "base")) == modified